@@ -0,0 +1,111 @@
+"""
+Change events emitted when metrics_input is written.
+
+Without them, new submissions wait for the next timer-driven transformation run. Every write
+path reports which companies changed and the earliest fiscal reporting date affected.
+Period-over-period metrics of later periods depend on earlier ones, so "changed on or after
+this date" is all the transformation needs. A single upload of a company's full history
+therefore produces one event rather than one per row.
+
+The default publisher sends the events with ``pg_notify`` on the writing transaction.
+PostgreSQL delivers notifications only when that transaction commits, and drops them when it
+rolls back, so listeners never see changes that did not persist and need no polling. The
+consumer lives with the transformation function (``change_events.py``); it coalesces bursts
+into per-company recomputes.
+
+Requirements addressed:
+- Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes):
+  Trigger recalculation of derived metrics as soon as new metrics are submitted.
+"""
+
+import json
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.metrics_input_service.config import Settings, settings
+
+# PostgreSQL rejects notification payloads of 8000 bytes or more
+MAX_NOTIFY_PAYLOAD_BYTES = 7900
+
+
+class ChangeSet:
+    """
+    Earliest changed fiscal reporting date per company, accumulated while writing.
+    """
+
+    def __init__(self):
+        self.since: Dict[UUID, date] = {}
+
+    def __len__(self) -> int:
+        return len(self.since)
+
+    def add(self, company_id: UUID, fiscal_reporting_date: date) -> None:
+        current = self.since.get(company_id)
+        if current is None or fiscal_reporting_date < current:
+            self.since[company_id] = fiscal_reporting_date
+
+    def add_all(self, keys: Iterable[Tuple[UUID, date]]) -> None:
+        for company_id, fiscal_reporting_date in keys:
+            self.add(company_id, fiscal_reporting_date)
+
+
+def encode_payloads(changes: ChangeSet, max_bytes: int = MAX_NOTIFY_PAYLOAD_BYTES) -> List[str]:
+    """
+    Encode a change set as compact JSON arrays of ``[company_id, date]`` pairs, each under ``max_bytes``.
+    """
+    payloads: List[str] = []
+    pairs: List[str] = []
+    size = 2
+    for company_id, since in sorted(changes.since.items(), key=lambda item: str(item[0])):
+        pair = json.dumps([str(company_id), since.isoformat()], separators=(",", ":"))
+        if pairs and size + len(pair) + 1 > max_bytes:
+            payloads.append("[" + ",".join(pairs) + "]")
+            pairs, size = [], 2
+        pairs.append(pair)
+        size += len(pair) + 1
+    if pairs:
+        payloads.append("[" + ",".join(pairs) + "]")
+    return payloads
+
+
+class ChangePublisher:
+    """
+    Publishes change sets. This base implementation discards them, which disables change events.
+    """
+
+    async def publish(self, db: AsyncSession, changes: ChangeSet) -> None:
+        """
+        Publish the changes made by the session's current transaction.
+
+        Called before the transaction commits; implementations must not deliver events for a
+        transaction that rolls back.
+        """
+
+
+class NotifyPublisher(ChangePublisher):
+    """
+    Sends change sets as PostgreSQL notifications on ``channel``, delivered when the transaction commits.
+    """
+
+    def __init__(self, channel: str):
+        self.channel = channel
+
+    async def publish(self, db: AsyncSession, changes: ChangeSet) -> None:
+        for payload in encode_payloads(changes):
+            await db.execute(select(func.pg_notify(self.channel, payload)))
+
+
+def create_change_publisher(config: Settings) -> ChangePublisher:
+    """
+    Build the publisher selected by the ``change_events_channel`` setting; an empty channel disables events.
+    """
+    if config.change_events_channel:
+        return NotifyPublisher(config.change_events_channel)
+    return ChangePublisher()
+
+
+change_publisher = create_change_publisher(settings)
@@ -0,0 +1,170 @@
+"""
+Idempotency keys for metrics submissions.
+
+Clients that time out retry ``POST /metrics/``; without protection every retry that reached
+the database inserts another row. A client sends the same ``Idempotency-Key`` header with
+each attempt, and the first successful response is recorded under that key in the same
+transaction as the metrics row. Later attempts receive the recorded response without touching
+``metrics_input``.
+
+Records are looked up in a bounded in-process LRU cache first and then in the
+``idempotency_keys`` table, which is shared by all replicas. Both expire after a TTL. Reusing a
+key with a different payload is rejected instead of replayed. In write-behind mode submissions
+do not touch the database, so keys are looked up in the cache and the local buffer, and the
+flusher checks the table (see ``write_behind``).
+
+Requirements addressed:
+- Data Input Methods (Technical Requirements/Feature 4: Data Input Methods):
+  Make metrics submission safe to retry.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, NamedTuple, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.metrics_input_service.app.models.models import IdempotencyKey
+from src.backend.metrics_input_service.config import settings
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class IdempotencyRecord(NamedTuple):
+    """
+    Response recorded for an idempotency key.
+
+    Attributes:
+        request_hash (str): Digest of the request payload the key was first used with.
+        status_code (int): Recorded status code.
+        body (Dict[str, Any]): Recorded JSON body.
+        expires_at (datetime): When the record stops being replayed.
+    """
+    request_hash: str
+    status_code: int
+    body: Dict[str, Any]
+    expires_at: datetime
+
+
+def request_hash(payload: Dict[str, Any]) -> str:
+    """
+    Stable digest of a request payload, independent of key order.
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class IdempotencyCache:
+    """
+    In-process LRU cache of idempotency records, bounded to ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._records: "OrderedDict[str, IdempotencyRecord]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, key: str, now: datetime) -> Optional[IdempotencyRecord]:
+        record = self._records.get(key)
+        if record is None:
+            return None
+        if record.expires_at <= now:
+            del self._records[key]
+            return None
+        self._records.move_to_end(key)
+        return record
+
+    def put(self, key: str, record: IdempotencyRecord) -> None:
+        self._records[key] = record
+        self._records.move_to_end(key)
+        while len(self._records) > self.max_entries:
+            self._records.popitem(last=False)
+
+
+class IdempotencyStore:
+    """
+    Two-level store of idempotency records: process memory in front of the idempotency_keys table.
+
+    Args:
+        ttl_seconds (int): How long records are replayed.
+        max_entries (int): Capacity of the in-memory cache.
+        purge_every (int): Expired rows are purged from the table once every this many saves.
+    """
+
+    def __init__(self, ttl_seconds: int = 86400, max_entries: int = 10000, purge_every: int = 1000):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.cache = IdempotencyCache(max_entries)
+        self.purge_every = purge_every
+        self._saves = 0
+
+    def cached(self, key: str) -> Optional[IdempotencyRecord]:
+        """
+        Find the live record for a key in the in-memory cache only.
+        """
+        return self.cache.get(key, datetime.utcnow())
+
+    async def lookup(self, db: AsyncSession, key: str) -> Optional[IdempotencyRecord]:
+        """
+        Find the live record for a key, falling back to the database on a cache miss.
+        """
+        now = datetime.utcnow()
+        record = self.cache.get(key, now)
+        if record is not None:
+            return record
+        row = await db.get(IdempotencyKey, key)
+        if row is None or row.expires_at <= now:
+            return None
+        record = IdempotencyRecord(row.request_hash, row.status_code, row.response_body, row.expires_at)
+        self.cache.put(key, record)
+        return record
+
+    async def add(self, db: AsyncSession, key: str, digest: str, status_code: int, body: Dict[str, Any]) -> IdempotencyRecord:
+        """
+        Stage a record in the caller's transaction.
+
+        The record only takes effect when the caller commits, together with the write it
+        describes; call ``remember`` after the commit to cache it. A concurrent request
+        committing the same key first makes the commit fail with an IntegrityError.
+
+        Returns:
+            IdempotencyRecord: The staged record.
+        """
+        now = datetime.utcnow()
+        record = IdempotencyRecord(digest, status_code, body, now + self.ttl)
+        self._saves += 1
+        if self._saves % self.purge_every == 0:
+            await db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+        else:
+            # An expired row would otherwise block reuse of its key
+            await db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.expires_at <= now))
+        db.add(IdempotencyKey(key=key, request_hash=digest, status_code=status_code, response_body=body, expires_at=record.expires_at))
+        return record
+
+    def remember(self, key: str, record: IdempotencyRecord) -> None:
+        """
+        Cache a committed record.
+        """
+        self.cache.put(key, record)
+
+
+def replay(record: IdempotencyRecord, digest: str) -> JSONResponse:
+    """
+    Build the response for a repeated key.
+
+    Raises:
+        HTTPException: 422 if the key was first used with a different payload.
+    """
+    if record.request_hash != digest:
+        raise HTTPException(status_code=422, detail=f"{IDEMPOTENCY_KEY_HEADER} has already been used with a different request")
+    return JSONResponse(content=record.body, status_code=record.status_code, headers={REPLAYED_HEADER: "true"})
+
+
+idempotency_store = IdempotencyStore(settings.idempotency_ttl_seconds, settings.idempotency_cache_size)
@@ -0,0 +1,274 @@
+"""
+Background processing of bulk metrics imports.
+
+Uploads are staged to disk and recorded as ``import_jobs`` rows, and the request returns
+immediately with the job id. A pool of asyncio workers runs each job's parse, validate and
+COPY pipeline, publishing progress to the job row after every chunk. The COPY and
+the job's completion are committed together, so a job either finishes exactly once or is
+retried from the start. On startup, and then every ``recovery_interval``, the runner picks up
+pending jobs and running jobs whose heartbeat has gone stale, e.g. because the pod running them
+was restarted. A job's staged file is deleted once it has completed or failed.
+
+Requirements addressed:
+- Data Input Methods (Technical Requirements/Feature 4: Data Input Methods):
+  Accept very large historical imports without holding an HTTP request open.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+from datetime import datetime, timedelta
+from typing import IO, Callable, List, Optional, Set
+from uuid import UUID, uuid4
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from src.backend.metrics_input_service.app.database import get_driver_connection
+from src.backend.metrics_input_service.app.events import ChangePublisher, change_publisher
+from src.backend.metrics_input_service.app.ingestion import UploadStats, ingest_upload
+from src.backend.metrics_input_service.app.models.models import ImportJob, ImportJobSchema
+
+logger = logging.getLogger(__name__)
+
+def job_to_schema(job: ImportJob, now: Optional[datetime] = None) -> ImportJobSchema:
+    """
+    Build the progress report for a job, including its throughput so far.
+    """
+    schema = ImportJobSchema.from_orm(job)
+    if job.started_at is not None:
+        elapsed = ((job.finished_at or now or datetime.utcnow()) - job.started_at).total_seconds()
+        if elapsed > 0:
+            schema.rows_per_second = round(job.rows_processed / elapsed, 1)
+    return schema
+
+
+class ImportJobRunner:
+    """
+    Worker pool that processes import jobs in the background.
+
+    Args:
+        session_factory (Callable[[], AsyncSession]): Creates database sessions, e.g. AsyncSessionLocal.
+        staging_dir (str): Directory uploads are staged in; must be shared by all replicas for
+            jobs to be resumable on another pod.
+        workers (int): Number of jobs processed concurrently.
+        chunk_size (int): Rows validated per chunk; progress is published after each chunk.
+        stale_after (timedelta): Running jobs without a heartbeat for this long are considered abandoned.
+        publisher (Optional[ChangePublisher]): Publishes the changes of each completed job; defaults to the service's publisher.
+        recovery_interval (timedelta): How often unfinished jobs are looked for after startup.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        staging_dir: str,
+        workers: int = 2,
+        chunk_size: int = 5000,
+        stale_after: timedelta = timedelta(minutes=5),
+        publisher: Optional[ChangePublisher] = None,
+        recovery_interval: timedelta = timedelta(minutes=1),
+    ):
+        self.session_factory = session_factory
+        self.staging_dir = staging_dir
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.stale_after = stale_after
+        self.publisher = publisher or change_publisher
+        self.recovery_interval = recovery_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # Jobs queued or being processed by this runner
+        self._scheduled: Set[UUID] = set()
+
+    async def start(self) -> None:
+        """
+        Start the workers and re-enqueue jobs left unfinished by a previous run, then keep looking
+        for unfinished jobs every ``recovery_interval``.
+        """
+        os.makedirs(self.staging_dir, exist_ok=True)
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        await self.recover()
+        self._tasks.append(asyncio.create_task(self._recover_periodically()))
+
+    async def recover(self) -> int:
+        """
+        Queue the recoverable jobs this runner is not already processing.
+
+        Returns:
+            int: Number of jobs queued.
+        """
+        queued = 0
+        for job_id in await self.recoverable_jobs():
+            if job_id not in self._scheduled:
+                logger.info(f"Resuming import job {job_id}")
+                self._enqueue(job_id)
+                queued += 1
+        return queued
+
+    async def _recover_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.recovery_interval.total_seconds())
+            try:
+                await self.recover()
+            except Exception as e:
+                logger.error(f"Looking for unfinished import jobs failed: {str(e)}")
+
+    def _enqueue(self, job_id: UUID) -> None:
+        self._scheduled.add(job_id)
+        self._queue.put_nowait(job_id)
+
+    async def stop(self) -> None:
+        """
+        Cancel the workers. Jobs in progress roll back and are resumed by the next start.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, db: AsyncSession, file: IO[bytes], filename: str, created_by: Optional[str] = None) -> ImportJob:
+        """
+        Stage an upload to disk, record it as a pending job and queue it for processing.
+
+        Args:
+            db (AsyncSession): Database session of the request.
+            file (IO[bytes]): Uploaded file contents.
+            filename (str): Original file name.
+            created_by (Optional[str]): User submitting the import.
+
+        Returns:
+            ImportJob: The persisted pending job.
+        """
+        job_id = uuid4()
+        extension = os.path.splitext(filename)[1].lower()
+        staged_path = os.path.join(self.staging_dir, f"{job_id}{extension}")
+        await run_in_threadpool(_stage, file, staged_path)
+
+        job = ImportJob(id=job_id, filename=filename, staged_path=staged_path, status="pending", created_by=created_by)
+        try:
+            db.add(job)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            os.remove(staged_path)
+            raise
+        if self._queue is not None:
+            self._enqueue(job_id)
+        return job
+
+    async def recoverable_jobs(self) -> List[UUID]:
+        """
+        Ids of pending jobs and of running jobs whose heartbeat is stale.
+        """
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(ImportJob.id).where(self._claimable()).order_by(ImportJob.created_date)
+            )
+            return list(result.scalars().all())
+
+    def _claimable(self):
+        stale = datetime.utcnow() - self.stale_after
+        return or_(
+            ImportJob.status == "pending",
+            (ImportJob.status == "running") & (ImportJob.heartbeat_at < stale),
+        )
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self.run_job(job_id)
+            except Exception as e:
+                logger.error(f"Import job {job_id} crashed: {str(e)}")
+            finally:
+                self._scheduled.discard(job_id)
+                self._queue.task_done()
+
+    async def claim(self, job_id: UUID) -> bool:
+        """
+        Atomically mark a job as running, unless another worker already holds it.
+        """
+        async with self.session_factory() as db:
+            now = datetime.utcnow()
+            result = await db.execute(
+                update(ImportJob)
+                .where(ImportJob.id == job_id, self._claimable())
+                .values(
+                    status="running", started_at=now, heartbeat_at=now,
+                    rows_processed=0, rows_inserted=0, rows_rejected=0, errors=None, error_message=None,
+                )
+            )
+            await db.commit()
+            return result.rowcount == 1
+
+    async def run_job(self, job_id: UUID) -> None:
+        """
+        Process a job to completion.
+        """
+        if not await self.claim(job_id):
+            return
+
+        async with self.session_factory() as progress_db, self.session_factory() as db:
+            staged_path = None
+            try:
+                job = await db.get(ImportJob, job_id)
+                staged_path = job.staged_path
+
+                async def report(stats: UploadStats) -> None:
+                    # Progress is committed separately so it is visible while the COPY transaction is open
+                    await progress_db.execute(
+                        update(ImportJob).where(ImportJob.id == job_id).values(
+                            rows_processed=stats.rows_received,
+                            rows_inserted=stats.rows_inserted,
+                            rows_rejected=stats.rows_rejected,
+                            heartbeat_at=datetime.utcnow(),
+                        )
+                    )
+                    await progress_db.commit()
+
+                with open(job.staged_path, "rb") as staged:
+                    stats = await ingest_upload(
+                        await get_driver_connection(db), staged, job.filename, self.chunk_size, progress=report,
+                    )
+
+                job.status = "completed"
+                job.rows_processed = stats.rows_received
+                job.rows_inserted = stats.rows_inserted
+                job.rows_rejected = stats.rows_rejected
+                job.errors = [error.dict() for error in stats.errors] or None
+                job.finished_at = datetime.utcnow()
+                await self.publisher.publish(db, stats.changes)
+                # The copied rows, the completed status and the change events commit together
+                await db.commit()
+                _discard(job.staged_path)
+                logger.info(f"Import job {job_id} completed: {stats.rows_inserted} rows inserted, {stats.rows_rejected} rejected")
+            except Exception as e:
+                await db.rollback()
+                await progress_db.rollback()
+                logger.error(f"Import job {job_id} failed: {str(e)}")
+                try:
+                    await progress_db.execute(
+                        update(ImportJob).where(ImportJob.id == job_id).values(
+                            status="failed", error_message=str(e), finished_at=datetime.utcnow(),
+                        )
+                    )
+                    await progress_db.commit()
+                finally:
+                    # Failed jobs are not retried, so their staged upload is no longer needed
+                    if staged_path is not None:
+                        _discard(staged_path)
+
+
+def _stage(file: IO[bytes], staged_path: str) -> None:
+    with open(staged_path, "wb") as staged:
+        shutil.copyfileobj(file, staged)
+
+
+def _discard(staged_path: str) -> None:
+    try:
+        os.remove(staged_path)
+    except FileNotFoundError:
+        pass
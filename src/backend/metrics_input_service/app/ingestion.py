@@ -0,0 +1,336 @@
+"""
+Streaming bulk upload of financial metrics from CSV and Excel files.
+
+Uploaded files are parsed row by row (XLSX through openpyxl's read-only reader), validated
+column by column in chunks against MetricsInputSchema and streamed with a single
+``COPY ... FROM STDIN`` through asyncpg into a temporary staging table. Only one chunk of rows is held in memory at a
+time, so memory use does not grow with the size of the file, and parsing runs in the threadpool so the event
+loop keeps serving other requests.
+
+The staged rows are merged into metrics_input with one ``INSERT ... SELECT ... ON CONFLICT DO NOTHING``. A row
+whose company and fiscal reporting date are already stored, or repeat an earlier row of the file, is not
+inserted and is reported as a conflict instead of failing the whole upload.
+
+Requirements addressed:
+- Data Input Methods (Technical Requirements/Feature 4: Data Input Methods):
+  Support bulk upload of metrics via CSV or Excel files.
+"""
+
+import csv
+import io
+from zipfile import BadZipFile
+from decimal import Decimal
+from itertools import islice
+from typing import IO, Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import uuid4
+
+from openpyxl import load_workbook  # version 3.1.2
+from openpyxl.utils.exceptions import InvalidFileException
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import Numeric
+from starlette.concurrency import run_in_threadpool
+
+from src.backend.metrics_input_service.app.events import ChangeSet
+from src.backend.metrics_input_service.app.models.models import BatchRowResult, MetricsInput, MetricsInputSchema, NATURAL_KEY_CONFLICT
+from src.backend.metrics_input_service.app.validation import validate_records
+
+# created_date is left to its server default
+COPY_COLUMNS = [name for name in MetricsInputSchema.__fields__ if name != "created_date"]
+NUMERIC_COLUMNS = [column.name for column in MetricsInput.__table__.columns if isinstance(column.type, Numeric)]
+
+CSV_EXTENSIONS = (".csv",)
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm")
+
+# Errors of a file that has a supported extension but cannot be read
+PARSE_ERRORS = (UnicodeDecodeError, csv.Error, InvalidFileException, BadZipFile)
+
+# Staged rows keep their position in the file, so conflicts can be reported by row
+UPLOAD_ROW_COLUMN = "upload_row"
+
+STAGING_TABLE_SQL = """
+    DROP TABLE IF EXISTS pg_temp.{staging};
+    CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS, {row} bigint NOT NULL) ON COMMIT DROP
+"""
+
+# The first row of each company period is inserted; the count and first positions of the staged rows
+# that were not inserted are returned
+MERGE_SQL = """
+    WITH inserted AS (
+        INSERT INTO {table} ({columns})
+        SELECT DISTINCT ON (company_id, fiscal_reporting_date) {columns}
+        FROM {staging}
+        ORDER BY company_id, fiscal_reporting_date, {row}
+        ON CONFLICT DO NOTHING
+        RETURNING id
+    )
+    SELECT s.{row}, count(*) OVER () AS conflicts
+    FROM {staging} s
+    LEFT JOIN inserted i ON i.id = s.id
+    WHERE i.id IS NULL
+    ORDER BY s.{row}
+    LIMIT $1
+"""
+
+
+class UnsupportedUploadError(ValueError):
+    """
+    Raised when an uploaded file is neither a CSV nor an Excel workbook.
+    """
+
+
+class UploadParseError(ValueError):
+    """
+    Raised when an uploaded CSV or Excel file cannot be decoded or parsed.
+    """
+
+
+class MetricsUploadResponse(BaseModel):
+    """
+    Summary of a bulk file upload.
+    """
+    rows_received: int = Field(..., description="Number of data rows read from the file")
+    rows_inserted: int = Field(..., description="Number of rows copied into metrics_input")
+    rows_rejected: int = Field(..., description="Number of rows that failed validation")
+    rows_conflicting: int = Field(0, description="Number of valid rows not inserted because their company and period already exist")
+    errors: List[BatchRowResult] = Field(..., description="Validation and conflict errors, up to the reporting limit")
+
+
+class UploadStats:
+    """
+    Running counts for an upload; keeps at most ``max_errors`` error details.
+
+    ``changes`` collects the companies and periods of the valid rows for change events. While the
+    file is being read, ``rows_inserted`` counts the valid rows; conflicting rows are deducted once
+    they are merged.
+    """
+
+    def __init__(self, max_errors: int = 100):
+        self.max_errors = max_errors
+        self.changes = ChangeSet()
+        self.rows_received = 0
+        self.rows_inserted = 0
+        self.rows_rejected = 0
+        self.rows_conflicting = 0
+        self.errors: List[BatchRowResult] = []
+
+    def reject(self, index: int, error: ValidationError) -> None:
+        self.rows_rejected += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(BatchRowResult(index=index, status="invalid", errors=error.errors()))
+
+    def conflict(self, indexes: List[int], total: int) -> None:
+        """
+        Record ``total`` conflicting rows, the first of which are at ``indexes``.
+        """
+        self.rows_conflicting += total
+        self.rows_inserted -= total
+        for index in indexes[:max(0, self.max_errors - len(self.errors))]:
+            self.errors.append(BatchRowResult(index=index, status="conflict", errors=[NATURAL_KEY_CONFLICT]))
+        self.errors.sort(key=lambda error: error.index)
+
+    def to_response(self) -> MetricsUploadResponse:
+        return MetricsUploadResponse(
+            rows_received=self.rows_received,
+            rows_inserted=self.rows_inserted,
+            rows_rejected=self.rows_rejected,
+            rows_conflicting=self.rows_conflicting,
+            errors=self.errors,
+        )
+
+
+def _normalize(header: Iterable[Any], values: Iterable[Any]) -> Dict[str, Any]:
+    # Empty cells mean "not provided" so optional fields validate as None
+    return {
+        str(key).strip(): (None if value == "" else value)
+        for key, value in zip(header, values)
+        if key is not None
+    }
+
+
+def iter_csv_rows(file: IO[bytes], encoding: str = "utf-8-sig") -> Iterator[Dict[str, Any]]:
+    """
+    Yield the rows of a CSV file as dictionaries keyed by the header row.
+
+    Args:
+        file (IO[bytes]): Binary file object positioned at the start of the file.
+        encoding (str): Text encoding; the default also strips an Excel byte order mark.
+
+    Yields:
+        Dict[str, Any]: One dictionary per data row.
+    """
+    reader = csv.reader(io.TextIOWrapper(file, encoding=encoding, newline=""))
+    header = next(reader, None)
+    if header is None:
+        return
+    for values in reader:
+        if any(values):
+            yield _normalize(header, values)
+
+
+def iter_xlsx_rows(file: IO[bytes]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the rows of the first worksheet of an Excel workbook as dictionaries keyed by the header row.
+
+    The workbook is opened read-only, so rows are streamed from the file instead of being loaded at once.
+
+    Args:
+        file (IO[bytes]): Seekable binary file object containing an .xlsx workbook.
+
+    Yields:
+        Dict[str, Any]: One dictionary per data row.
+    """
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        for values in rows:
+            if any(value is not None for value in values):
+                yield _normalize(header, values)
+    finally:
+        workbook.close()
+
+
+def is_supported_upload(filename: str) -> bool:
+    """
+    Whether the file name has a CSV or Excel extension.
+    """
+    return (filename or "").lower().endswith(CSV_EXTENSIONS + EXCEL_EXTENSIONS)
+
+
+def iter_upload_rows(file: IO[bytes], filename: str) -> Iterator[Dict[str, Any]]:
+    """
+    Pick the row reader matching the uploaded file's extension.
+
+    Parsing happens as rows are consumed, so a file that cannot be read raises while it is iterated.
+
+    Raises:
+        UnsupportedUploadError: If the file type is not supported.
+        UploadParseError: While iterating, if the file cannot be decoded or parsed.
+    """
+    name = (filename or "").lower()
+    if name.endswith(CSV_EXTENSIONS):
+        return _parsed(iter_csv_rows(file), filename)
+    if name.endswith(EXCEL_EXTENSIONS):
+        return _parsed(iter_xlsx_rows(file), filename)
+    raise UnsupportedUploadError(f"Unsupported file type: {filename}")
+
+
+def _parsed(rows: Iterator[Dict[str, Any]], filename: str) -> Iterator[Dict[str, Any]]:
+    try:
+        yield from rows
+    except PARSE_ERRORS as e:
+        raise UploadParseError(f"Could not parse {filename}: {str(e)}") from e
+
+
+def validate_chunk(rows: List[Dict[str, Any]], start_index: int, stats: UploadStats) -> List[Tuple]:
+    """
+    Validate a chunk of rows and return the valid ones as tuples in COPY_COLUMNS order, followed by
+    each row's position in the file.
+
+    The chunk is validated column by column; see ``validate_records``.
+    """
+    validated = validate_records(rows)
+    for offset, error in validated.errors:
+        stats.reject(start_index + offset, error)
+    if not len(validated):
+        return []
+
+    columns = {column: validated.column(column) for column in COPY_COLUMNS}
+    columns["id"] = [value or uuid4() for value in columns["id"]]
+    stats.changes.add_all(zip(columns["company_id"], columns["fiscal_reporting_date"]))
+    for column in NUMERIC_COLUMNS:
+        # numeric columns are copied as Decimal so binary COPY keeps the submitted precision
+        columns[column] = [None if value is None else Decimal(repr(value)) for value in columns[column]]
+    positions = (start_index + offset for offset in validated.indexes.tolist())
+    return list(zip(*(columns[column] for column in COPY_COLUMNS), positions))
+
+
+def iter_valid_chunks(rows: Iterable[Dict[str, Any]], stats: UploadStats, chunk_size: int = 1000) -> Iterator[List[Tuple]]:
+    """
+    Validate rows chunk by chunk, yielding the valid rows of each chunk and recording rejections in ``stats``.
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        start_index = stats.rows_received
+        stats.rows_received += len(chunk)
+        valid = validate_chunk(chunk, start_index, stats)
+        stats.rows_inserted += len(valid)
+        yield valid
+
+
+async def aiter_valid_rows(
+    rows: Iterable[Dict[str, Any]],
+    stats: UploadStats,
+    chunk_size: int = 1000,
+    progress: Optional[Callable[[UploadStats], Awaitable[None]]] = None,
+) -> AsyncIterator[Tuple]:
+    """
+    Asynchronously yield valid rows, parsing and validating each chunk in the threadpool.
+
+    Parsing is blocking and CPU bound, so it is kept off the event loop. ``progress`` is
+    awaited with ``stats`` after each chunk has been validated.
+    """
+    chunks = iter_valid_chunks(rows, stats, chunk_size)
+    while True:
+        chunk = await run_in_threadpool(next, chunks, None)
+        if chunk is None:
+            return
+        if progress is not None:
+            await progress(stats)
+        for values in chunk:
+            yield values
+
+
+async def ingest_upload(
+    connection,
+    file: IO[bytes],
+    filename: str,
+    chunk_size: int = 1000,
+    max_errors: int = 100,
+    progress: Optional[Callable[[UploadStats], Awaitable[None]]] = None,
+    table: str = "metrics_input",
+) -> UploadStats:
+    """
+    Parse, validate, COPY and merge an uploaded metrics file.
+
+    Valid rows are streamed into a single binary ``COPY ... FROM STDIN`` into a temporary staging
+    table, then inserted into ``table`` unless their company and fiscal reporting date already
+    exist there or repeat an earlier row of the file. Staging and merge run in a savepoint of the
+    caller's transaction, which the caller commits or rolls back once this returns.
+
+    Args:
+        connection: asyncpg connection of the transaction to copy in.
+        file (IO[bytes]): Uploaded file contents.
+        filename (str): Original file name, used to detect CSV or Excel.
+        chunk_size (int): Rows validated per chunk.
+        max_errors (int): Maximum number of rejected rows reported in detail.
+        progress (Optional[Callable]): Awaited with the running counts after each chunk.
+        table (str): Destination table.
+
+    Returns:
+        UploadStats: Counts of received, inserted, rejected and conflicting rows.
+
+    Raises:
+        UnsupportedUploadError: If the file type is not supported.
+        UploadParseError: If the file cannot be decoded or parsed.
+    """
+    stats = UploadStats(max_errors)
+    rows = iter_upload_rows(file, filename)
+    staging = f"{table}_upload"
+    names = {"table": table, "staging": staging, "row": UPLOAD_ROW_COLUMN, "columns": ", ".join(COPY_COLUMNS)}
+    async with connection.transaction():
+        await connection.execute(STAGING_TABLE_SQL.format(**names))
+        await connection.copy_records_to_table(
+            staging,
+            records=aiter_valid_rows(rows, stats, chunk_size, progress),
+            columns=COPY_COLUMNS + [UPLOAD_ROW_COLUMN],
+        )
+        conflicts = await connection.fetch(MERGE_SQL.format(**names), max(1, max_errors))
+    if conflicts:
+        stats.conflict([row[UPLOAD_ROW_COLUMN] for row in conflicts], conflicts[0]["conflicts"])
+    return stats
@@ -1,16 +1,25 @@
 # src/backend/metrics_input_service/app/models/models.py
-from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, ForeignKey, JSON, Table, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from pydantic import BaseModel, Field
 from datetime import date, datetime
-from typing import Optional
-from uuid import UUID as PyUUID
+from typing import Any, Dict, List, Optional
+from uuid import UUID as PyUUID, uuid4
 
 # Base class for SQLAlchemy models
 Base = declarative_base()
 
+# The companies table belongs to the reporting side of the schema; only the columns used to
+# select a fund's companies are declared here
+companies = Table(
+    'companies',
+    Base.metadata,
+    Column('id', UUID(as_uuid=True), primary_key=True),
+    Column('fund', String, nullable=False),
+)
+
 class MetricsInput(Base):
     """
     Represents the financial metrics input data model, defining the schema for storing metrics data in the database.
@@ -20,6 +29,12 @@ class MetricsInput(Base):
       Ensures that the data models are properly defined to store financial metrics data in the PostgreSQL database.
     """
     __tablename__ = 'metrics_input'
+    # A company reports one set of metrics per fiscal reporting date; corrections update it in place.
+    # Migration 004 also includes the modification times in its index, so read ETags are computed
+    # with an index-only scan
+    __table_args__ = (
+        UniqueConstraint('company_id', 'fiscal_reporting_date', name='uq_metrics_input_company_id_fiscal_reporting_date'),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4())
     company_id = Column(UUID(as_uuid=True), ForeignKey('companies.id'), nullable=False)
@@ -77,5 +92,92 @@ class MetricsInputSchema(BaseModel):
     class Config:
         orm_mode = True
 
+class ImportJob(Base):
+    """
+    Tracks a background bulk import of a metrics file.
+    
+    This model addresses the following requirement:
+    - Data Input Methods (Technical Requirements/Feature 4: Data Input Methods):
+      Keeps import progress in the database so it can be polled and resumed after a restart.
+    """
+    __tablename__ = 'import_jobs'
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    filename = Column(String, nullable=False)
+    staged_path = Column(String, nullable=False)
+    status = Column(String, nullable=False, default='pending')
+    rows_processed = Column(Integer, nullable=False, default=0)
+    rows_inserted = Column(Integer, nullable=False, default=0)
+    rows_rejected = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON)
+    error_message = Column(String)
+    created_date = Column(DateTime, server_default=func.now(), nullable=False)
+    created_by = Column(String)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+
+class IdempotencyKey(Base):
+    """
+    Response recorded for a client-supplied Idempotency-Key, so retried submissions can be replayed.
+    
+    This model addresses the following requirement:
+    - Data Input Methods (Technical Requirements/Feature 4: Data Input Methods):
+      Prevents client retries from creating duplicate metrics entries.
+    """
+    __tablename__ = 'idempotency_keys'
+
+    key = Column(String, primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(JSON, nullable=False)
+    created_date = Column(DateTime, server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+class ImportJobSchema(BaseModel):
+    """
+    Pydantic schema for reporting the progress of an import job.
+    """
+    id: PyUUID = Field(..., description="Import job identifier")
+    filename: str = Field(..., description="Name of the uploaded file")
+    status: str = Field(..., description="'pending', 'running', 'completed' or 'failed'")
+    rows_processed: int = Field(..., description="Rows read and validated so far")
+    rows_inserted: int = Field(..., description="Rows inserted into metrics_input")
+    rows_rejected: int = Field(..., description="Rows that failed validation")
+    rows_per_second: Optional[float] = Field(None, description="Processing throughput since the job started")
+    errors: Optional[List[Dict[str, Any]]] = Field(None, description="Validation errors, up to the reporting limit")
+    error_message: Optional[str] = Field(None, description="Reason the job failed")
+    created_date: Optional[datetime] = Field(None, description="Date and time the job was submitted")
+    started_at: Optional[datetime] = Field(None, description="Date and time processing started")
+    finished_at: Optional[datetime] = Field(None, description="Date and time processing finished")
+
+    class Config:
+        orm_mode = True
+
+class BatchRowResult(BaseModel):
+    """
+    Outcome of a single record submitted to the batch ingestion endpoint.
+    """
+    index: int = Field(..., description="Position of the record in the submitted batch")
+    status: str = Field(..., description="'created', 'invalid' or 'conflict' when metrics for the company and period already exist")
+    metrics_id: Optional[PyUUID] = Field(None, description="Identifier of the created record")
+    errors: Optional[List[Dict[str, Any]]] = Field(None, description="Validation or conflict errors for records that were not created")
+
+# Error reported for submitted records whose company and fiscal reporting date already have metrics
+NATURAL_KEY_CONFLICT = {
+    "loc": ["company_id", "fiscal_reporting_date"],
+    "msg": "metrics already exist for this company and fiscal reporting date; use PUT /metrics/ to correct a reported period",
+    "type": "value_error.conflict",
+}
+
+class MetricsBatchResponse(BaseModel):
+    """
+    Response of the batch ingestion endpoint, with one result per submitted record in submission order.
+    """
+    created: int = Field(..., description="Number of records inserted")
+    rejected: int = Field(..., description="Number of records that failed validation")
+    conflicts: int = Field(0, description="Number of records not inserted because their company and period already exist")
+    results: List[BatchRowResult] = Field(..., description="Per-record results")
+
 # Note: Ensure that the UUID generation function `uuid_generate_v4()` is available in your PostgreSQL database.
 # If not, you may need to create an extension or use a different method for UUID generation.
\ No newline at end of file
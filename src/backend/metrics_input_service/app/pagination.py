@@ -0,0 +1,53 @@
+"""
+Keyset pagination helpers for metrics listings.
+
+Pages are ordered by (fiscal_reporting_date, id), and each page starts strictly after the last
+row of the previous one. The next page is therefore a range scan on the company's
+``uq_metrics_input_company_id_fiscal_reporting_date`` index rather than an OFFSET that re-reads
+every earlier row, so page latency does not grow with depth. The position is handed to
+clients as an opaque cursor.
+
+Requirements addressed:
+- API Services (Technical Requirements/Feature 2: API Development and Deployment):
+  Keep responses bounded and fast for companies with long reporting histories.
+"""
+
+import base64
+import json
+from datetime import date
+from typing import NamedTuple
+from uuid import UUID
+
+# Response header carrying the cursor of the next page; absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class MetricsCursor(NamedTuple):
+    """
+    Position of the last row of a page.
+    """
+    fiscal_reporting_date: date
+    id: UUID
+
+
+def encode_cursor(cursor: MetricsCursor) -> str:
+    """
+    Encode a page position as an opaque URL-safe token.
+    """
+    payload = json.dumps([cursor.fiscal_reporting_date.isoformat(), str(cursor.id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> MetricsCursor:
+    """
+    Decode a token produced by ``encode_cursor``.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        reporting_date, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return MetricsCursor(date.fromisoformat(reporting_date), UUID(row_id))
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
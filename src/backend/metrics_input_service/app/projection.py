@@ -0,0 +1,67 @@
+"""
+Sparse field selection for metrics read endpoints.
+
+Clients pass ``fields=total_revenue,recurring_revenue`` to receive only those fields. The
+selection is pushed into the SQL SELECT as Core columns, so fewer columns are read, no ORM
+objects are built, and each row is serialized through a response model containing only the
+requested fields. Narrow models are created once per distinct field set.
+
+Requirements addressed:
+- API Services (Technical Requirements/Feature 2: API Development and Deployment):
+  Let dashboards fetch just the series they chart instead of full metrics records.
+"""
+
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, create_model
+from sqlalchemy import Column
+
+from src.backend.metrics_input_service.app.models.models import MetricsInput, MetricsInputSchema
+
+PROJECTABLE_FIELDS = tuple(MetricsInputSchema.__fields__)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated field list into schema field names, in schema order.
+
+    Args:
+        fields (Optional[str]): The raw ``fields`` query parameter.
+
+    Returns:
+        Optional[Tuple[str, ...]]: The selected fields, or None when all fields are requested.
+
+    Raises:
+        ValueError: If the list is empty or names unknown fields.
+    """
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if not requested:
+        raise ValueError("fields must name at least one field")
+    unknown = requested.difference(PROJECTABLE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in PROJECTABLE_FIELDS if name in requested)
+
+
+def projection_columns(fields: Iterable[str], required: Iterable[str] = ()) -> List[Column]:
+    """
+    Table columns to select for the given fields, plus any columns the query itself needs, e.g. keyset keys.
+    """
+    names = list(fields)
+    names += [name for name in required if name not in names]
+    return [MetricsInput.__table__.c[name] for name in names]
+
+
+@lru_cache(maxsize=128)
+def projection_model(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Response model with only the given MetricsInputSchema fields, keeping their types and descriptions.
+    """
+    definitions = {
+        name: (MetricsInputSchema.__annotations__[name], MetricsInputSchema.__fields__[name].field_info)
+        for name in fields
+    }
+    return create_model("MetricsInputProjection", **definitions)
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+from uuid import UUID
+
+from src.backend.metrics_input_service.app.database import get_db
+from src.backend.metrics_input_service.app.imports import job_to_schema
+from src.backend.metrics_input_service.app.ingestion import is_supported_upload
+from src.backend.metrics_input_service.app.models.models import ImportJob, ImportJobSchema
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+router = APIRouter()
+
+@router.post('/imports/', response_model=ImportJobSchema, status_code=202)
+async def create_import(request: Request, file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
+    """
+    Accepts a CSV or Excel file for background import and returns its job immediately.
+    
+    The file is staged to disk and processed by the service's import worker pool; poll
+    GET /imports/{id} for progress.
+    
+    Args:
+        request (Request): The incoming request, used to reach the application's import runner.
+        file (UploadFile): The metrics file to import.
+        db (AsyncSession): Database session dependency.
+    
+    Returns:
+        ImportJobSchema: The newly created pending job.
+    
+    Raises:
+        HTTPException: If the file type is unsupported or the job cannot be recorded.
+    """
+    if not is_supported_upload(file.filename):
+        raise HTTPException(status_code=415, detail=f"Unsupported file type: {file.filename}")
+    try:
+        job = await request.app.state.import_runner.submit(db, file.file, file.filename)
+        return job_to_schema(job)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred while creating the import job: {str(e)}")
+
+@router.get('/imports/{job_id}', response_model=ImportJobSchema)
+async def get_import(job_id: UUID, db: AsyncSession = Depends(get_db)):
+    """
+    Reports the progress of an import job.
+    
+    Args:
+        job_id (UUID): The import job identifier.
+        db (AsyncSession): Database session dependency.
+    
+    Returns:
+        ImportJobSchema: Status, rows processed and rejected so far, and throughput.
+    
+    Raises:
+        HTTPException: If the job does not exist.
+    """
+    job = await db.get(ImportJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job_to_schema(job)
+
+"""
+This module defines the API endpoints for background bulk imports within the Metrics Input Service.
+Large historical uploads are accepted immediately and processed asynchronously, with progress exposed
+for polling.
+
+Requirements addressed:
+- Data Input Methods (Technical Requirements/Feature 4: Data Input Methods):
+  Support bulk upload of metrics without holding HTTP requests open for the duration of the import.
+"""
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Request
+
+from src.backend.metrics_input_service.app.database import pool_status, telemetry
+from src.backend.metrics_input_service.app.security import verify_api_key
+
+# Hidden from the API docs, but mounted on the public app, so every route requires the API key
+router = APIRouter(dependencies=[Depends(verify_api_key)])
+
+@router.get('/internal/metrics')
+async def get_internal_metrics(request: Request):
+    """
+    Reports database pool telemetry and, in write-behind mode, the buffer's backlog and flush lag.
+    
+    Args:
+        request (Request): The incoming request, used to reach the application's write-behind buffer.
+    
+    Returns:
+        dict: Current pool occupancy and saturation, the time requests waited to check out a connection,
+        and write-behind statistics when enabled.
+    """
+    metrics = {
+        "database_pool": pool_status(),
+        "checkout_wait": telemetry.snapshot(),
+    }
+    write_behind = request.app.state.write_behind
+    if write_behind is not None:
+        metrics["write_behind"] = await write_behind.stats()
+    return metrics
+
+"""
+This module exposes internal operational endpoints of the Metrics Input Service. They are excluded from the
+public API documentation, require the service's API key in the ``X-API-Key`` header and are intended
+for monitoring probes and dashboards.
+
+Requirements addressed:
+- API Services (Technical Requirements/Feature 2: API Development and Deployment):
+  Expose operational metrics needed to size and monitor the service.
+"""
@@ -1,112 +1,556 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Optional
-from datetime import date
-from uuid import UUID
+from fastapi import APIRouter, Body, Depends, File, Header, HTTPException, Query, Request, Response, UploadFile
+from typing import Any, Dict, List, Optional
+from datetime import date, datetime
+from uuid import UUID, uuid4
 
-from src.backend.metrics_input_service.app.models.models import MetricsInput, MetricsInputSchema
+from src.backend.metrics_input_service.app.database import AsyncSessionLocal, LazySession, get_db, get_driver_connection, get_lazy_db
+from src.backend.metrics_input_service.app.events import ChangeSet, change_publisher
+from src.backend.metrics_input_service.app.idempotency import IDEMPOTENCY_KEY_HEADER, IdempotencyRecord, idempotency_store, replay, request_hash
+from src.backend.metrics_input_service.app.ingestion import (
+    MetricsUploadResponse,
+    UnsupportedUploadError,
+    UploadParseError,
+    ingest_upload,
+)
+from src.backend.metrics_input_service.app.projection import PROJECTABLE_FIELDS, parse_fields, projection_columns, projection_model
+from src.backend.metrics_input_service.app.streaming import NDJSON_MEDIA_TYPE, stream_metrics_ndjson
+from src.backend.metrics_input_service.app.validation import validate_records
+from src.backend.metrics_input_service.app.pagination import NEXT_CURSOR_HEADER, MetricsCursor, decode_cursor, encode_cursor
+from src.backend.metrics_input_service.app.models.models import (
+    BatchRowResult,
+    MetricsBatchResponse,
+    MetricsInput,
+    MetricsInputSchema,
+    NATURAL_KEY_CONFLICT,
+    companies,
+)
 from src.backend.metrics_input_service.config import settings
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
+from src.backend.shared.etag import ETAG_HEADER, etag_matches, make_etag, not_modified, range_version
+from sqlalchemy import Boolean, func, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from starlette.responses import StreamingResponse
 
 # Version information for external libraries
 # fastapi==0.68.0
 
 router = APIRouter()
 
-# Dependency to get database session
-def get_db():
-    """
-    Dependency function to provide a database session.
-    
-    This function should be implemented to return a database session.
-    For example, it could use SQLAlchemy's sessionmaker to provide a session.
-    
-    Returns:
-        Session: A SQLAlchemy session object.
-    """
-    # Placeholder for actual database session retrieval logic
-    # Example: return SessionLocal()
-    pass
+# PostgreSQL caps the number of bind parameters in a single statement
+POSTGRES_MAX_PARAMETERS = 65535
+
+# Columns a correction overwrites; the natural key and the creation audit fields are kept
+CORRECTABLE_COLUMNS = [
+    column.name for column in MetricsInput.__table__.columns
+    if column.name not in ("id", "company_id", "fiscal_reporting_date", "created_date", "created_by", "last_update_date", "last_updated_by")
+]
 
 @router.post('/metrics/', response_model=dict)
-async def create_metrics(metrics_data: MetricsInputSchema, db: Session = Depends(get_db)):
+async def create_metrics(
+    metrics_data: MetricsInputSchema,
+    request: Request,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias=IDEMPOTENCY_KEY_HEADER, max_length=255),
+    sessions: LazySession = Depends(get_lazy_db)
+):
     """
     Handles the creation of new financial metrics data entries.
     
     This endpoint is responsible for validating incoming metrics data,
     inserting it into the PostgreSQL database, and returning a confirmation message.
+    When an Idempotency-Key header is sent, a retry with the same key and payload
+    receives the original response and inserts nothing. In write-behind mode the
+    entry is buffered and acknowledged with a receipt (202) instead, and written
+    to the database in a later batch; such requests do not open a database session.
     
     Args:
         metrics_data (MetricsInputSchema): The metrics data to be inserted.
-        db (Session): Database session dependency.
+        request (Request): The incoming request, used to reach the application's write-behind buffer.
+        response (Response): The outgoing response, whose status is 202 for buffered entries.
+        idempotency_key (str, optional): Client-chosen key identifying this submission across retries.
+        sessions (LazySession): Database session dependency, opened only when the entry is written directly.
     
     Returns:
-        dict: A confirmation message indicating successful creation.
+        dict: A confirmation message indicating successful creation, or acceptance with a receipt.
     
     Raises:
-        HTTPException: If there's an error during data insertion.
+        HTTPException: If there's an error during data insertion, or the key was used for a different payload.
     """
+    digest = request_hash(metrics_data.dict()) if idempotency_key else None
+    write_behind = request.app.state.write_behind
+    if write_behind is not None:
+        # Buffered keys are checked locally; the flusher rejects copies that reached another replica
+        if idempotency_key:
+            record = idempotency_store.cached(idempotency_key) or await write_behind.idempotency_record(idempotency_key)
+            if record is not None:
+                return replay(record, digest)
+        metrics_data = metrics_data.copy(update={"id": metrics_data.id or uuid4()})
+        body = {"message": "Metrics data accepted", "metrics_id": str(metrics_data.id), "receipt": str(metrics_data.id)}
+        idempotency = None
+        if idempotency_key:
+            record = IdempotencyRecord(digest, 202, body, datetime.utcnow() + idempotency_store.ttl)
+            idempotency = (idempotency_key, record)
+        await write_behind.submit(metrics_data, idempotency)
+        if idempotency:
+            idempotency_store.remember(*idempotency)
+        response.status_code = 202
+        return body
+
+    db = await sessions()
     try:
+        if idempotency_key:
+            record = await idempotency_store.lookup(db, idempotency_key)
+            if record is not None:
+                return replay(record, digest)
+
         # Convert Pydantic model to SQLAlchemy model
         metrics_instance = MetricsInput(**metrics_data.dict())
 
         # Insert the validated data into the PostgreSQL database
         db.add(metrics_instance)
-        db.commit()
-        db.refresh(metrics_instance)
+        await db.flush()
+        body = {"message": "Metrics data created successfully", "metrics_id": str(metrics_instance.id)}
+        if idempotency_key:
+            # Recorded in the same transaction, so the response is stored exactly when the row is
+            record = await idempotency_store.add(db, idempotency_key, digest, 200, body)
+        changes = ChangeSet()
+        changes.add(metrics_data.company_id, metrics_data.fiscal_reporting_date)
+        await change_publisher.publish(db, changes)
+        await db.commit()
+        if idempotency_key:
+            idempotency_store.remember(idempotency_key, record)
+
+        return body
+    except IntegrityError as e:
+        await db.rollback()
+        if idempotency_key:
+            # A concurrent attempt with the same key committed first
+            record = await idempotency_store.lookup(db, idempotency_key)
+            if record is not None:
+                return replay(record, digest)
+        raise HTTPException(
+            status_code=409,
+            detail=f"Metrics conflict with existing data; use PUT /metrics/ to correct a reported period: {str(e.orig)}",
+        )
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"An error occurred while creating metrics: {str(e)}")
+
+@router.get('/metrics/receipts/{receipt}', response_model=dict)
+async def get_receipt(receipt: UUID, request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Reports whether a submission accepted in write-behind mode has been written.
+    
+    Args:
+        receipt (UUID): The receipt returned when the submission was accepted.
+        request (Request): The incoming request, used to reach the application's write-behind buffer.
+        db (AsyncSession): Database session dependency.
+    
+    Returns:
+        dict: The receipt and its status: 'pending', 'committed' or 'rejected' with the reason.
+    
+    Raises:
+        HTTPException: If the receipt is unknown.
+    """
+    write_behind = request.app.state.write_behind
+    status = await write_behind.status(str(receipt)) if write_behind is not None else None
+    if status is not None:
+        return status
+    try:
+        if await db.get(MetricsInput, receipt) is not None:
+            return {"receipt": str(receipt), "status": "committed"}
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred while retrieving the receipt: {str(e)}")
+    raise HTTPException(status_code=404, detail="Unknown receipt")
+
+@router.put('/metrics/', response_model=dict)
+async def upsert_metrics(metrics_data: MetricsInputSchema, response: Response, db: AsyncSession = Depends(get_db)):
+    """
+    Creates or corrects the financial metrics of a company for a fiscal reporting date.
+    
+    The entry is written with a single INSERT ... ON CONFLICT (company_id, fiscal_reporting_date)
+    DO UPDATE ... RETURNING statement, so a correction takes one round trip and concurrent
+    submissions for the same period cannot both insert.
+    
+    Args:
+        metrics_data (MetricsInputSchema): The metrics data to be written.
+        response (Response): The outgoing response, whose status is 201 when the entry is new.
+        db (AsyncSession): Database session dependency.
+    
+    Returns:
+        dict: A confirmation message with the entry's id and whether it was created.
+    
+    Raises:
+        HTTPException: If there's an error during the write.
+    """
+    values = metrics_data.dict(exclude={"id", "created_date", "last_update_date"})
+    values["id"] = metrics_data.id or uuid4()
+    statement = pg_insert(MetricsInput).values(**values)
+    excluded = statement.excluded
+    statement = statement.on_conflict_do_update(
+        index_elements=[MetricsInput.company_id, MetricsInput.fiscal_reporting_date],
+        set_={
+            **{column: excluded[column] for column in CORRECTABLE_COLUMNS},
+            "last_update_date": func.now(),
+            "last_updated_by": func.coalesce(excluded.last_updated_by, excluded.created_by),
+        },
+    ).returning(
+        MetricsInput.id,
+        # xmax is only zero for a freshly inserted row version
+        literal_column("xmax = 0", type_=Boolean).label("inserted"),
+    )
+    changes = ChangeSet()
+    changes.add(metrics_data.company_id, metrics_data.fiscal_reporting_date)
+    try:
+        row = (await db.execute(statement)).one()
+        await change_publisher.publish(db, changes)
+        await db.commit()
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"An error occurred while writing metrics: {str(e)}")
+
+    response.status_code = 201 if row.inserted else 200
+    message = "Metrics data created successfully" if row.inserted else "Metrics data updated successfully"
+    return {"message": message, "metrics_id": str(row.id), "created": bool(row.inserted)}
+
+@router.post('/metrics/batch', response_model=MetricsBatchResponse)
+async def create_metrics_batch(records: List[Dict[str, Any]] = Body(...), db: AsyncSession = Depends(get_db)):
+    """
+    Handles bulk submission of financial metrics, e.g. quarter-close uploads from finance.
+    
+    Records are validated against MetricsInputSchema column by column; invalid records are reported and skipped,
+    and all valid records are inserted with multi-row INSERT ... ON CONFLICT DO NOTHING statements in a single
+    transaction. A record whose company and fiscal reporting date are already stored, or repeat an earlier
+    record of the batch, is not inserted and is reported with status 'conflict'; corrections go through PUT.
+    
+    Args:
+        records (List[Dict[str, Any]]): The metrics records to be inserted.
+        db (AsyncSession): Database session dependency.
+    
+    Returns:
+        MetricsBatchResponse: Counts and a per-record result in submission order.
+    
+    Raises:
+        HTTPException: If the batch is too large or the insert fails, in which case nothing is inserted.
+    """
+    if len(records) > settings.max_batch_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(records)} records exceeds the limit of {settings.max_batch_size}",
+        )
 
-        return {"message": "Metrics data created successfully", "metrics_id": str(metrics_instance.id)}
+    validated = validate_records(records)
+    submitted = {}
+    periods = set()
+    for index, row in zip(validated.indexes.tolist(), validated.dicts()):
+        period = (row["company_id"], row["fiscal_reporting_date"])
+        if period in periods:
+            continue
+        periods.add(period)
+        # Ids are assigned up front so each result can report its record
+        row["id"] = row["id"] or uuid4()
+        row["created_date"] = row["created_date"] or func.now()
+        submitted[index] = row
+
+    inserted = set()
+    try:
+        rows = list(submitted.values())
+        if rows:
+            rows_per_statement = POSTGRES_MAX_PARAMETERS // len(rows[0])
+            for start in range(0, len(rows), rows_per_statement):
+                statement = (
+                    pg_insert(MetricsInput)
+                    .values(rows[start:start + rows_per_statement])
+                    .on_conflict_do_nothing()
+                    .returning(MetricsInput.id)
+                )
+                inserted.update((await db.execute(statement)).scalars().all())
+            changes = ChangeSet()
+            for row in rows:
+                if row["id"] in inserted:
+                    changes.add(row["company_id"], row["fiscal_reporting_date"])
+            await change_publisher.publish(db, changes)
+            await db.commit()
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"An error occurred while creating metrics: {str(e)}")
 
+    errors = dict(validated.errors)
+    results = []
+    for index in range(len(records)):
+        if index in errors:
+            results.append(BatchRowResult(index=index, status="invalid", errors=errors[index].errors()))
+        elif index in submitted and submitted[index]["id"] in inserted:
+            results.append(BatchRowResult(index=index, status="created", metrics_id=submitted[index]["id"]))
+        else:
+            results.append(BatchRowResult(index=index, status="conflict", errors=[NATURAL_KEY_CONFLICT]))
+    return MetricsBatchResponse(
+        created=len(inserted),
+        rejected=len(errors),
+        conflicts=len(records) - len(errors) - len(inserted),
+        results=results,
+    )
+
+@router.post('/metrics/upload', response_model=MetricsUploadResponse)
+async def upload_metrics(file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
+    """
+    Handles bulk upload of financial metrics from a CSV or Excel (.xlsx) file.
+    
+    The file is parsed as a stream, validated in chunks against MetricsInputSchema and copied with a
+    single COPY into a staging table, so memory use stays constant regardless of file size. The staged
+    rows are then merged into metrics_input; rows whose company and fiscal reporting date already exist,
+    or repeat an earlier row of the file, are skipped and reported as conflicts. Invalid rows are skipped
+    and reported. Parsing runs in the threadpool so the event loop keeps serving other requests during
+    large uploads.
+    
+    Args:
+        file (UploadFile): The uploaded CSV or Excel file with a header row of MetricsInputSchema field names.
+        db (AsyncSession): Database session dependency.
+    
+    Returns:
+        MetricsUploadResponse: Counts of received, inserted, rejected and conflicting rows, with details for the first rejections.
+    
+    Raises:
+        HTTPException: 415 if the file type is unsupported, 400 if the file cannot be parsed, or 500 if the
+            COPY fails; nothing is inserted in either case.
+    """
+    try:
+        stats = await ingest_upload(await get_driver_connection(db), file.file, file.filename)
+        await change_publisher.publish(db, stats.changes)
+        await db.commit()
+        return stats.to_response()
+    except UnsupportedUploadError as e:
+        await db.rollback()
+        raise HTTPException(status_code=415, detail=str(e))
+    except UploadParseError as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"An error occurred while uploading metrics: {str(e)}")
+
+def metrics_query(
+    query,
+    company_id: Optional[UUID],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    after: Optional[MetricsCursor] = None,
+    fund: Optional[str] = None,
+):
+    """
+    Applies the company or fund, date-range and keyset filters shared by the metrics read endpoints.
+    
+    Rows are ordered by (company_id, fiscal_reporting_date, id) so the company/date index serves both
+    the filter and the order, and ``after`` resumes strictly after a previous page of a company.
+    
+    Args:
+        query (Select): The select statement to filter.
+        company_id (UUID, optional): The unique identifier of the company.
+        start_date (date, optional): The start date for the query range.
+        end_date (date, optional): The end date for the query range.
+        after (MetricsCursor, optional): Position of the last row already returned.
+        fund (str, optional): Restricts the rows to the companies of this fund.
+    
+    Returns:
+        Select: The filtered and ordered statement.
+    
+    Raises:
+        HTTPException: If neither a company nor a fund is given or the date range is invalid.
+    """
+    if company_id is None and fund is None:
+        raise HTTPException(status_code=400, detail="company_id or fund is required")
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be before or equal to end_date")
+
+    if company_id is not None:
+        query = query.where(MetricsInput.company_id == company_id)
+    if fund is not None:
+        query = query.where(MetricsInput.company_id.in_(select(companies.c.id).where(companies.c.fund == fund)))
+    if start_date:
+        query = query.where(MetricsInput.fiscal_reporting_date >= start_date)
+    if end_date:
+        query = query.where(MetricsInput.fiscal_reporting_date <= end_date)
+    if after:
+        query = query.where(
+            tuple_(MetricsInput.fiscal_reporting_date, MetricsInput.id) > tuple_(after.fiscal_reporting_date, after.id)
+        )
+    return query.order_by(MetricsInput.company_id, MetricsInput.fiscal_reporting_date, MetricsInput.id)
+
+async def metrics_version(
+    db: AsyncSession,
+    company_id: Optional[UUID],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    fund: Optional[str] = None,
+):
+    """
+    Computes the version of a key range: its row count, latest creation or update time and the
+    sum of its modification times.
+    
+    The aggregates read only columns of the covering company/date index, so the query is
+    an index-only scan that is much cheaper than fetching the rows themselves.
+    
+    Args:
+        db (AsyncSession): Database session.
+        company_id (UUID, optional): The unique identifier of the company.
+        start_date (date, optional): The start date for the query range.
+        end_date (date, optional): The end date for the query range.
+        fund (str, optional): Restricts the rows to the companies of this fund.
+    
+    Returns:
+        Row: The ``range_version`` aggregates of the range.
+    
+    Raises:
+        HTTPException: If neither a company nor a fund is given or the date range is invalid.
+    """
+    modified_at = func.coalesce(MetricsInput.last_update_date, MetricsInput.created_date)
+    query = metrics_query(select(*range_version(modified_at)), company_id, start_date, end_date, fund=fund)
+    # An aggregate over the whole range has no row order
+    return (await db.execute(query.order_by(None))).one()
+
 @router.get('/metrics/', response_model=List[MetricsInputSchema])
 async def get_metrics(
+    response: Response,
     company_id: UUID,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of entries per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return; all fields when omitted"),
+    if_none_match: Optional[str] = Header(None, description="ETag of a previously received page"),
+    db: AsyncSession = Depends(get_db)
 ):
     """
-    Retrieves financial metrics data based on specified query parameters.
+    Retrieves financial metrics data based on specified query parameters, one page at a time.
     
     This endpoint queries the PostgreSQL database for metrics entries matching
-    the provided company_id, start_date, and end_date parameters.
+    the provided company_id, start_date, and end_date parameters, ordered by
+    fiscal reporting date. When more entries remain, the X-Next-Cursor response
+    header holds the cursor to pass to fetch the next page. With ``fields``, only the
+    named columns are selected and returned. Every page carries an ETag; when
+    If-None-Match holds the current one, a 304 is returned without reading the rows.
     
     Args:
+        response (Response): The outgoing response, used to set the next-page cursor header.
         company_id (UUID): The unique identifier of the company.
         start_date (date, optional): The start date for the query range.
         end_date (date, optional): The end date for the query range.
-        db (Session): Database session dependency.
+        limit (int, optional): Page size; defaults to and is capped by the configured page limits.
+        cursor (str, optional): Opaque cursor of the page to fetch.
+        fields (str, optional): Comma-separated MetricsInputSchema fields to include.
+        if_none_match (str, optional): ETags the client already holds.
+        db (AsyncSession): Database session dependency.
     
     Returns:
-        List[MetricsInputSchema]: A list of financial metrics entries matching the query parameters.
+        List[MetricsInputSchema]: A page of financial metrics entries matching the query parameters,
+        restricted to the requested fields when ``fields`` is given, or an empty 304 response.
     
     Raises:
         HTTPException: If there's an error during data retrieval or if no data is found.
     """
     try:
-        # Validate the query parameters
-        if start_date and end_date and start_date > end_date:
-            raise HTTPException(status_code=400, detail="start_date must be before or equal to end_date")
-
-        # Query the PostgreSQL database for metrics entries matching the parameters
-        query = db.query(MetricsInput).filter(MetricsInput.company_id == company_id)
-        if start_date:
-            query = query.filter(MetricsInput.fiscal_reporting_date >= start_date)
-        if end_date:
-            query = query.filter(MetricsInput.fiscal_reporting_date <= end_date)
-        metrics = query.all()
-
-        if not metrics:
+        try:
+            after = decode_cursor(cursor) if cursor else None
+            selected = parse_fields(fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        limit = min(limit or settings.metrics_page_limit, settings.metrics_page_limit_max)
+
+        version = await metrics_version(db, company_id, start_date, end_date)
+        if version[0] == 0 and after is None:
+            raise HTTPException(status_code=404, detail="No metrics found for the given parameters")
+        etag = make_etag(version, company_id, start_date, end_date, limit, cursor, selected)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        response.headers[ETAG_HEADER] = etag
+
+        if selected is None:
+            query = select(MetricsInput)
+        else:
+            # The keyset columns are always read so the next cursor can be built
+            query = select(*projection_columns(selected, required=("fiscal_reporting_date", "id")))
+        # Fetch one extra row to learn whether another page follows
+        query = metrics_query(query, company_id, start_date, end_date, after).limit(limit + 1)
+        result = await db.execute(query)
+        metrics = result.scalars().all() if selected is None else result.all()
+
+        if not metrics and after is None:
             raise HTTPException(status_code=404, detail="No metrics found for the given parameters")
 
+        if len(metrics) > limit:
+            metrics = metrics[:limit]
+            last = metrics[-1]
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(MetricsCursor(last.fiscal_reporting_date, last.id))
+
+        if selected is not None:
+            # The narrow rows bypass response_model validation, which would require every field
+            model = projection_model(selected)
+            body = "[" + ",".join(model.parse_obj(row._mapping).json() for row in metrics) + "]"
+            headers = {name: response.headers[name] for name in (ETAG_HEADER, NEXT_CURSOR_HEADER) if name in response.headers}
+            return Response(content=body, media_type="application/json", headers=headers)
+
         return metrics
     except HTTPException as he:
         raise he
     except SQLAlchemyError as e:
         raise HTTPException(status_code=500, detail=f"An error occurred while retrieving metrics: {str(e)}")
 
+@router.get('/metrics/stream', response_class=StreamingResponse)
+async def stream_metrics(
+    company_id: Optional[UUID] = None,
+    fund: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return; all fields when omitted"),
+    if_none_match: Optional[str] = Header(None, description="ETag of a previously received export"),
+):
+    """
+    Streams every financial metrics entry of a company or a fund as newline-delimited JSON.
+    
+    Unlike the paged listing, the whole result is returned in one response. Rows are read
+    through a server-side cursor and written as they arrive, one JSON object per line, so
+    exports of any size use constant memory and start transferring immediately. The export
+    carries an ETag, and a 304 is returned when If-None-Match holds the current one.
+    
+    Args:
+        company_id (UUID, optional): The unique identifier of the company.
+        fund (str, optional): The fund whose companies' metrics are exported.
+        start_date (date, optional): The start date for the query range.
+        end_date (date, optional): The end date for the query range.
+        fields (str, optional): Comma-separated MetricsInputSchema fields to include.
+        if_none_match (str, optional): ETags the client already holds.
+    
+    Returns:
+        StreamingResponse: An application/x-ndjson response of MetricsInputSchema objects,
+        restricted to the requested fields when ``fields`` is given, or an empty 304 response.
+    
+    Raises:
+        HTTPException: If neither a company nor a fund is given, the date range is invalid or a field is unknown.
+    """
+    try:
+        selected = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if selected is None:
+        selected = PROJECTABLE_FIELDS
+    query = metrics_query(select(*projection_columns(selected)), company_id, start_date, end_date, fund=fund)
+
+    try:
+        # The stream reads through its own session, so this one is released before streaming starts
+        async with AsyncSessionLocal() as db:
+            version = await metrics_version(db, company_id, start_date, end_date, fund)
+    except SQLAlchemyError as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred while exporting metrics: {str(e)}")
+    etag = make_etag(version, company_id, fund, start_date, end_date, selected)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    return StreamingResponse(
+        stream_metrics_ndjson(query, projection_model(selected), settings.metrics_stream_batch_size),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={ETAG_HEADER: etag},
+    )
+
 # This section demonstrates how the router would be included in the main FastAPI application
 # app = FastAPI()
 # app.include_router(router, prefix="/api/v1", tags=["metrics"])
@@ -124,6 +568,6 @@ The module uses FastAPI to create API endpoints, leveraging its high performance
 validation and documentation generation. It integrates with the MetricsInput model from the models module to ensure
 data consistency and with the Settings from the config module for any configuration-specific needs.
 
-Note: This module assumes the existence of a database session management system, which should be implemented
-separately. The placeholder 'get_db' function should be replaced with the actual database session retrieval logic.
+Database access is asynchronous: sessions come from the 'get_db' dependency in the database module and every
+query is awaited, so concurrent requests do not block each other on the event loop.
 """
\ No newline at end of file
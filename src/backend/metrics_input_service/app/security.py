@@ -0,0 +1,33 @@
+"""
+API key authentication for the service's non-public endpoints.
+
+Callers present the service's ``API_KEY`` in the ``X-API-Key`` header. The key is compared in
+constant time so that response timing does not reveal how much of a guess was right.
+
+Requirements addressed:
+- Authentication and Authorization (Technical Requirements/Feature 4: Authentication and Authorization Implementation):
+  Restrict operational data to authorized monitoring clients.
+"""
+
+import secrets
+from typing import Optional
+
+from fastapi import HTTPException, Security
+from fastapi.security import APIKeyHeader
+
+from src.backend.metrics_input_service.config import settings
+
+API_KEY_HEADER = "X-API-Key"
+
+api_key_header = APIKeyHeader(name=API_KEY_HEADER, auto_error=False)
+
+
+async def verify_api_key(api_key: Optional[str] = Security(api_key_header)) -> None:
+    """
+    Dependency rejecting requests without the service's API key.
+
+    Raises:
+        HTTPException: 401 if the key is missing or wrong.
+    """
+    if api_key is None or not secrets.compare_digest(api_key.encode("utf-8"), settings.api_key.encode("utf-8")):
+        raise HTTPException(status_code=401, detail="Invalid or missing API key", headers={"WWW-Authenticate": API_KEY_HEADER})
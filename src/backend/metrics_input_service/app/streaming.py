@@ -0,0 +1,54 @@
+"""
+Streaming export of metrics rows as newline-delimited JSON.
+
+Full-fund exports can cover every ``metrics_input`` row of a portfolio. Instead of loading the
+result and serializing one large JSON array, the query runs on a server-side cursor and rows
+are fetched in partitions of ``batch_size``; each partition is serialized to NDJSON and sent
+as one chunk before the next is fetched. Memory use is bounded by a single partition, and
+the first bytes reach the client as soon as the first partition arrives.
+
+Requirements addressed:
+- API Services (Technical Requirements/Feature 2: API Development and Deployment):
+  Serve bulk analyst extracts without buffering whole result sets in the API process.
+"""
+
+from typing import AsyncIterator, Callable, Type
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from src.backend.metrics_input_service.app.database import AsyncSessionLocal
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def stream_metrics_ndjson(
+    query: Select,
+    model: Type[BaseModel],
+    batch_size: int = 1000,
+    session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+) -> AsyncIterator[bytes]:
+    """
+    Run a metrics query on a server-side cursor and yield its rows as NDJSON chunks.
+
+    The query selects table columns rather than ORM entities, so rows are serialized straight
+    from the driver's records without building mapped objects.
+
+    The session is opened by the generator itself rather than taken from the request, as the
+    response body is produced after the endpoint has returned. It is closed when the stream
+    ends, including when the client disconnects part way through.
+
+    Args:
+        query (Select): Select statement over MetricsInput columns.
+        model (Type[BaseModel]): Schema each row is serialized with, matching the selected columns.
+        batch_size (int): Rows fetched from the cursor and written per chunk.
+        session_factory (Callable[[], AsyncSession]): Creates the session the query runs in.
+
+    Yields:
+        bytes: One NDJSON chunk per fetched partition of rows.
+    """
+    async with session_factory() as db:
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.mappings().partitions(batch_size):
+            yield "".join(model.parse_obj(row).json() + "\n" for row in rows).encode("utf-8")
@@ -0,0 +1,167 @@
+"""
+Column-wise validation of metrics records for bulk ingestion.
+
+Parsing every uploaded row into a MetricsInputSchema instance costs tens of microseconds per
+row, which dominates the CPU time of large uploads. ``validate_records`` validates a chunk one
+field at a time instead:
+
+- Float and integer columns are converted in bulk by numpy, which applies the same ``float()``
+  and ``int()`` conversions as the schema.
+- Columns of strings, dates or datetimes are factorized, and the field's own validator runs
+  once per distinct value. Company ids, currencies and reporting dates repeat throughout a
+  file, so this is a small fraction of the rows.
+- A column that cannot be converted in bulk is validated value by value with the field's validator.
+
+Required fields must be present in every row. A row that fails any field check is parsed into
+MetricsInputSchema on its own, which produces the usual error details. Because every check uses
+the schema's own conversions, the result is the same as validating each row separately.
+
+Requirements addressed:
+- Data Input Methods (Technical Requirements/Feature 4: Data Input Methods):
+  Keep validation of bulk uploads from limiting ingestion throughput.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np  # version 1.25.2
+import pandas as pd  # version 2.0.3
+from pandas.api.types import infer_dtype
+from pydantic import ValidationError
+from pydantic.fields import ModelField
+
+from src.backend.metrics_input_service.app.models.models import MetricsInputSchema
+
+# Column kinds whose equal values are also of the same type, so one validation per distinct value suffices
+DISTINCT_KINDS = ("string", "date", "datetime")
+
+# Column check: (field, present values) -> (accepted mask, converted values)
+ColumnCheck = Callable[[ModelField, np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+
+class ValidatedRecords:
+    """
+    Valid records of a batch, held column by column, and the errors of the invalid ones.
+
+    Args:
+        indexes (np.ndarray): Positions of the valid records in the batch, ascending.
+        columns (Dict[str, np.ndarray]): Converted values of each schema field, aligned with ``indexes``.
+        errors (List[Tuple[int, ValidationError]]): Position and error of each invalid record, ascending.
+    """
+
+    def __init__(self, indexes: np.ndarray, columns: Dict[str, np.ndarray], errors: List[Tuple[int, ValidationError]]):
+        self.indexes = indexes
+        self.columns = columns
+        self.errors = errors
+
+    def __len__(self) -> int:
+        return len(self.indexes)
+
+    def column(self, name: str) -> List[Any]:
+        """
+        The values of one field for every valid record.
+        """
+        return self.columns[name].tolist()
+
+    def tuples(self, names: Sequence[str]) -> List[Tuple]:
+        """
+        The valid records as tuples of the named fields, in batch order.
+        """
+        return list(zip(*(self.column(name) for name in names))) if len(self) else []
+
+    def dicts(self, names: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        The valid records as dictionaries of the named fields, all fields by default, in batch order.
+        """
+        names = list(names if names is not None else self.columns)
+        return [dict(zip(names, values)) for values in self.tuples(names)]
+
+
+def _objects(values: Iterable[Any], count: int) -> np.ndarray:
+    return np.fromiter(values, dtype=object, count=count)
+
+
+def _each(field: ModelField, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    results = [field.validate(value, {}, loc=field.alias) for value in values]
+    accepted = np.fromiter((errors is None for _, errors in results), dtype=bool, count=len(results))
+    return accepted, _objects((value for value, _ in results), len(results))
+
+
+def _distinct(field: ModelField, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    if infer_dtype(values, skipna=False) not in DISTINCT_KINDS:
+        return _each(field, values)
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    accepted, converted = _each(field, uniques)
+    return accepted[codes], converted[codes]
+
+
+def _floats(field: ModelField, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    try:
+        converted = values.astype(np.float64)
+    except (TypeError, ValueError, OverflowError):
+        return _each(field, values)
+    return np.ones(len(values), dtype=bool), _objects(converted.tolist(), len(values))
+
+
+def _integers(field: ModelField, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    if infer_dtype(values, skipna=False) == "integer":
+        # Python ints are taken as they are, whatever their size
+        return np.ones(len(values), dtype=bool), values
+    try:
+        converted = values.astype(np.int64)
+    except (TypeError, ValueError, OverflowError):
+        return _each(field, values)
+    return np.ones(len(values), dtype=bool), _objects(converted.tolist(), len(values))
+
+
+def _strings(field: ModelField, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    if infer_dtype(values, skipna=False) == "string":
+        return np.ones(len(values), dtype=bool), values
+    return _each(field, values)
+
+
+COLUMN_CHECKS: Dict[type, ColumnCheck] = {
+    float: _floats,
+    int: _integers,
+    str: _strings,
+}
+
+
+def validate_records(records: Sequence[Mapping[str, Any]]) -> ValidatedRecords:
+    """
+    Validate a batch of records against MetricsInputSchema, column by column.
+
+    Args:
+        records (Sequence[Mapping[str, Any]]): Raw records, e.g. parsed CSV rows or request bodies.
+
+    Returns:
+        ValidatedRecords: The converted valid records and the errors of the invalid ones; the result
+        is the same as validating each record with ``MetricsInputSchema.parse_obj``.
+    """
+    count = len(records)
+    accepted = np.ones(count, dtype=bool)
+    columns: Dict[str, np.ndarray] = {}
+    for name, field in MetricsInputSchema.__fields__.items():
+        values = _objects((record.get(name) for record in records), count)
+        missing = np.equal(values, None)
+        converted = np.full(count, None, dtype=object)
+        if not missing.all():
+            check = COLUMN_CHECKS.get(field.type_, _distinct)
+            valid, converted[~missing] = check(field, values[~missing])
+            accepted[~missing] &= valid
+        if field.required:
+            accepted &= ~missing
+        columns[name] = converted
+
+    errors: List[Tuple[int, ValidationError]] = []
+    for index in np.flatnonzero(~accepted).tolist():
+        try:
+            metrics_data = MetricsInputSchema.parse_obj(records[index])
+        except ValidationError as e:
+            errors.append((index, e))
+            continue
+        for name, converted in columns.items():
+            converted[index] = getattr(metrics_data, name)
+        accepted[index] = True
+
+    indexes = np.flatnonzero(accepted)
+    return ValidatedRecords(indexes, {name: converted[indexes] for name, converted in columns.items()}, errors)
@@ -0,0 +1,372 @@
+"""
+Write-behind buffering of metrics submissions.
+
+At quarter close hundreds of submissions arrive at once, and committing each one on the
+request path saturates the database. In write-behind mode a validated submission is appended
+to a durable local SQLite buffer (WAL journal, synchronous commits) and acknowledged with a
+receipt, which is the id the row will have in ``metrics_input``. A background flusher moves
+buffered rows to PostgreSQL in multi-row batches, one transaction per batch. A batch is
+flushed as soon as ``batch_size`` rows are buffered, and the oldest row never waits longer
+than ``flush_interval_seconds``.
+
+Rows are removed from the buffer only after their batch has committed, so a crash between the
+two re-flushes the batch. The insert skips rows that already exist, so a re-flush does not
+duplicate them. When a batch fails for any reason other than the database being unreachable,
+its rows are retried one by one and a row that still fails on its own, e.g. because it violates
+a constraint, is set aside as rejected rather than blocking the rows behind it. Receipts report
+whether a submission is still pending, committed or rejected. Backlog size and flush lag are
+exposed on the internal metrics endpoint.
+
+Buffered submissions do not touch the database, so an Idempotency-Key is only checked against
+this replica's cache and buffer when the submission arrives; the key is not visible to other
+replicas until it is flushed. A retry that reaches another replica, or this one after a restart,
+is therefore acknowledged with a new receipt. Before writing, the flusher checks each batch's
+keys against ``idempotency_keys`` and rejects such copies, so a retried submission is still
+written at most once.
+
+Requirements addressed:
+- Data Input Methods (Technical Requirements/Feature 4: Data Input Methods):
+  Absorb quarter-close submission peaks without overloading the database.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from src.backend.metrics_input_service.app.events import ChangePublisher, ChangeSet, change_publisher
+from src.backend.metrics_input_service.app.idempotency import IDEMPOTENCY_KEY_HEADER, IdempotencyRecord
+from src.backend.metrics_input_service.app.models.models import IdempotencyKey, MetricsInput, MetricsInputSchema
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL caps the number of bind parameters in a single statement
+POSTGRES_MAX_PARAMETERS = 65535
+
+# Failures that say the database is unreachable rather than that a row is bad
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError, OSError, asyncio.TimeoutError)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    receipt TEXT NOT NULL UNIQUE,
+    body TEXT NOT NULL,
+    enqueued_at REAL NOT NULL,
+    idempotency_key TEXT,
+    idempotency_record TEXT
+);
+CREATE TABLE IF NOT EXISTS rejected (
+    receipt TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    error TEXT NOT NULL,
+    rejected_at REAL NOT NULL
+);
+"""
+
+
+class BufferedRow(NamedTuple):
+    """
+    A submission waiting in the buffer.
+    """
+    seq: int
+    receipt: str
+    body: str
+    enqueued_at: float
+    idempotency_key: Optional[str]
+    idempotency_record: Optional[str]
+
+
+class WriteBehindBuffer:
+    """
+    Durable local buffer in front of ``metrics_input`` with a batched background flusher.
+
+    Args:
+        path (str): SQLite file of the buffer; must be on a persistent volume.
+        session_factory (Callable[[], AsyncSession]): Creates database sessions, e.g. AsyncSessionLocal.
+        batch_size (int): Rows per flush transaction; a full batch is flushed immediately.
+        flush_interval_seconds (float): Longest a buffered row waits before a partial batch is flushed.
+        publisher (Optional[ChangePublisher]): Publishes the changes of each flushed batch; defaults to the service's publisher.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        session_factory: Callable[[], AsyncSession],
+        batch_size: int = 500,
+        flush_interval_seconds: float = 1.0,
+        publisher: Optional[ChangePublisher] = None,
+    ):
+        self.path = path
+        self.session_factory = session_factory
+        self.batch_size = min(batch_size, POSTGRES_MAX_PARAMETERS // len(MetricsInput.__table__.columns))
+        self.flush_interval_seconds = flush_interval_seconds
+        self.publisher = publisher or change_publisher
+        self.flushed = 0
+        self.rejected = 0
+        self.failed_flushes = 0
+        self.last_flush_lag_seconds = 0.0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flushing: Optional[asyncio.Lock] = None
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """
+        Open the buffer and start the flusher; rows left by a previous run are flushed first.
+        """
+        await run_in_threadpool(self._open)
+        self._wakeup = asyncio.Event()
+        self._flushing = asyncio.Lock()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Flush what is buffered and stop the flusher. Rows that cannot be flushed stay in the buffer.
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await run_in_threadpool(self._connection.close)
+
+    def _open(self) -> None:
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        # The receipt is only handed out once the row is on disk
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=FULL")
+        self._connection.executescript(SCHEMA)
+
+    def _execute(self, sql: str, parameters: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    async def submit(self, metrics_data: MetricsInputSchema, idempotency: Optional[Tuple[str, IdempotencyRecord]] = None) -> str:
+        """
+        Durably buffer a validated submission.
+
+        Args:
+            metrics_data (MetricsInputSchema): The validated metrics.
+            idempotency (Optional[Tuple[str, IdempotencyRecord]]): Key and response to record when the row is flushed.
+
+        Returns:
+            str: The receipt, equal to the id the row will have in metrics_input.
+        """
+        receipt = str(metrics_data.id or uuid4())
+        body = metrics_data.copy(update={"id": UUID(receipt)}).json()
+        key, record = idempotency if idempotency else (None, None)
+        await run_in_threadpool(
+            self._execute,
+            "INSERT INTO pending (receipt, body, enqueued_at, idempotency_key, idempotency_record) VALUES (?, ?, ?, ?, ?)",
+            (receipt, body, time.time(), key, json.dumps(record._asdict(), default=str) if record else None),
+        )
+        if await run_in_threadpool(self.backlog) >= self.batch_size:
+            self._wakeup.set()
+        return receipt
+
+    async def idempotency_record(self, key: str) -> Optional[IdempotencyRecord]:
+        """
+        The live record of a key submitted to this buffer and not yet flushed, if any.
+        """
+        def lookup() -> Optional[IdempotencyRecord]:
+            rows = self._execute("SELECT idempotency_record FROM pending WHERE idempotency_key = ? ORDER BY seq LIMIT 1", (key,))
+            if not rows:
+                return None
+            record = json.loads(rows[0][0])
+            expires_at = datetime.fromisoformat(record["expires_at"])
+            if expires_at <= datetime.utcnow():
+                return None
+            return IdempotencyRecord(record["request_hash"], record["status_code"], record["body"], expires_at)
+        return await run_in_threadpool(lookup)
+
+    def backlog(self) -> int:
+        """
+        Number of buffered rows not yet flushed.
+        """
+        return self._execute("SELECT count(*) FROM pending")[0][0]
+
+    async def status(self, receipt: str) -> Optional[Dict[str, Any]]:
+        """
+        Buffer-side status of a receipt: pending or rejected with its error, or None once it has left the buffer.
+        """
+        def lookup() -> Optional[Dict[str, Any]]:
+            if self._execute("SELECT 1 FROM pending WHERE receipt = ?", (receipt,)):
+                return {"receipt": receipt, "status": "pending"}
+            rejected = self._execute("SELECT error FROM rejected WHERE receipt = ?", (receipt,))
+            if rejected:
+                return {"receipt": receipt, "status": "rejected", "error": rejected[0][0]}
+            return None
+        return await run_in_threadpool(lookup)
+
+    async def stats(self) -> Dict[str, float]:
+        """
+        Backlog and flush lag metrics.
+        """
+        def collect() -> Dict[str, float]:
+            count, oldest = self._execute("SELECT count(*), min(enqueued_at) FROM pending")[0]
+            return {
+                "backlog": count,
+                "oldest_pending_seconds": round(time.time() - oldest, 3) if oldest else 0.0,
+                "last_flush_lag_seconds": round(self.last_flush_lag_seconds, 3),
+                "flushed": self.flushed,
+                "rejected": self.rejected,
+                "failed_flushes": self.failed_flushes,
+            }
+        return await run_in_threadpool(collect)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                while await self.flush_once():
+                    pass
+            except Exception as e:
+                self.failed_flushes += 1
+                logger.error(f"Write-behind flush failed, retrying: {str(e)}")
+                if self._stopping:
+                    return
+                await asyncio.sleep(self.flush_interval_seconds)
+            if self._stopping:
+                return
+
+    async def flush_once(self) -> int:
+        """
+        Write the oldest batch of buffered rows to metrics_input in one transaction.
+
+        Returns:
+            int: Number of rows that left the buffer.
+        """
+        # Batches are taken from the head of the buffer, so flushes must not overlap
+        async with self._flushing:
+            return await self._flush_batch()
+
+    async def _flush_batch(self) -> int:
+        rows = [BufferedRow(*row) for row in await run_in_threadpool(
+            self._execute,
+            "SELECT seq, receipt, body, enqueued_at, idempotency_key, idempotency_record FROM pending ORDER BY seq LIMIT ?",
+            (self.batch_size,),
+        )]
+        if not rows:
+            return 0
+
+        async with self.session_factory() as db:
+            unique, rejected = await self._deduplicate(db, rows)
+            try:
+                if unique:
+                    await self._write(db, unique)
+                accepted = unique
+            except Exception as error:
+                if _is_transient(error):
+                    raise
+                await db.rollback()
+                # Isolate the offending rows so they do not hold back the rest of the batch
+                unique, rejected = await self._deduplicate(db, rows)
+                accepted = []
+                for row in unique:
+                    try:
+                        async with db.begin_nested():
+                            await self._write(db, [row])
+                        accepted.append(row)
+                    except Exception as e:
+                        if _is_transient(e):
+                            raise
+                        rejected.append((row, str(e.orig) if isinstance(e, DBAPIError) else str(e)))
+            await self.publisher.publish(db, _changes(accepted))
+            await db.commit()
+
+        now = time.time()
+        await run_in_threadpool(self._complete, rows, rejected, now)
+        self.flushed += len(rows) - len(rejected)
+        self.rejected += len(rejected)
+        self.last_flush_lag_seconds = now - rows[0].enqueued_at
+        return len(rows)
+
+    async def _deduplicate(self, db: AsyncSession, rows: List[BufferedRow]) -> Tuple[List[BufferedRow], List[Tuple[BufferedRow, str]]]:
+        # Another submission recorded the key first, on another replica or before a restart;
+        # a re-flush of a row finds its own key, recorded with its own id
+        keys = {row.idempotency_key for row in rows if row.idempotency_key}
+        if not keys:
+            return rows, []
+        now = datetime.utcnow()
+        # An expired row would otherwise block reuse of its key
+        await db.execute(delete(IdempotencyKey).where(IdempotencyKey.key.in_(keys), IdempotencyKey.expires_at <= now))
+        recorded = await db.execute(select(IdempotencyKey.key, IdempotencyKey.response_body).where(IdempotencyKey.key.in_(keys)))
+        owners = {key: str(body.get("metrics_id")) for key, body in recorded}
+        unique, duplicates = [], []
+        for row in rows:
+            if row.idempotency_key:
+                owner = owners.setdefault(row.idempotency_key, row.receipt)
+                if owner != row.receipt:
+                    duplicates.append((row, f"{IDEMPOTENCY_KEY_HEADER} was already used by submission {owner}"))
+                    continue
+            unique.append(row)
+        return unique, duplicates
+
+    async def _write(self, db: AsyncSession, rows: List[BufferedRow]) -> None:
+        values = []
+        for row in rows:
+            metrics_data = MetricsInputSchema.parse_raw(row.body)
+            value = metrics_data.dict()
+            # created_date is the submission time, not the flush time
+            value["created_date"] = metrics_data.created_date or datetime.utcfromtimestamp(row.enqueued_at)
+            values.append(value)
+        # Rows already written by an interrupted earlier flush are skipped
+        await db.execute(pg_insert(MetricsInput).values(values).on_conflict_do_nothing(index_elements=[MetricsInput.id]))
+
+        keys = []
+        for row in rows:
+            if row.idempotency_key:
+                record = json.loads(row.idempotency_record)
+                keys.append({
+                    "key": row.idempotency_key,
+                    "request_hash": record["request_hash"],
+                    "status_code": record["status_code"],
+                    "response_body": record["body"],
+                    "expires_at": datetime.fromisoformat(record["expires_at"]),
+                })
+        if keys:
+            await db.execute(pg_insert(IdempotencyKey).values(keys).on_conflict_do_nothing(index_elements=[IdempotencyKey.key]))
+
+    def _complete(self, rows: List[BufferedRow], rejected: List[Tuple[BufferedRow, str]], now: float) -> None:
+        with self._lock:
+            with self._connection:
+                self._connection.execute("BEGIN")
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO rejected (receipt, body, error, rejected_at) VALUES (?, ?, ?, ?)",
+                    [(row.receipt, row.body, error, now) for row, error in rejected],
+                )
+                self._connection.execute("DELETE FROM pending WHERE seq <= ?", (rows[-1].seq,))
+
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return True
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+def _changes(rows: List[BufferedRow]) -> ChangeSet:
+    changes = ChangeSet()
+    for row in rows:
+        metrics_data = MetricsInputSchema.parse_raw(row.body)
+        changes.add(metrics_data.company_id, metrics_data.fiscal_reporting_date)
+    return changes
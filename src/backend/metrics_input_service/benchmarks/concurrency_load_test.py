@@ -0,0 +1,94 @@
+"""
+Concurrency load test for the Metrics Input Service.
+
+Fires the same GET /api/v1/metrics/ request at a running service with increasing numbers of
+concurrent clients and reports throughput and latency percentiles per level. With
+non-blocking database access, throughput should keep rising with concurrency until the
+database connection pool or the database itself saturates, rather than staying flat at the
+throughput of a single client.
+
+Usage:
+    python -m src.backend.metrics_input_service.benchmarks.concurrency_load_test \\
+        --base-url http://localhost:8000 --company-id <uuid> --requests 2000 --concurrency 1,8,32,128
+
+Requirements addressed:
+- API Services (Technical Requirements/Feature 2: API Development and Deployment):
+  Verify that the API scales with concurrent requests.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict, List
+
+import httpx  # version 0.18.2
+
+
+async def run_level(client: httpx.AsyncClient, path: str, params: Dict[str, str], requests: int, concurrency: int) -> Dict:
+    """
+    Send ``requests`` requests with ``concurrency`` clients in flight and summarize the results.
+    """
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def client_loop() -> None:
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                response = await client.get(path, params=params)
+                if response.status_code >= 500:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "requests_per_second": round(requests / elapsed, 1),
+        "latency_p50_ms": round(quantiles[49] * 1000, 2),
+        "latency_p95_ms": round(quantiles[94] * 1000, 2),
+        "latency_p99_ms": round(quantiles[98] * 1000, 2),
+    }
+
+
+async def run_load_test(base_url: str, company_id: str, requests: int, levels: List[int]) -> List[Dict]:
+    """
+    Run one load level per concurrency setting against the service at ``base_url``.
+    """
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        params = {"company_id": company_id}
+        # Warm up connections and the service's database pool
+        await run_level(client, "/api/v1/metrics/", params, min(requests, 50), min(levels))
+        return [await run_level(client, "/api/v1/metrics/", params, requests, level) for level in levels]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrency load test for the Metrics Input Service")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="Base URL of the running service")
+    parser.add_argument("--company-id", required=True, help="Company id with metrics to query")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per concurrency level")
+    parser.add_argument("--concurrency", default="1,8,32,128", help="Comma separated concurrency levels")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = asyncio.run(run_load_test(args.base_url, args.company_id, args.requests, levels))
+    baseline = results[0]["requests_per_second"]
+    for result in results:
+        result["speedup_vs_first_level"] = round(result["requests_per_second"] / baseline, 2) if baseline else None
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
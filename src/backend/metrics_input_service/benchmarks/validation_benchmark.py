@@ -0,0 +1,124 @@
+"""
+Validation throughput benchmark for bulk metrics ingestion.
+
+Generates upload-style rows (all values as strings, as read from a CSV file) and validates
+them in ingestion-sized chunks twice: once by parsing every row into MetricsInputSchema,
+and once with the column-wise ``validate_records``. Reports rows per second for each at every
+requested row count. A share of the rows can be made invalid to exercise the per-row fallback.
+
+Usage:
+    python -m src.backend.metrics_input_service.benchmarks.validation_benchmark \\
+        --rows 10000,1000000 --chunk-size 5000 --invalid-share 0.01
+
+Requirements addressed:
+- Data Input Methods (Technical Requirements/Feature 4: Data Input Methods):
+  Measure how fast uploaded rows can be validated.
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterator, List
+from uuid import uuid4
+
+from pydantic import ValidationError
+
+from src.backend.metrics_input_service.app.ingestion import COPY_COLUMNS
+from src.backend.metrics_input_service.app.models.models import MetricsInputSchema
+from src.backend.metrics_input_service.app.validation import validate_records
+
+FLOAT_FIELDS = [
+    "total_revenue", "recurring_revenue", "gross_profit", "sales_marketing_expense", "total_operating_expense",
+    "ebitda", "net_income", "cash_burn", "cash_balance", "debt_outstanding",
+]
+
+
+def generate_chunks(rows: int, chunk_size: int, invalid_share: float, seed: int = 0) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield chunks of synthetic rows shaped like parsed CSV rows.
+    """
+    generator = random.Random(seed)
+    companies = [str(uuid4()) for _ in range(100)]
+    produced = 0
+    while produced < rows:
+        chunk = []
+        for _ in range(min(chunk_size, rows - produced)):
+            reporting_date = date(2015, 3, 31) + timedelta(days=91 * generator.randrange(40))
+            row = {name: f"{generator.uniform(-1e6, 1e7):.2f}" for name in FLOAT_FIELDS}
+            row.update({
+                "company_id": generator.choice(companies),
+                "currency": "USD",
+                "employees": str(generator.randrange(1, 5000)),
+                "customers": str(generator.randrange(0, 100000)),
+                "fiscal_reporting_date": reporting_date.isoformat(),
+                "fiscal_reporting_quarter": str((reporting_date.month - 1) // 3 + 1),
+                "reporting_year": str(reporting_date.year),
+                "reporting_quarter": str((reporting_date.month - 1) // 3 + 1),
+                "created_by": "benchmark",
+            })
+            if generator.random() < invalid_share:
+                row["total_revenue"] = "n/a"
+            chunk.append(row)
+        produced += len(chunk)
+        yield chunk
+
+
+def per_row(chunk: List[Dict[str, Any]]) -> int:
+    """
+    Validate each row by parsing it into MetricsInputSchema.
+    """
+    valid = []
+    for row in chunk:
+        try:
+            metrics_data = MetricsInputSchema.parse_obj(row)
+        except ValidationError:
+            continue
+        values = metrics_data.dict(include=set(COPY_COLUMNS))
+        valid.append(tuple(values[column] for column in COPY_COLUMNS))
+    return len(valid)
+
+
+def columnar(chunk: List[Dict[str, Any]]) -> int:
+    """
+    Validate the rows column by column, falling back to the schema for failing rows.
+    """
+    return len(validate_records(chunk).tuples(COPY_COLUMNS))
+
+
+def measure(validator: Callable[[List[Dict[str, Any]]], int], rows: int, chunk_size: int, invalid_share: float) -> Dict:
+    """
+    Time ``validator`` over ``rows`` generated rows; generation is excluded from the timing.
+    """
+    elapsed = 0.0
+    valid = 0
+    for chunk in generate_chunks(rows, chunk_size, invalid_share):
+        started = time.perf_counter()
+        valid += validator(chunk)
+        elapsed += time.perf_counter() - started
+    return {"seconds": round(elapsed, 3), "rows_per_second": round(rows / elapsed, 1), "valid_rows": valid}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Validation throughput benchmark for metrics ingestion")
+    parser.add_argument("--rows", default="10000,1000000", help="Comma separated row counts")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows validated per chunk")
+    parser.add_argument("--invalid-share", type=float, default=0.01, help="Share of rows with an invalid value")
+    args = parser.parse_args()
+
+    results = []
+    for rows in (int(count) for count in args.rows.split(",")):
+        baseline = measure(per_row, rows, args.chunk_size, args.invalid_share)
+        candidate = measure(columnar, rows, args.chunk_size, args.invalid_share)
+        results.append({
+            "rows": rows,
+            "per_row": baseline,
+            "columnar": candidate,
+            "speedup": round(baseline["seconds"] / candidate["seconds"], 2) if candidate["seconds"] else None,
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
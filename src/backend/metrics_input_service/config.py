@@ -18,11 +18,49 @@ class Settings(BaseSettings):
         database_url (str): The URL for connecting to the PostgreSQL database.
         api_key (str): The API key for authenticating with external services.
         log_level (str): The logging level for the application.
+        max_batch_size (int): The maximum number of records accepted by a single batch request.
+        import_staging_dir (str): Directory background imports are staged in, shared by all replicas.
+        import_workers (int): The number of background imports processed concurrently.
+        import_recovery_interval_seconds (float): How often unfinished background imports are looked for and resumed.
+        db_pool_size (int): Connections kept open in the database pool.
+        db_max_overflow (int): Extra connections allowed beyond the pool size under load.
+        db_pool_timeout (float): Seconds to wait for a pooled connection before failing.
+        db_pool_recycle (int): Seconds after which connections are replaced, ahead of server-side timeouts.
+        db_pool_pre_ping (bool): Whether connections are checked for liveness on checkout.
+        metrics_page_limit (int): Default number of metrics entries per page.
+        metrics_page_limit_max (int): The largest page size a client may request.
+        metrics_stream_batch_size (int): Rows fetched from the database cursor per chunk of a metrics stream.
+        idempotency_ttl_seconds (int): How long a response is replayed for a repeated Idempotency-Key.
+        idempotency_cache_size (int): Idempotency keys kept in process memory in front of the database.
+        change_events_channel (str): PostgreSQL NOTIFY channel metrics changes are published on; empty to disable.
+        write_behind_enabled (bool): Whether submissions are buffered locally and written to the database in batches.
+        write_behind_path (str): SQLite file of the write-behind buffer, on a persistent volume.
+        write_behind_batch_size (int): Rows written per write-behind flush.
+        write_behind_flush_interval_seconds (float): Longest a buffered submission waits to be flushed.
     """
 
     database_url: str
     api_key: str
     log_level: str
+    max_batch_size: int = 1000
+    import_staging_dir: str = "/var/lib/metrics-input/imports"
+    import_workers: int = 2
+    import_recovery_interval_seconds: float = 60.0
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    metrics_page_limit: int = 100
+    metrics_page_limit_max: int = 1000
+    metrics_stream_batch_size: int = 1000
+    idempotency_ttl_seconds: int = 86400
+    idempotency_cache_size: int = 10000
+    change_events_channel: str = "metrics_input_changes"
+    write_behind_enabled: bool = False
+    write_behind_path: str = "/var/lib/metrics-input/write-behind.db"
+    write_behind_batch_size: int = 500
+    write_behind_flush_interval_seconds: float = 1.0
 
     class Config:
         env_file = ".env"
@@ -49,10 +87,6 @@ settings = load_settings()
 # Note: Ensure that the .env file is correctly set up with the necessary environment variables
 # such as DATABASE_URL, API_KEY, and LOG_LEVEL to avoid runtime errors.
 
-# Imports from related modules
-from src.backend.metrics_input_service.app.models.models import MetricsInput
-from src.backend.metrics_input_service.app.routers.metrics import router as metrics_router
-
 # Ensure that all imported modules and components are correctly utilized within the service
 # and that any unused imports are removed to maintain code cleanliness and efficiency.
 
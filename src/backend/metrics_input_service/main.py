@@ -1,15 +1,23 @@
 # src/backend/metrics_input_service/main.py
 
 import logging
+from datetime import timedelta
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 
 # Internal imports
+from src.backend.metrics_input_service.app.database import AsyncSessionLocal, dispose_engine, init_engine
+from src.backend.metrics_input_service.app.idempotency import REPLAYED_HEADER
+from src.backend.metrics_input_service.app.imports import ImportJobRunner
 from src.backend.metrics_input_service.app.models.models import MetricsInput
+from src.backend.metrics_input_service.app.pagination import NEXT_CURSOR_HEADER
+from src.backend.metrics_input_service.app.routers.imports import router as imports_router
+from src.backend.metrics_input_service.app.routers.internal import router as internal_router
 from src.backend.metrics_input_service.app.routers.metrics import router as metrics_router
+from src.backend.metrics_input_service.app.write_behind import WriteBehindBuffer
 from src.backend.metrics_input_service.config import Settings
+from src.backend.shared.etag import ETAG_HEADER
 
 # External library imports
 # FastAPI version 0.68.0
@@ -48,32 +56,50 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, REPLAYED_HEADER, ETAG_HEADER],
     )
 
-    # Create database engine and session
-    engine = create_engine(settings.database_url)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-    # Dependency to get database session
-    def get_db():
-        db = SessionLocal()
-        try:
-            yield db
-        finally:
-            db.close()
-
     # Include the router in the FastAPI application instance
     app.include_router(metrics_router, prefix="/api/v1/metrics", tags=["metrics"])
+    app.include_router(imports_router, prefix="/api/v1", tags=["imports"])
+    app.include_router(internal_router, include_in_schema=False)
+
+    # Background worker pool for large file imports
+    app.state.import_runner = ImportJobRunner(
+        AsyncSessionLocal,
+        settings.import_staging_dir,
+        settings.import_workers,
+        recovery_interval=timedelta(seconds=settings.import_recovery_interval_seconds),
+    )
+
+    # Optional local buffer that batches submissions during peaks
+    app.state.write_behind = None
+    if settings.write_behind_enabled:
+        app.state.write_behind = WriteBehindBuffer(
+            settings.write_behind_path,
+            AsyncSessionLocal,
+            settings.write_behind_batch_size,
+            settings.write_behind_flush_interval_seconds,
+        )
 
     @app.on_event("startup")
     async def startup_event():
         logger.info("Starting up Metrics Input Service")
         # Perform any necessary startup tasks, such as database connections or cache warming
+        init_engine(settings)
+        await app.state.import_runner.start()
+        if app.state.write_behind is not None:
+            await app.state.write_behind.start()
 
     @app.on_event("shutdown")
     async def shutdown_event():
         logger.info("Shutting down Metrics Input Service")
         # Perform any necessary cleanup tasks
+        await app.state.import_runner.stop()
+        if app.state.write_behind is not None:
+            # Flushes buffered submissions while the engine is still available
+            await app.state.write_behind.stop()
+        await dispose_engine()
 
     return app
 
@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import text
+
+from src.backend.metrics_input_service.app import database
+from src.backend.metrics_input_service.config import Settings
+
+def test_async_database_url():
+    """
+    Test that PostgreSQL URLs are routed to the asyncpg driver.
+
+    Requirements addressed:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Develop unit tests for all critical components of the FastAPI application using pytest.
+    """
+    assert database.async_database_url("postgresql://u:p@db/metrics") == "postgresql+asyncpg://u:p@db/metrics"
+    assert database.async_database_url("postgresql+psycopg2://u:p@db/metrics") == "postgresql+asyncpg://u:p@db/metrics"
+    assert database.async_database_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+def test_telemetry_snapshot():
+    telemetry = database.PoolTelemetry(window=100)
+    for wait in range(1, 101):
+        telemetry.record_checkout(wait / 1000)
+    telemetry.record_timeout()
+
+    snapshot = telemetry.snapshot()
+    assert snapshot["checkouts"] == 100
+    assert snapshot["timeouts"] == 1
+    assert snapshot["p50_wait_ms"] == 51.0
+    assert snapshot["max_wait_ms"] == 100.0
+
+@pytest.mark.asyncio
+async def test_shared_engine_lifecycle(tmp_path, monkeypatch):
+    settings = Settings(
+        database_url=f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        api_key="test",
+        log_level="info",
+        db_pool_size=2,
+        db_max_overflow=1,
+    )
+    telemetry = database.PoolTelemetry()
+    monkeypatch.setattr(database, "telemetry", telemetry)
+    database.init_engine(settings)
+    try:
+        sessions = database.get_db()
+        session = await sessions.__anext__()
+        assert (await session.execute(text("SELECT 1"))).scalar() == 1
+
+        status = database.pool_status()
+        assert status["checked_out"] == 1
+        assert status["saturation"] == round(1 / 3, 3)
+        assert telemetry.checkouts == 1
+        await sessions.aclose()
+        assert database.pool_status()["checked_out"] == 0
+    finally:
+        await database.dispose_engine()
+
+    with pytest.raises(RuntimeError):
+        database.get_engine()
@@ -0,0 +1,75 @@
+import pytest
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from fastapi import HTTPException, Response
+from sqlalchemy.dialects import postgresql
+
+from src.backend.shared.etag import ETAG_HEADER, etag_matches, make_etag
+from src.backend.metrics_input_service.app.routers.metrics import get_metrics
+
+def fake_db(count, last_modified, rows=()):
+    version = MagicMock()
+    version.one.return_value = (count, last_modified, 0 if last_modified is None else 1000)
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = list(rows)
+    return SimpleNamespace(execute=AsyncMock(side_effect=[version, result]))
+
+def test_etag_changes_with_range_version_and_request():
+    """
+    Test that the ETag reflects both the data in the key range and the shape of the response.
+
+    Requirements addressed:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Develop unit tests for all critical components of the FastAPI application using pytest.
+    """
+    modified = datetime(2023, 4, 1, 12, 0)
+    etag = make_etag((4, modified, 1000), "company", 100)
+    assert etag.startswith('W/"')
+    assert make_etag((4, modified, 1000), "company", 100) == etag
+    assert make_etag((5, modified, 1000), "company", 100) != etag
+    assert make_etag((4, datetime(2023, 4, 2), 1000), "company", 100) != etag
+    assert make_etag((4, modified, 1000), "company", 50) != etag
+    # A correction committed with a timestamp older than the latest one only moves the checksum
+    assert make_etag((4, modified, 1001), "company", 100) != etag
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ('W/"abc"', True),
+    ('"abc"', True),
+    ('"other", W/"abc"', True),
+    ('"other"', False),
+    ("*", True),
+])
+def test_if_none_match_uses_weak_comparison(header, matches):
+    assert etag_matches(header, 'W/"abc"') is matches
+
+@pytest.mark.asyncio
+async def test_matching_etag_returns_304_without_reading_rows():
+    company_id = uuid4()
+    rows = [SimpleNamespace(fiscal_reporting_date=date(2023, 1, 1), id=uuid4())]
+    response = Response()
+    await get_metrics(response, company_id, limit=2, cursor=None, fields=None, if_none_match=None, db=fake_db(3, datetime(2023, 4, 1), rows))
+    etag = response.headers[ETAG_HEADER]
+
+    db = fake_db(3, datetime(2023, 4, 1))
+    result = await get_metrics(Response(), company_id, limit=2, cursor=None, fields=None, if_none_match=etag, db=db)
+
+    assert result.status_code == 304
+    assert result.headers[ETAG_HEADER] == etag
+    assert db.execute.await_count == 1
+    sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("SELECT count(*) AS count_1, max(coalesce(metrics_input.last_update_date, metrics_input.created_date))")
+    assert "sum(CAST(EXTRACT(epoch FROM coalesce(metrics_input.last_update_date, metrics_input.created_date))" in sql
+    assert "ORDER BY" not in sql
+
+@pytest.mark.asyncio
+async def test_empty_range_is_404_without_reading_rows():
+    db = fake_db(0, None)
+    with pytest.raises(HTTPException) as exc:
+        await get_metrics(Response(), uuid4(), limit=None, cursor=None, fields=None, if_none_match=None, db=db)
+    assert exc.value.status_code == 404
+    assert db.execute.await_count == 1
@@ -0,0 +1,67 @@
+import json
+import pytest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from src.backend.metrics_input_service.app.events import ChangePublisher, ChangeSet, NotifyPublisher, create_change_publisher, encode_payloads
+from src.backend.metrics_input_service.app.ingestion import UploadStats, validate_chunk
+from src.backend.metrics_input_service.config import Settings
+
+def test_change_set_keeps_earliest_period_per_company():
+    """
+    Test that changes collapse to one entry per company with its earliest changed period.
+
+    Requirements addressed:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Develop unit tests for all critical components of the FastAPI application using pytest.
+    """
+    company_id = uuid4()
+    changes = ChangeSet()
+    changes.add_all([(company_id, date(2023, 6, 30)), (company_id, date(2022, 12, 31)), (company_id, date(2023, 3, 31))])
+    assert changes.since == {company_id: date(2022, 12, 31)}
+
+def test_payloads_stay_under_notify_limit():
+    changes = ChangeSet()
+    changes.add_all((uuid4(), date(2023, 3, 31)) for _ in range(500))
+
+    payloads = encode_payloads(changes, max_bytes=2000)
+
+    assert len(payloads) > 1
+    assert all(len(payload) <= 2000 for payload in payloads)
+    pairs = [pair for payload in payloads for pair in json.loads(payload)]
+    assert len(pairs) == 500
+    assert pairs[0][1] == "2023-03-31"
+
+def test_upload_rows_are_collected_as_changes():
+    company_id = uuid4()
+    row = dict(
+        company_id=str(company_id), currency="CAD", total_revenue="100", recurring_revenue="80", gross_profit="60",
+        sales_marketing_expense="20", total_operating_expense="50", ebitda="10", net_income="5", cash_burn="15",
+        cash_balance="500", employees="25", fiscal_reporting_quarter="1", reporting_year="2023",
+        reporting_quarter="1", created_by="analyst",
+    )
+    stats = UploadStats()
+    validate_chunk([dict(row, fiscal_reporting_date="2023-06-30"), dict(row, fiscal_reporting_date="2023-03-31")], 0, stats)
+    assert stats.changes.since == {company_id: date(2023, 3, 31)}
+
+@pytest.mark.asyncio
+async def test_notify_publisher_notifies_in_transaction():
+    db = SimpleNamespace(execute=AsyncMock())
+    changes = ChangeSet()
+    changes.add(uuid4(), date(2023, 3, 31))
+
+    await NotifyPublisher("metrics_input_changes").publish(db, changes)
+    await NotifyPublisher("metrics_input_changes").publish(db, ChangeSet())
+
+    assert db.execute.await_count == 1
+    sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "pg_notify" in sql
+
+def test_empty_channel_disables_events():
+    settings = Settings(database_url="postgresql://u:p@db/metrics", api_key="test", log_level="info", change_events_channel="")
+    assert type(create_change_publisher(settings)) is ChangePublisher
@@ -0,0 +1,107 @@
+import json
+import pytest
+import pytest_asyncio
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fastapi import HTTPException, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.backend.metrics_input_service.app.database import LazySession
+from src.backend.metrics_input_service.app.events import ChangePublisher
+from src.backend.metrics_input_service.app.idempotency import IdempotencyCache, IdempotencyRecord, IdempotencyStore, REPLAYED_HEADER
+from src.backend.metrics_input_service.app.models.models import IdempotencyKey, MetricsInput, MetricsInputSchema, companies
+from src.backend.metrics_input_service.app.routers import metrics as metrics_router
+
+# An application without a write-behind buffer
+REQUEST = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(write_behind=None)))
+
+def metrics_payload(company_id, revenue=100.0):
+    return MetricsInputSchema(
+        id=uuid4(), company_id=company_id, currency="CAD",
+        total_revenue=revenue, recurring_revenue=80, gross_profit=60, sales_marketing_expense=20,
+        total_operating_expense=50, ebitda=10, net_income=5, cash_burn=15, cash_balance=500,
+        employees=25, fiscal_reporting_date=date(2023, 3, 31), fiscal_reporting_quarter=1,
+        reporting_year=2023, reporting_quarter=1, created_by="analyst",
+    )
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics_router, "idempotency_store", IdempotencyStore(ttl_seconds=60, max_entries=10))
+    # pg_notify is not available on SQLite
+    monkeypatch.setattr(metrics_router, "change_publisher", ChangePublisher())
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'idempotency.db'}")
+    async with engine.begin() as connection:
+        for table in (companies, MetricsInput.__table__, IdempotencyKey.__table__):
+            await connection.run_sync(table.create)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+async def count_metrics(session_factory):
+    async with session_factory() as db:
+        return (await db.execute(select(func.count()).select_from(MetricsInput))).scalar()
+
+@pytest.mark.asyncio
+async def test_retry_replays_original_response(session_factory):
+    """
+    Test that a retried submission with the same key is answered without inserting again.
+
+    Requirements addressed:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Develop unit tests for all critical components of the FastAPI application using pytest.
+    """
+    payload = metrics_payload(uuid4())
+    async with LazySession(session_factory) as sessions:
+        created = await metrics_router.create_metrics(payload, request=REQUEST, response=Response(), idempotency_key="retry-1", sessions=sessions)
+    async with LazySession(session_factory) as sessions:
+        replayed = await metrics_router.create_metrics(payload, request=REQUEST, response=Response(), idempotency_key="retry-1", sessions=sessions)
+
+    assert isinstance(replayed, JSONResponse)
+    assert replayed.headers[REPLAYED_HEADER] == "true"
+    assert json.loads(replayed.body) == created
+    assert await count_metrics(session_factory) == 1
+
+@pytest.mark.asyncio
+async def test_key_is_found_in_database_after_cache_loss(session_factory, monkeypatch):
+    payload = metrics_payload(uuid4())
+    async with LazySession(session_factory) as sessions:
+        created = await metrics_router.create_metrics(payload, request=REQUEST, response=Response(), idempotency_key="retry-2", sessions=sessions)
+
+    # Another replica, or this one after a restart, has an empty cache
+    monkeypatch.setattr(metrics_router, "idempotency_store", IdempotencyStore(ttl_seconds=60))
+    async with LazySession(session_factory) as sessions:
+        replayed = await metrics_router.create_metrics(payload, request=REQUEST, response=Response(), idempotency_key="retry-2", sessions=sessions)
+
+    assert json.loads(replayed.body) == created
+    assert await count_metrics(session_factory) == 1
+
+@pytest.mark.asyncio
+async def test_key_reused_with_different_payload_is_rejected(session_factory):
+    company_id = uuid4()
+    async with LazySession(session_factory) as sessions:
+        await metrics_router.create_metrics(metrics_payload(company_id), request=REQUEST, response=Response(), idempotency_key="retry-3", sessions=sessions)
+
+    with pytest.raises(HTTPException) as exc:
+        async with LazySession(session_factory) as sessions:
+            await metrics_router.create_metrics(metrics_payload(company_id, revenue=250.0), request=REQUEST, response=Response(), idempotency_key="retry-3", sessions=sessions)
+    assert exc.value.status_code == 422
+    assert await count_metrics(session_factory) == 1
+
+def test_cache_is_bounded_and_expires():
+    now = datetime.utcnow()
+    cache = IdempotencyCache(max_entries=2)
+    live = IdempotencyRecord("h", 200, {}, now + timedelta(minutes=1))
+    cache.put("a", live)
+    cache.put("b", live)
+    assert cache.get("a", now) == live
+    cache.put("c", live)
+
+    # "b" was the least recently used entry
+    assert len(cache) == 2
+    assert cache.get("b", now) is None
+    assert cache.get("a", now + timedelta(minutes=2)) is None
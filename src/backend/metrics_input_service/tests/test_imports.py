@@ -0,0 +1,113 @@
+import asyncio
+import io
+import os
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.backend.metrics_input_service.app.imports import ImportJobRunner, job_to_schema
+from src.backend.metrics_input_service.app.ingestion import UploadStats
+from src.backend.metrics_input_service.app.models.models import ImportJob
+
+pytestmark = pytest.mark.asyncio
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    # aiosqlite stands in for asyncpg; the import pipeline itself is patched out
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'imports.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(ImportJob.__table__.create)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+@pytest.fixture
+def runner(session_factory, tmp_path, mocker):
+    mocker.patch("src.backend.metrics_input_service.app.imports.get_driver_connection", return_value=None)
+    runner = ImportJobRunner(session_factory, str(tmp_path / "staging"), chunk_size=2)
+    os.makedirs(runner.staging_dir)
+    return runner
+
+async def fake_ingest(connection, file, filename, chunk_size, progress=None):
+    stats = UploadStats()
+    for _ in range(3):
+        stats.rows_received += chunk_size
+        stats.rows_inserted += chunk_size
+        await progress(stats)
+    return stats
+
+async def test_submitted_job_runs_to_completion(runner, session_factory, mocker):
+    """
+    Test that an import is staged, recorded as pending and completed by the runner.
+
+    Requirements addressed:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Develop unit tests for all critical components of the FastAPI application using pytest.
+    """
+    ingest = mocker.patch("src.backend.metrics_input_service.app.imports.ingest_upload", side_effect=fake_ingest)
+    async with session_factory() as db:
+        job = await runner.submit(db, io.BytesIO(b"company_id\n"), "history.csv")
+    assert job.status == "pending"
+    assert os.path.exists(job.staged_path)
+
+    await runner.run_job(job.id)
+
+    async with session_factory() as db:
+        job = await db.get(ImportJob, job.id)
+    assert ingest.call_args.args[2] == "history.csv"
+    assert job.status == "completed"
+    assert job.rows_processed == 6
+    assert job.rows_inserted == 6
+    assert not os.path.exists(job.staged_path)
+    assert job_to_schema(job).rows_per_second is not None
+
+async def test_failed_job_is_marked_failed(runner, session_factory, mocker):
+    mocker.patch("src.backend.metrics_input_service.app.imports.ingest_upload", side_effect=RuntimeError("bad file"))
+    async with session_factory() as db:
+        job = await runner.submit(db, io.BytesIO(b""), "history.xlsx")
+
+    await runner.run_job(job.id)
+
+    async with session_factory() as db:
+        job = await db.get(ImportJob, job.id)
+    assert job.status == "failed"
+    assert job.error_message == "bad file"
+    # Failed jobs are not retried, so their staged upload is removed
+    assert not os.path.exists(job.staged_path)
+
+async def test_unfinished_jobs_are_recovered(runner, session_factory):
+    now = datetime.utcnow()
+    pending = ImportJob(filename="a.csv", staged_path="a.csv", status="pending")
+    abandoned = ImportJob(filename="b.csv", staged_path="b.csv", status="running", heartbeat_at=now - timedelta(hours=1))
+    active = ImportJob(filename="c.csv", staged_path="c.csv", status="running", heartbeat_at=now)
+    done = ImportJob(filename="d.csv", staged_path="d.csv", status="completed")
+    async with session_factory() as db:
+        db.add_all([pending, abandoned, active, done])
+        await db.commit()
+
+    assert set(await runner.recoverable_jobs()) == {pending.id, abandoned.id}
+    # Only one worker can claim a job
+    assert await runner.claim(pending.id)
+    assert not await runner.claim(pending.id)
+    assert not await runner.claim(active.id)
+
+async def test_unfinished_jobs_are_recovered_periodically(session_factory, tmp_path, mocker):
+    runner = ImportJobRunner(session_factory, str(tmp_path / "staging"), workers=0, recovery_interval=timedelta(0))
+    await runner.start()
+    async with session_factory() as db:
+        job = ImportJob(filename="a.csv", staged_path="a.csv", status="pending")
+        db.add(job)
+        await db.commit()
+
+    for _ in range(100):
+        if job.id in runner._scheduled:
+            break
+        await asyncio.sleep(0.01)
+    await runner.stop()
+
+    assert runner._scheduled == {job.id}
+    # A job already queued is not queued again
+    assert await runner.recover() == 0
+    assert runner._queue.qsize() == 1
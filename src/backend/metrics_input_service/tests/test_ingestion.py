@@ -0,0 +1,153 @@
+import csv
+import io
+import pytest
+from datetime import date
+from decimal import Decimal
+from uuid import UUID, uuid4
+from openpyxl import Workbook
+
+from src.backend.metrics_input_service.app.ingestion import (
+    COPY_COLUMNS,
+    UnsupportedUploadError,
+    UploadParseError,
+    ingest_upload,
+    iter_upload_rows,
+)
+
+pytestmark = pytest.mark.asyncio
+
+HEADER = [
+    "company_id", "currency", "total_revenue", "recurring_revenue", "gross_profit", "sales_marketing_expense",
+    "total_operating_expense", "ebitda", "net_income", "cash_burn", "cash_balance", "debt_outstanding",
+    "employees", "fiscal_reporting_date", "fiscal_reporting_quarter", "reporting_year", "reporting_quarter",
+    "created_by",
+]
+
+def make_row(employees="50"):
+    return [
+        str(uuid4()), "USD", "1000000", "800000", "600000", "200000",
+        "700000", "300000", "250000", "50000", "2000000", "",
+        employees, str(date(2023, 3, 31)), "1", "2023", "1",
+        "finance_upload",
+    ]
+
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+class FakeConnection:
+    """
+    Stands in for an asyncpg connection and collects the records streamed into COPY.
+
+    The merge reports the staged rows whose company period is in ``stored`` or repeats an earlier row.
+    """
+    def __init__(self, stored=()):
+        self.stored = set(stored)
+        self.statements = []
+        self.table = None
+        self.columns = None
+        self.records = []
+
+    def transaction(self):
+        return FakeTransaction()
+
+    async def execute(self, query):
+        self.statements.append(query)
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.table = table
+        self.columns = columns
+        self.records = [record async for record in records]
+
+    async def fetch(self, query, limit):
+        self.statements.append(query)
+        seen = set(self.stored)
+        conflicts = []
+        for record in self.records:
+            row = dict(zip(self.columns, record))
+            period = (row["company_id"], row["fiscal_reporting_date"])
+            if period in seen:
+                conflicts.append(row["upload_row"])
+            seen.add(period)
+        return [{"upload_row": index, "conflicts": len(conflicts)} for index in conflicts[:limit]]
+
+def csv_upload(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(HEADER)
+    writer.writerows(rows)
+    return io.BytesIO(buffer.getvalue().encode("utf-8"))
+
+async def test_csv_upload_copies_valid_rows():
+    """
+    Test that a CSV upload streams valid rows into COPY and reports invalid ones.
+
+    Requirements addressed:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Develop unit tests for all critical components of the FastAPI application using pytest.
+    """
+    rows = [make_row() for _ in range(2500)] + [make_row(employees="fifty")]
+    connection = FakeConnection()
+
+    stats = await ingest_upload(connection, csv_upload(rows), "q1_metrics.csv", chunk_size=1000)
+
+    assert stats.rows_received == 2501
+    assert stats.rows_inserted == 2500
+    assert stats.rows_rejected == 1
+    assert stats.errors[0].index == 2500
+    assert connection.table == "metrics_input_upload"
+    assert connection.columns == COPY_COLUMNS + ["upload_row"]
+    assert len(connection.records) == 2500
+    assert all(len(record) == len(COPY_COLUMNS) + 1 for record in connection.records)
+    assert "INSERT INTO metrics_input" in connection.statements[-1]
+    assert "ON CONFLICT DO NOTHING" in connection.statements[-1]
+    first = dict(zip(COPY_COLUMNS, connection.records[0]))
+    assert first["total_revenue"] == Decimal("1000000.0")
+    assert first["fiscal_reporting_date"] == date(2023, 3, 31)
+    # Empty cells are copied as NULL rather than rejected
+    assert first["debt_outstanding"] is None
+
+async def test_xlsx_upload_is_parsed():
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER)
+    sheet.append(make_row())
+    sheet.append([None] * len(HEADER))
+    sheet.append(make_row())
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+
+    rows = list(iter_upload_rows(buffer, "Q1 Metrics.XLSX"))
+
+    assert len(rows) == 2
+    assert rows[0]["currency"] == "USD"
+    assert rows[0]["debt_outstanding"] is None
+
+async def test_upload_reports_existing_and_repeated_periods_as_conflicts():
+    """
+    Test that rows for a stored company period, or repeating an earlier row, are reported instead of failing the upload.
+    """
+    stored, repeated, new = make_row(), make_row(), make_row()
+    connection = FakeConnection(stored={(UUID(stored[0]), date(2023, 3, 31))})
+
+    stats = await ingest_upload(connection, csv_upload([stored, repeated, make_row(employees="fifty"), new, repeated]), "q1.csv")
+
+    assert (stats.rows_inserted, stats.rows_rejected, stats.rows_conflicting) == (2, 1, 2)
+    assert [(error.index, error.status) for error in stats.errors] == [(0, "conflict"), (2, "invalid"), (4, "conflict")]
+    assert stats.to_response().rows_conflicting == 2
+
+async def test_unsupported_file_type():
+    with pytest.raises(UnsupportedUploadError):
+        iter_upload_rows(io.BytesIO(b""), "metrics.pdf")
+
+async def test_undecodable_file_is_a_parse_error():
+    rows = iter_upload_rows(io.BytesIO(",".join(HEADER).encode() + b"\n\xff\xfe\xfa,USD\n"), "metrics.csv")
+
+    with pytest.raises(UploadParseError) as error:
+        list(rows)
+    assert not isinstance(error.value, UnsupportedUploadError)
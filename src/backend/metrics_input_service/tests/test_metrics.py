@@ -1,14 +1,20 @@
 import pytest
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from datetime import date, datetime
-from uuid import uuid4
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid4
 from decimal import Decimal
 
+from sqlalchemy.dialects import postgresql
+
 # Import the create_app function from the main module
 from src.backend.metrics_input_service.main import create_app
 
 # Import the MetricsInput model
 from src.backend.metrics_input_service.app.models.models import MetricsInput
+from src.backend.metrics_input_service.app.routers.metrics import create_metrics_batch
 
 # pytest.mark.asyncio decorator for asynchronous tests
 pytestmark = pytest.mark.asyncio
@@ -108,5 +114,97 @@ async def test_get_metrics(client):
         assert "total_revenue" in first_item
         # Add more assertions for other fields as needed
 
+# Test function for batch ingestion
+def batch_record(**overrides):
+    return {
+        "company_id": str(uuid4()),
+        "currency": "USD",
+        "total_revenue": 1000000.00,
+        "recurring_revenue": 800000.00,
+        "gross_profit": 600000.00,
+        "sales_marketing_expense": 200000.00,
+        "total_operating_expense": 700000.00,
+        "ebitda": 300000.00,
+        "net_income": 250000.00,
+        "cash_burn": 50000.00,
+        "cash_balance": 2000000.00,
+        "employees": 50,
+        "fiscal_reporting_date": str(date(2023, 3, 31)),
+        "fiscal_reporting_quarter": 1,
+        "reporting_year": 2023,
+        "reporting_quarter": 1,
+        "created_by": "test_user",
+        **overrides,
+    }
+
+def batch_db(stored_ids=()):
+    """
+    Session whose INSERT ... ON CONFLICT DO NOTHING returns the ids of the rows that are not in ``stored_ids``.
+    """
+    async def execute(statement):
+        rows = statement.compile().params
+        ids = [value for name, value in rows.items() if name.startswith("id_m") or name == "id"]
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [row_id for row_id in ids if row_id not in stored_ids]
+        return result
+    return SimpleNamespace(execute=AsyncMock(side_effect=execute), commit=AsyncMock(), rollback=AsyncMock())
+
+async def test_create_metrics_batch(mocker):
+    """
+    Test bulk submission of financial metrics via the POST /metrics/batch endpoint.
+    Valid records are inserted together and invalid ones are reported per row.
+
+    Requirements addressed:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Develop unit tests for all critical components of the FastAPI application using pytest.
+    """
+    publisher = mocker.patch("src.backend.metrics_input_service.app.routers.metrics.change_publisher")
+    publisher.publish = AsyncMock()
+    records = [batch_record(), batch_record(employees="fifty"), batch_record(fiscal_reporting_date=str(date(2023, 6, 30)))]
+    db = batch_db()
+
+    body = await create_metrics_batch(records, db=db)
+
+    assert (body.created, body.rejected, body.conflicts) == (2, 1, 0)
+    assert [result.status for result in body.results] == ["created", "invalid", "created"]
+    assert body.results[0].metrics_id is not None
+    assert body.results[1].errors[0]["loc"] == ("employees",)
+    sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT DO NOTHING RETURNING metrics_input.id" in sql
+    db.commit.assert_awaited_once()
+    assert len(publisher.publish.await_args.args[1].since) == 2
+
+async def test_create_metrics_batch_reports_conflicts_per_row(mocker):
+    """
+    Test that records for a stored or repeated company period are reported as conflicts instead of failing the batch.
+    """
+    publisher = mocker.patch("src.backend.metrics_input_service.app.routers.metrics.change_publisher")
+    publisher.publish = AsyncMock()
+    stored_id = uuid4()
+    repeated = batch_record()
+    records = [batch_record(id=str(stored_id)), repeated, {**repeated, "total_revenue": 1.0}]
+
+    body = await create_metrics_batch(records, db=batch_db(stored_ids={stored_id}))
+
+    assert (body.created, body.rejected, body.conflicts) == (1, 0, 2)
+    assert [result.status for result in body.results] == ["conflict", "created", "conflict"]
+    assert body.results[0].metrics_id is None
+    assert body.results[0].errors[0]["loc"] == ["company_id", "fiscal_reporting_date"]
+    assert list(publisher.publish.await_args.args[1].since) == [UUID(repeated["company_id"])]
+
+async def test_create_metrics_batch_rejects_oversized_batch():
+    """
+    Test that batches above the configured maximum size are rejected without inserting anything.
+    """
+    from src.backend.metrics_input_service.config import settings
+
+    db = batch_db(stored_ids=set())
+    with pytest.raises(HTTPException) as exc:
+        await create_metrics_batch([{}] * (settings.max_batch_size + 1), db=db)
+
+    assert exc.value.status_code == 413
+    db.execute.assert_not_awaited()
+
 # Additional test cases can be added here to cover more scenarios,
 # such as testing with invalid data, edge cases, or specific error conditions.
\ No newline at end of file
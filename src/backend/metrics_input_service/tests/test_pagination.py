@@ -0,0 +1,74 @@
+import pytest
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from fastapi import HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.backend.metrics_input_service.app.models.models import MetricsInput
+from src.backend.metrics_input_service.app.pagination import NEXT_CURSOR_HEADER, MetricsCursor, decode_cursor, encode_cursor
+from src.backend.metrics_input_service.app.routers.metrics import get_metrics, metrics_query
+
+def test_cursor_round_trip():
+    """
+    Test that a page position survives encoding as an opaque cursor.
+
+    Requirements addressed:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Develop unit tests for all critical components of the FastAPI application using pytest.
+    """
+    cursor = MetricsCursor(date(2023, 3, 31), uuid4())
+    token = encode_cursor(cursor)
+    assert "=" not in token
+    assert decode_cursor(token) == cursor
+
+@pytest.mark.parametrize("token", ["not-a-cursor", encode_cursor(MetricsCursor(date(2023, 3, 31), uuid4()))[:-4], "W10"])
+def test_invalid_cursor_is_rejected(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+def test_keyset_query_resumes_after_cursor():
+    after = MetricsCursor(date(2023, 3, 31), uuid4())
+    query = metrics_query(select(MetricsInput), uuid4(), None, None, after)
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "(metrics_input.fiscal_reporting_date, metrics_input.id) >" in sql
+    assert sql.endswith("ORDER BY metrics_input.company_id, metrics_input.fiscal_reporting_date, metrics_input.id")
+
+def fake_db(rows, count=None):
+    # The range version is queried first, then the page itself
+    version = MagicMock()
+    version.one.return_value = (len(rows) if count is None else count, datetime(2023, 4, 1))
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    return SimpleNamespace(execute=AsyncMock(side_effect=[version, result]))
+
+@pytest.mark.asyncio
+async def test_get_metrics_returns_next_cursor_when_more_rows_remain():
+    rows = [SimpleNamespace(fiscal_reporting_date=date(2023, month, 1), id=uuid4()) for month in (1, 2, 3)]
+    response = Response()
+
+    page = await get_metrics(response, uuid4(), limit=2, cursor=None, fields=None, if_none_match=None, db=fake_db(rows))
+
+    assert page == rows[:2]
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == MetricsCursor(date(2023, 2, 1), rows[1].id)
+
+@pytest.mark.asyncio
+async def test_get_metrics_last_page_has_no_cursor():
+    rows = [SimpleNamespace(fiscal_reporting_date=date(2023, 1, 1), id=uuid4())]
+    response = Response()
+    cursor = encode_cursor(MetricsCursor(date(2022, 12, 1), uuid4()))
+
+    assert await get_metrics(response, uuid4(), limit=2, cursor=cursor, fields=None, if_none_match=None, db=fake_db(rows)) == rows
+    assert NEXT_CURSOR_HEADER not in response.headers
+    # An exhausted cursor is an empty page, not a missing resource
+    assert await get_metrics(Response(), uuid4(), limit=2, cursor=cursor, fields=None, if_none_match=None, db=fake_db([], count=3)) == []
+
+@pytest.mark.asyncio
+async def test_get_metrics_rejects_malformed_cursor():
+    with pytest.raises(HTTPException) as exc:
+        await get_metrics(Response(), uuid4(), limit=None, cursor="garbage", fields=None, if_none_match=None, db=fake_db([]))
+    assert exc.value.status_code == 400
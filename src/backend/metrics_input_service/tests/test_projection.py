@@ -0,0 +1,69 @@
+import json
+import pytest
+from datetime import date, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from fastapi import HTTPException, Response
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.backend.metrics_input_service.app.pagination import NEXT_CURSOR_HEADER
+from src.backend.metrics_input_service.app.projection import parse_fields, projection_columns, projection_model
+from src.backend.metrics_input_service.app.routers.metrics import get_metrics
+
+def test_parse_fields_orders_and_deduplicates():
+    """
+    Test that requested fields are validated and returned in schema order.
+
+    Requirements addressed:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Develop unit tests for all critical components of the FastAPI application using pytest.
+    """
+    assert parse_fields(None) is None
+    assert parse_fields("total_revenue, company_id,total_revenue") == ("company_id", "total_revenue")
+    with pytest.raises(ValueError, match="password"):
+        parse_fields("total_revenue,password")
+    with pytest.raises(ValueError):
+        parse_fields(" , ")
+
+def test_projection_selects_only_requested_columns():
+    columns = projection_columns(("total_revenue",), required=("fiscal_reporting_date", "id"))
+    sql = str(select(*columns).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("SELECT metrics_input.total_revenue, metrics_input.fiscal_reporting_date, metrics_input.id \nFROM")
+
+def test_projection_model_is_narrow_and_cached():
+    model = projection_model(("company_id", "total_revenue"))
+    assert projection_model(("company_id", "total_revenue")) is model
+    assert list(model.__fields__) == ["company_id", "total_revenue"]
+    with pytest.raises(ValidationError):
+        model.parse_obj({"company_id": uuid4()})
+
+@pytest.mark.asyncio
+async def test_get_metrics_returns_projected_page():
+    rows = [
+        SimpleNamespace(_mapping={"total_revenue": 100 + month, "fiscal_reporting_date": date(2023, month, 1), "id": uuid4()},
+                        fiscal_reporting_date=date(2023, month, 1), id=uuid4())
+        for month in (1, 2, 3)
+    ]
+    result = MagicMock()
+    result.all.return_value = rows
+    version = MagicMock()
+    version.one.return_value = (3, datetime(2023, 4, 1))
+    db = SimpleNamespace(execute=AsyncMock(side_effect=[version, result]))
+
+    response = await get_metrics(Response(), uuid4(), limit=2, cursor=None, fields="total_revenue", if_none_match=None, db=db)
+
+    assert json.loads(response.body) == [{"total_revenue": 101.0}, {"total_revenue": 102.0}]
+    assert NEXT_CURSOR_HEADER in response.headers
+    sql = str(db.execute.call_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("SELECT metrics_input.total_revenue, metrics_input.fiscal_reporting_date, metrics_input.id \nFROM")
+
+@pytest.mark.asyncio
+async def test_get_metrics_rejects_unknown_field():
+    with pytest.raises(HTTPException) as exc:
+        await get_metrics(Response(), uuid4(), limit=None, cursor=None, fields="nope", if_none_match=None, db=None)
+    assert exc.value.status_code == 400
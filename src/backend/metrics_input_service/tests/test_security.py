@@ -0,0 +1,26 @@
+import pytest
+from fastapi import HTTPException
+
+from src.backend.metrics_input_service.app.routers import internal
+from src.backend.metrics_input_service.app.security import verify_api_key
+from src.backend.metrics_input_service.config import settings
+
+@pytest.mark.asyncio
+async def test_verify_api_key(monkeypatch):
+    """
+    Test that only requests carrying the service's API key are accepted.
+
+    Requirements addressed:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Develop unit tests for all critical components of the FastAPI application using pytest.
+    """
+    monkeypatch.setattr(settings, "api_key", "secret")
+    assert await verify_api_key("secret") is None
+    for api_key in (None, "", "wrong"):
+        with pytest.raises(HTTPException) as exc:
+            await verify_api_key(api_key)
+        assert exc.value.status_code == 401
+
+def test_internal_routes_require_api_key():
+    assert [dependency.dependency for dependency in internal.router.dependencies] == [verify_api_key]
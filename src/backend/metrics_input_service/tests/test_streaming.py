@@ -0,0 +1,78 @@
+import json
+import pytest
+import pytest_asyncio
+from datetime import date
+from uuid import uuid4
+
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.backend.metrics_input_service.app.models.models import MetricsInput, companies
+from src.backend.metrics_input_service.app.projection import PROJECTABLE_FIELDS, projection_columns, projection_model
+from src.backend.metrics_input_service.app.routers.metrics import metrics_query
+from src.backend.metrics_input_service.app.streaming import stream_metrics_ndjson
+
+FUND = "Growth Fund I"
+
+def metrics_row(company_id, month):
+    return dict(
+        id=uuid4(), company_id=company_id, currency="CAD",
+        total_revenue=100, recurring_revenue=80, gross_profit=60, sales_marketing_expense=20,
+        total_operating_expense=50, ebitda=10, net_income=5, cash_burn=15, cash_balance=500,
+        employees=25, fiscal_reporting_date=date(2023, month, 1), fiscal_reporting_quarter=(month - 1) // 3 + 1,
+        reporting_year=2023, reporting_quarter=(month - 1) // 3 + 1, created_by="analyst",
+    )
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stream.db'}")
+    portfolio, other = uuid4(), uuid4()
+    async with engine.begin() as connection:
+        await connection.run_sync(companies.create)
+        await connection.run_sync(MetricsInput.__table__.create)
+        await connection.execute(insert(companies), [{"id": portfolio, "fund": FUND}, {"id": other, "fund": "Other"}])
+        await connection.execute(
+            insert(MetricsInput),
+            [metrics_row(portfolio, month) for month in (3, 1, 2, 4, 5)] + [metrics_row(other, 1)],
+        )
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False), portfolio
+    await engine.dispose()
+
+@pytest.mark.asyncio
+async def test_stream_writes_fund_rows_as_ndjson_chunks(session_factory):
+    """
+    Test that a fund export is streamed in order, one chunk per fetched partition.
+
+    Requirements addressed:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Develop unit tests for all critical components of the FastAPI application using pytest.
+    """
+    factory, portfolio = session_factory
+    query = metrics_query(select(*projection_columns(PROJECTABLE_FIELDS)), None, None, None, fund=FUND)
+    model = projection_model(PROJECTABLE_FIELDS)
+
+    chunks = [chunk async for chunk in stream_metrics_ndjson(query, model, batch_size=2, session_factory=factory)]
+
+    assert len(chunks) == 3
+    records = [json.loads(line) for chunk in chunks for line in chunk.decode("utf-8").splitlines()]
+    assert [record["company_id"] for record in records] == [str(portfolio)] * 5
+    assert [record["fiscal_reporting_date"] for record in records] == [f"2023-0{month}-01" for month in range(1, 6)]
+
+@pytest.mark.asyncio
+async def test_stream_projects_requested_fields(session_factory):
+    factory, _ = session_factory
+    fields = ("fiscal_reporting_date", "total_revenue")
+    query = metrics_query(select(*projection_columns(fields)), None, None, None, fund=FUND)
+
+    chunks = [chunk async for chunk in stream_metrics_ndjson(query, projection_model(fields), session_factory=factory)]
+
+    first = json.loads(chunks[0].decode("utf-8").splitlines()[0])
+    assert first == {"fiscal_reporting_date": "2023-01-01", "total_revenue": 100.0}
+
+def test_stream_requires_company_or_fund():
+    with pytest.raises(HTTPException) as exc:
+        metrics_query(select(MetricsInput), None, date(2023, 1, 1), None)
+    assert exc.value.status_code == 400
@@ -0,0 +1,64 @@
+import pytest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from fastapi import Response
+from sqlalchemy.dialects import postgresql
+
+from src.backend.metrics_input_service.app.models.models import MetricsInputSchema
+from src.backend.metrics_input_service.app.routers.metrics import upsert_metrics
+
+pytestmark = pytest.mark.asyncio
+
+def metrics_payload():
+    return MetricsInputSchema(
+        company_id=uuid4(), currency="CAD",
+        total_revenue=100, recurring_revenue=80, gross_profit=60, sales_marketing_expense=20,
+        total_operating_expense=50, ebitda=10, net_income=5, cash_burn=15, cash_balance=500,
+        employees=25, fiscal_reporting_date=date(2023, 3, 31), fiscal_reporting_quarter=1,
+        reporting_year=2023, reporting_quarter=1, created_by="analyst",
+    )
+
+def fake_db(inserted):
+    result = MagicMock()
+    result.one.return_value = SimpleNamespace(id=uuid4(), inserted=inserted)
+    return SimpleNamespace(execute=AsyncMock(return_value=result), commit=AsyncMock(), rollback=AsyncMock())
+
+async def test_upsert_is_a_single_on_conflict_statement(mocker):
+    """
+    Test that a correction is written with one INSERT ... ON CONFLICT DO UPDATE ... RETURNING round trip.
+
+    Requirements addressed:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Develop unit tests for all critical components of the FastAPI application using pytest.
+    """
+    publisher = mocker.patch("src.backend.metrics_input_service.app.routers.metrics.change_publisher")
+    publisher.publish = AsyncMock()
+    db = fake_db(inserted=False)
+    response = Response()
+    payload = metrics_payload()
+
+    body = await upsert_metrics(payload, response, db=db)
+
+    assert db.execute.await_count == 1
+    db.commit.assert_awaited_once()
+    assert publisher.publish.await_args.args[1].since == {payload.company_id: payload.fiscal_reporting_date}
+    sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (company_id, fiscal_reporting_date) DO UPDATE SET" in sql
+    assert "total_revenue = excluded.total_revenue" in sql
+    assert "created_by = excluded" not in sql
+    assert sql.rstrip().endswith("RETURNING metrics_input.id, xmax = 0 AS inserted")
+    assert response.status_code == 200
+    assert body["created"] is False
+
+async def test_upsert_reports_new_entries_as_created(mocker):
+    mocker.patch("src.backend.metrics_input_service.app.routers.metrics.change_publisher.publish", AsyncMock())
+    response = Response()
+
+    body = await upsert_metrics(metrics_payload(), response, db=fake_db(inserted=True))
+
+    assert response.status_code == 201
+    assert body["created"] is True
@@ -0,0 +1,92 @@
+from datetime import date, datetime
+from uuid import UUID, uuid4
+
+from pydantic import ValidationError
+
+from src.backend.metrics_input_service.app.models.models import MetricsInputSchema
+from src.backend.metrics_input_service.app.validation import validate_records
+
+ROW = dict(
+    currency="USD", total_revenue="1000.5", recurring_revenue="800", gross_profit="600",
+    sales_marketing_expense="200", total_operating_expense="700", ebitda="-50", net_income="-75.25",
+    cash_burn="25", cash_balance="1e6", employees="40", fiscal_reporting_date="2023-03-31",
+    fiscal_reporting_quarter="1", reporting_year="2023", reporting_quarter="1", created_by="finance_upload",
+)
+
+# Values the column checks and the schema must treat identically
+VARIANTS = [
+    {},
+    {"total_revenue": 1200},
+    {"total_revenue": " 12.5 "},
+    {"total_revenue": "nan"},
+    {"total_revenue": "1,000"},
+    {"total_revenue": True},
+    {"employees": 12.9},
+    {"employees": "12.0"},
+    {"employees": 2 ** 70},
+    {"employees": None},
+    {"customers": "7"},
+    {"debt_outstanding": None},
+    {"company_id": "not-a-uuid"},
+    {"company_id": "{12345678-1234-5678-1234-567812345678}"},
+    {"fiscal_reporting_date": "2023-02-30"},
+    {"fiscal_reporting_date": datetime(2023, 6, 30, 12, 0)},
+    {"fiscal_reporting_date": 1680220800},
+    {"currency": 978},
+    {"created_date": "2023-04-01T09:30:00"},
+    {"created_by": None},
+]
+
+def test_matches_per_row_validation():
+    """
+    Test that column-wise validation accepts, converts and rejects exactly like the schema.
+
+    Requirements addressed:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Develop unit tests for all critical components of the FastAPI application using pytest.
+    """
+    company_id = str(uuid4())
+    records = [{**ROW, "company_id": company_id, **variant} for variant in VARIANTS]
+    records.append({key: value for key, value in records[0].items() if key != "currency"})
+
+    validated = validate_records(records)
+
+    valid = dict(zip(validated.indexes.tolist(), validated.dicts()))
+    errors = dict(validated.errors)
+    for index, record in enumerate(records):
+        try:
+            expected = MetricsInputSchema.parse_obj(record).dict()
+        except ValidationError as e:
+            assert index not in valid
+            assert errors[index].errors() == e.errors()
+            continue
+        assert index not in errors
+        # repr compares types as well as values, and treats nan as equal to itself
+        assert repr(valid[index]) == repr(expected)
+
+def test_only_failing_rows_are_parsed_individually(mocker):
+    company_id = uuid4()
+    records = [dict(ROW, company_id=str(company_id)) for _ in range(50)]
+    records[7]["total_revenue"] = "n/a"
+    records[30]["fiscal_reporting_date"] = "2023-13-01"
+    parse_obj = mocker.spy(MetricsInputSchema, "parse_obj")
+
+    validated = validate_records(records)
+
+    assert parse_obj.call_count == 2
+    assert [index for index, _ in validated.errors] == [7, 30]
+    assert validated.errors[0][1].errors()[0]["loc"] == ("total_revenue",)
+    assert len(validated) == 48
+    assert validated.column("company_id")[0] == company_id
+    assert validated.column("fiscal_reporting_date")[0] == date(2023, 3, 31)
+    assert validated.column("employees")[0] == 40
+
+def test_empty_and_invalid_batches():
+    assert len(validate_records([])) == 0
+    assert validate_records([]).tuples(["id"]) == []
+
+    validated = validate_records([{"company_id": str(uuid4())}])
+    assert len(validated) == 0
+    assert len(validated.errors) == 1
+    assert isinstance(validate_records([dict(ROW, company_id=uuid4())]).column("company_id")[0], UUID)
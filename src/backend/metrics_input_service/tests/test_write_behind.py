@@ -0,0 +1,165 @@
+import json
+import pytest
+import pytest_asyncio
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+from fastapi import Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.backend.metrics_input_service.app.database import LazySession
+from src.backend.metrics_input_service.app.events import ChangePublisher
+from src.backend.metrics_input_service.app.idempotency import IdempotencyRecord, IdempotencyStore
+from src.backend.metrics_input_service.app.routers import metrics as metrics_router
+from src.backend.metrics_input_service.app.routers.metrics import create_metrics
+from src.backend.metrics_input_service.app.models.models import IdempotencyKey, MetricsInput, MetricsInputSchema, companies
+from src.backend.metrics_input_service.app.write_behind import WriteBehindBuffer
+
+pytestmark = pytest.mark.asyncio
+
+def metrics_payload(company_id, month=3):
+    return MetricsInputSchema(
+        company_id=company_id, currency="CAD",
+        total_revenue=100, recurring_revenue=80, gross_profit=60, sales_marketing_expense=20,
+        total_operating_expense=50, ebitda=10, net_income=5, cash_burn=15, cash_balance=500,
+        employees=25, fiscal_reporting_date=date(2023, month, 28), fiscal_reporting_quarter=1,
+        reporting_year=2023, reporting_quarter=1, created_by="analyst",
+    )
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    # aiosqlite stands in for asyncpg; SQLite supports the same ON CONFLICT DO NOTHING
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'metrics.db'}")
+    async with engine.begin() as connection:
+        for table in (companies, MetricsInput.__table__, IdempotencyKey.__table__):
+            await connection.run_sync(table.create)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+@pytest_asyncio.fixture
+async def buffer(session_factory, tmp_path):
+    buffer = WriteBehindBuffer(str(tmp_path / "buffer.db"), session_factory, batch_size=2, flush_interval_seconds=60, publisher=ChangePublisher())
+    await buffer.start()
+    yield buffer
+    await buffer.stop()
+
+async def count_metrics(session_factory):
+    async with session_factory() as db:
+        return (await db.execute(select(func.count()).select_from(MetricsInput))).scalar()
+
+async def test_submissions_are_flushed_in_batches(buffer, session_factory):
+    """
+    Test that buffered submissions are acknowledged, then written in batches and reported by receipt.
+
+    Requirements addressed:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Develop unit tests for all critical components of the FastAPI application using pytest.
+    """
+    company_id = uuid4()
+    receipts = [await buffer.submit(metrics_payload(company_id, 1))]
+    assert await buffer.status(receipts[0]) == {"receipt": receipts[0], "status": "pending"}
+    assert (await buffer.stats())["backlog"] == 1
+    # Reaching the batch size wakes the background flusher
+    receipts += [await buffer.submit(metrics_payload(company_id, month)) for month in (2, 3)]
+
+    while await buffer.flush_once():
+        pass
+
+    assert await count_metrics(session_factory) == 3
+    async with session_factory() as db:
+        assert await db.get(MetricsInput, UUID(receipts[2])) is not None
+    assert await buffer.status(receipts[0]) is None
+    stats = await buffer.stats()
+    assert stats["backlog"] == 0
+    assert stats["flushed"] == 3
+
+async def test_reflushed_batch_is_not_duplicated(buffer, session_factory):
+    receipt = await buffer.submit(metrics_payload(uuid4()))
+    await buffer.flush_once()
+    # As if the process died after the commit but before the buffer was cleared
+    buffer._execute(
+        "INSERT INTO pending (receipt, body, enqueued_at) VALUES (?, ?, 0)",
+        (receipt, metrics_payload(uuid4()).copy(update={"id": UUID(receipt)}).json()),
+    )
+
+    await buffer.flush_once()
+
+    assert await count_metrics(session_factory) == 1
+
+async def test_conflicting_row_is_rejected_without_blocking_batch(buffer, session_factory):
+    company_id = uuid4()
+    first = await buffer.submit(metrics_payload(company_id))
+    duplicate_period = await buffer.submit(metrics_payload(company_id))
+
+    while await buffer.flush_once():
+        pass
+
+    assert await count_metrics(session_factory) == 1
+    assert await buffer.status(first) is None
+    status = await buffer.status(duplicate_period)
+    assert status["status"] == "rejected"
+    assert (await buffer.stats())["rejected"] == 1
+
+async def test_row_failing_on_its_own_is_rejected(buffer, session_factory):
+    company_id = uuid4()
+    first = await buffer.submit(metrics_payload(company_id, 1))
+    # A body that no longer parses fails the batch without an IntegrityError
+    buffer._execute("INSERT INTO pending (receipt, body, enqueued_at) VALUES (?, ?, 0)", (str(uuid4()), "{}"))
+    last = await buffer.submit(metrics_payload(company_id, 2))
+
+    while await buffer.flush_once():
+        pass
+
+    assert await count_metrics(session_factory) == 2
+    assert await buffer.status(first) is None
+    assert await buffer.status(last) is None
+    assert (await buffer.stats())["rejected"] == 1
+
+def no_database():
+    raise AssertionError("a buffered submission must not open a database session")
+
+async def test_create_metrics_acknowledges_with_receipt(buffer, session_factory):
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(write_behind=buffer)))
+    response = Response()
+
+    async with LazySession(no_database) as sessions:
+        body = await create_metrics(metrics_payload(uuid4()), request=request, response=response, idempotency_key=None, sessions=sessions)
+
+    assert response.status_code == 202
+    assert body["receipt"] == body["metrics_id"]
+    assert (await buffer.status(body["receipt"]))["status"] in ("pending", None)
+
+async def test_buffered_retry_is_replayed_without_database(buffer, session_factory, monkeypatch):
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(write_behind=buffer)))
+    payload = metrics_payload(uuid4())
+    async with LazySession(no_database) as sessions:
+        body = await create_metrics(payload, request=request, response=Response(), idempotency_key="buffered-1", sessions=sessions)
+        # After a restart the cache is empty, but the key is still in the buffer
+        monkeypatch.setattr(metrics_router, "idempotency_store", IdempotencyStore(ttl_seconds=60))
+        replayed = await create_metrics(payload, request=request, response=Response(), idempotency_key="buffered-1", sessions=sessions)
+
+    assert json.loads(replayed.body) == body
+    assert (await buffer.stats())["backlog"] == 1
+
+async def test_retry_buffered_by_another_replica_is_rejected_at_flush(buffer, session_factory, tmp_path):
+    other = WriteBehindBuffer(str(tmp_path / "other.db"), session_factory, batch_size=2, flush_interval_seconds=60, publisher=ChangePublisher())
+    await other.start()
+    try:
+        payload = metrics_payload(uuid4()).copy(update={"id": uuid4()})
+        record = IdempotencyRecord("hash", 202, {}, datetime.utcnow() + timedelta(minutes=1))
+        first = await other.submit(payload, ("retry-1", record._replace(body={"metrics_id": str(payload.id)})))
+        await other.flush_once()
+        retry = payload.copy(update={"id": uuid4()})
+        duplicate = await buffer.submit(retry, ("retry-1", record._replace(body={"metrics_id": str(retry.id)})))
+        await buffer.flush_once()
+    finally:
+        await other.stop()
+
+    assert await count_metrics(session_factory) == 1
+    status = await buffer.status(duplicate)
+    assert status["status"] == "rejected"
+    assert first in status["error"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, UUID, ForeignKey
+from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, UUID, ForeignKey, Index, Table
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from pydantic import BaseModel
@@ -11,6 +11,15 @@ import uuid
 
 Base = declarative_base()
 
+# The companies table is owned by the shared database schema; only the columns used to
+# resolve a fund to its companies are declared here
+companies = Table(
+    'companies',
+    Base.metadata,
+    Column('id', UUID(as_uuid=True), primary_key=True),
+    Column('fund', String, nullable=False),
+)
+
 class ReportingMetrics(Base):
     """
     Represents the data model for reporting metrics, defining the schema for the reporting metrics table in the database.
@@ -20,6 +29,14 @@ class ReportingMetrics(Base):
       Ensures the consistency and integrity of financial data across all database tables and during all data processing operations.
     """
     __tablename__ = 'reporting_metrics'
+    # Lookups are by company and period; the included timestamps let ETags be computed from the index alone
+    __table_args__ = (
+        Index(
+            'ix_reporting_metrics_company_id_reporting_year_reporting_quarter',
+            'company_id', 'reporting_year', 'reporting_quarter',
+            postgresql_include=['created_date', 'last_update_date'],
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     company_id = Column(UUID(as_uuid=True), ForeignKey('companies.id'), nullable=False)
@@ -153,4 +170,4 @@ class ReportingMetrics(Base):
         self.last_update_date = last_update_date
         self.last_updated_by = last_updated_by
 
-# Note: Ensure that the 'companies' table exists in the database schema with a primary key 'id' of type UUID.
\ No newline at end of file
+# Note: The 'companies' table declared above is created by the database migrations, not by this service.
\ No newline at end of file
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from pydantic import BaseModel, Field
+from sqlalchemy import any_, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 from datetime import date
 
@@ -8,33 +11,74 @@ from datetime import date
 # fastapi==0.68.0
 # sqlalchemy==1.4.22
 
-from src.backend.reporting_metrics_service.app.models.models import ReportingMetrics
+from src.backend.reporting_metrics_service.app.models.models import ReportingMetrics, companies
 from src.backend.reporting_metrics_service.app.database import get_db
 from src.backend.reporting_metrics_service.app.schemas import ReportingMetricsResponse
+from src.backend.reporting_metrics_service.config import settings
+from src.backend.shared.etag import ETAG_HEADER, etag_matches, make_etag, not_modified, range_version
 
 router = APIRouter()
 
+
+class CompanyReportingMetrics(BaseModel):
+    """
+    Reporting metrics of one company within a portfolio response.
+    """
+    company_id: UUID = Field(..., description="UUID of the company")
+    metrics: List[ReportingMetricsResponse] = Field(..., description="The company's metrics in fiscal reporting date order")
+
+
+def metrics_version(db: Session, criteria: list):
+    """
+    Computes the ``range_version`` of the reporting metrics matching ``criteria``.
+    """
+    modified_at = func.coalesce(ReportingMetrics.last_update_date, ReportingMetrics.created_date)
+    return db.query(*range_version(modified_at)).filter(*criteria).one()
+
+
+def portfolio_criteria(company_ids: List[UUID], reporting_year: int, reporting_quarter: Optional[int]) -> list:
+    """
+    Filters selecting the metrics of many companies for a period.
+
+    The ids are sent as one array parameter compared with ``= ANY``, so the statement text is the
+    same whatever the number of companies.
+    """
+    ids = bindparam("company_ids", company_ids, type_=ARRAY(PG_UUID(as_uuid=True)))
+    criteria = [ReportingMetrics.company_id == any_(ids), ReportingMetrics.reporting_year == reporting_year]
+    if reporting_quarter:
+        criteria.append(ReportingMetrics.reporting_quarter == reporting_quarter)
+    return criteria
+
 @router.get('/metrics', response_model=List[ReportingMetricsResponse])
 async def get_reporting_metrics(
+    response: Response,
     company_id: UUID = Query(..., description="UUID of the company"),
     reporting_year: int = Query(..., description="Reporting year"),
     reporting_quarter: Optional[int] = Query(None, description="Reporting quarter (optional)"),
+    if_none_match: Optional[str] = Header(None, description="ETag of a previously received response"),
     db: Session = Depends(get_db)
 ):
     """
     Handles HTTP GET requests to retrieve reporting metrics data based on specified query parameters.
     
+    Responses carry an ETag computed from the row count and modification times of the
+    requested range. When If-None-Match holds the current ETag, a 304 is returned before the
+    metrics are queried or serialized.
+    
     This endpoint addresses the requirement:
     - API Development and Deployment (Technical Requirements/Feature 2: API Development and Deployment)
     
     Args:
+        response (Response): The outgoing response, used to set the ETag header.
         company_id (UUID): The unique identifier of the company.
         reporting_year (int): The year for which to retrieve metrics.
         reporting_quarter (Optional[int]): The specific quarter to retrieve metrics for (optional).
+        if_none_match (Optional[str]): ETags the client already holds.
         db (Session): The database session dependency.
     
     Returns:
-        List[ReportingMetricsResponse]: A JSON response containing the requested reporting metrics data.
+        List[ReportingMetricsResponse]: A JSON response containing the requested reporting metrics data,
+        or an empty 304 response when the client's copy is current.
     
     Raises:
         HTTPException: If no data is found for the given parameters.
@@ -43,27 +87,108 @@ async def get_reporting_metrics(
     if reporting_quarter and not 1 <= reporting_quarter <= 4:
         raise HTTPException(status_code=400, detail="Invalid reporting quarter. Must be between 1 and 4.")
 
-    # Step 2: Query the ReportingMetrics model using SQLAlchemy to fetch data matching the specified parameters
-    query = db.query(ReportingMetrics).filter(
-        ReportingMetrics.company_id == company_id,
-        ReportingMetrics.reporting_year == reporting_year
-    )
-
+    criteria = [ReportingMetrics.company_id == company_id, ReportingMetrics.reporting_year == reporting_year]
     if reporting_quarter:
-        query = query.filter(ReportingMetrics.reporting_quarter == reporting_quarter)
+        criteria.append(ReportingMetrics.reporting_quarter == reporting_quarter)
 
-    metrics = query.all()
+    # Step 2: Compare the client's ETag with the range version, read from the covering index only
+    version = metrics_version(db, criteria)
 
     # Step 3: Check if any data was found
-    if not metrics:
+    if not version[0]:
         raise HTTPException(status_code=404, detail="No reporting metrics found for the given parameters.")
 
-    # Step 4: Format the retrieved data into a JSON response
+    etag = make_etag(version, company_id, reporting_year, reporting_quarter)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers[ETAG_HEADER] = etag
+
+    # Step 4: Query the ReportingMetrics model using SQLAlchemy to fetch data matching the specified parameters
+    metrics = db.query(ReportingMetrics).filter(*criteria).all()
+
+    # Step 5: Format the retrieved data into a JSON response
     response_data = [ReportingMetricsResponse.from_orm(metric) for metric in metrics]
 
-    # Step 5: Return the JSON response to the client
+    # Step 6: Return the JSON response to the client
     return response_data
 
+@router.get('/metrics/portfolio', response_model=List[CompanyReportingMetrics])
+async def get_portfolio_reporting_metrics(
+    response: Response,
+    reporting_year: int = Query(..., description="Reporting year"),
+    company_ids: Optional[List[UUID]] = Query(None, description="UUIDs of the companies; repeat the parameter for each company"),
+    fund: Optional[str] = Query(None, description="Fund whose companies to include, instead of company_ids"),
+    reporting_quarter: Optional[int] = Query(None, description="Reporting quarter (optional)"),
+    if_none_match: Optional[str] = Header(None, description="ETag of a previously received response"),
+    db: Session = Depends(get_db)
+):
+    """
+    Handles HTTP GET requests for the reporting metrics of many companies at once, e.g. a fund dashboard.
+    
+    The companies are given as a list of ids or as a fund, which is resolved to its companies
+    through the companies table. All of their metrics are then fetched with a single
+    ``company_id = ANY(:company_ids)`` query instead of one request and query per company.
+    Results are grouped per company, in the order the ids were given (or by id for a fund),
+    and every requested company appears even when it has no metrics for the period. Like the
+    single-company endpoint, responses carry an ETag and a matching If-None-Match yields 304.
+    
+    This endpoint addresses the requirement:
+    - API Development and Deployment (Technical Requirements/Feature 2: API Development and Deployment)
+    
+    Args:
+        response (Response): The outgoing response, used to set the ETag header.
+        reporting_year (int): The year for which to retrieve metrics.
+        company_ids (Optional[List[UUID]]): The companies to include.
+        fund (Optional[str]): The fund whose companies to include.
+        reporting_quarter (Optional[int]): The specific quarter to retrieve metrics for (optional).
+        if_none_match (Optional[str]): ETags the client already holds.
+        db (Session): The database session dependency.
+    
+    Returns:
+        List[CompanyReportingMetrics]: The metrics of each company, or an empty 304 response
+        when the client's copy is current.
+    
+    Raises:
+        HTTPException: If neither or both of company_ids and fund are given, too many companies
+        are requested, the quarter is invalid or the fund is unknown.
+    """
+    # Step 1: Validate the incoming query parameters
+    if (company_ids is None) == (fund is None):
+        raise HTTPException(status_code=400, detail="Exactly one of company_ids or fund is required.")
+    if reporting_quarter and not 1 <= reporting_quarter <= 4:
+        raise HTTPException(status_code=400, detail="Invalid reporting quarter. Must be between 1 and 4.")
+
+    # Step 2: Resolve the fund to its companies
+    if fund is not None:
+        company_ids = list(db.execute(select(companies.c.id).where(companies.c.fund == fund).order_by(companies.c.id)).scalars())
+        if not company_ids:
+            raise HTTPException(status_code=404, detail="No companies found for the given fund.")
+    company_ids = list(dict.fromkeys(company_ids))
+    if len(company_ids) > settings.PORTFOLIO_MAX_COMPANIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.PORTFOLIO_MAX_COMPANIES} companies can be requested at once.",
+        )
+
+    # Step 3: Compare the client's ETag with the version of the requested metrics
+    criteria = portfolio_criteria(company_ids, reporting_year, reporting_quarter)
+    version = metrics_version(db, criteria)
+    etag = make_etag(version, ",".join(map(str, company_ids)), reporting_year, reporting_quarter)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers[ETAG_HEADER] = etag
+
+    # Step 4: Fetch the metrics of every company in one query and group them per company
+    grouped: Dict[UUID, List[ReportingMetricsResponse]] = {company_id: [] for company_id in company_ids}
+    if version[0]:
+        metrics = db.query(ReportingMetrics).filter(*criteria).order_by(
+            ReportingMetrics.company_id, ReportingMetrics.fiscal_reporting_date
+        ).all()
+        for metric in metrics:
+            grouped[metric.company_id].append(ReportingMetricsResponse.from_orm(metric))
+
+    return [CompanyReportingMetrics(company_id=company_id, metrics=metrics) for company_id, metrics in grouped.items()]
+
 # Additional endpoints can be added here as needed, following the same pattern
 # For example, endpoints for creating, updating, or deleting reporting metrics
 
@@ -31,6 +31,9 @@ class Settings(BaseSettings):
     # CORS settings
     BACKEND_CORS_ORIGINS: list = ['http://localhost:3000', 'https://localhost:3000', 'http://localhost', 'https://localhost']
     
+    # Largest number of companies a portfolio request may include
+    PORTFOLIO_MAX_COMPANIES: int = int(os.getenv('PORTFOLIO_MAX_COMPANIES', '500'))
+    
     # Logging configuration
     LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
     
@@ -19,6 +19,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from src.backend.reporting_metrics_service.app.routers import metrics
 from src.backend.reporting_metrics_service.app.models.models import ReportingMetrics
 from src.backend.reporting_metrics_service.config import settings
+from src.backend.shared.etag import ETAG_HEADER
 
 # Initialize the database engine and session
 DATABASE_URL = settings.DATABASE_URL
@@ -39,6 +40,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[ETAG_HEADER],
 )
 
 # Dependency to get the database session
@@ -4,9 +4,18 @@ from sqlalchemy.orm import Session
 from uuid import UUID
 from datetime import date, datetime
 from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from fastapi import HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
 
 # Import necessary modules and functions from the reporting_metrics_service
-from src.backend.reporting_metrics_service.app.routers.metrics import get_reporting_metrics
+from src.backend.reporting_metrics_service.app.routers.metrics import (
+    get_portfolio_reporting_metrics,
+    get_reporting_metrics,
+    portfolio_criteria,
+)
 from src.backend.reporting_metrics_service.app.models.models import ReportingMetrics
 from src.backend.reporting_metrics_service.main import app
 
@@ -203,4 +212,127 @@ async def test_get_reporting_metrics_invalid_params(db_session: Session):
     assert any(error["loc"] == ["query", "reporting_year"] for error in errors)
     assert any(error["loc"] == ["query", "reporting_quarter"] for error in errors)
 
+@pytest.mark.asyncio
+async def test_get_reporting_metrics_not_modified(db_session: Session):
+    """
+    Test that a request carrying the current ETag is answered with 304 and no body.
+    
+    This test addresses the requirement:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Implement automated testing frameworks and quality assurance processes to ensure
+    the reliability and robustness of the backend platform.
+    """
+    test_metrics = create_test_reporting_metrics(db_session)
+    client = TestClient(app)
+    url = f"/reporting-metrics/metrics?company_id={test_metrics.company_id}&reporting_year={test_metrics.reporting_year}"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    # An unchanged range keeps its ETag
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    # A different request shape is a different representation
+    response = client.get(url + "&reporting_quarter=4", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def fake_portfolio_session(version, metrics, fund_companies=()):
+    """
+    Helper returning a mocked session that answers the fund, version and metrics queries.
+    """
+    db = MagicMock()
+    db.execute.return_value.scalars.return_value = iter(fund_companies)
+    db.query.return_value.filter.return_value.one.return_value = version
+    db.query.return_value.filter.return_value.order_by.return_value.all.return_value = metrics
+    return db
+
+def test_portfolio_query_uses_one_array_parameter():
+    """
+    Test that the portfolio query selects all companies with a single = ANY parameter.
+    
+    This test addresses the requirement:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Implement automated testing frameworks and quality assurance processes to ensure
+    the reliability and robustness of the backend platform.
+    """
+    company_ids = [UUID(int=index) for index in range(80)]
+    compiled = select(ReportingMetrics).where(*portfolio_criteria(company_ids, 2023, 4)).compile(dialect=postgresql.dialect())
+
+    assert "reporting_metrics.company_id = ANY (%(company_ids)s" in str(compiled)
+    assert compiled.params["company_ids"] == company_ids
+
+@pytest.mark.asyncio
+async def test_get_portfolio_reporting_metrics_groups_per_company(mocker):
+    """
+    Test that the metrics of many companies are fetched together and grouped per company.
+    
+    This test addresses the requirement:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Implement automated testing frameworks and quality assurance processes to ensure
+    the reliability and robustness of the backend platform.
+    """
+    first, second, empty = UUID(int=1), UUID(int=2), UUID(int=3)
+    metrics = [SimpleNamespace(company_id=first), SimpleNamespace(company_id=second), SimpleNamespace(company_id=first)]
+    mocker.patch(
+        "src.backend.reporting_metrics_service.app.routers.metrics.ReportingMetricsResponse.from_orm",
+        side_effect=lambda metric: metric,
+    )
+    db = fake_portfolio_session((3, datetime(2023, 4, 1), 1000), metrics)
+    response = Response()
+
+    groups = await get_portfolio_reporting_metrics(
+        response, reporting_year=2023, company_ids=[second, first, empty, first], fund=None,
+        reporting_quarter=None, if_none_match=None, db=db,
+    )
+
+    assert [group.company_id for group in groups] == [second, first, empty]
+    assert [len(group.metrics) for group in groups] == [1, 2, 0]
+    assert db.query.return_value.filter.return_value.order_by.return_value.all.call_count == 1
+
+    # The same portfolio and version is not modified
+    db = fake_portfolio_session((3, datetime(2023, 4, 1), 1000), metrics)
+    result = await get_portfolio_reporting_metrics(
+        Response(), reporting_year=2023, company_ids=[second, first, empty], fund=None,
+        reporting_quarter=None, if_none_match=response.headers["ETag"], db=db,
+    )
+    assert result.status_code == 304
+    db.query.return_value.filter.return_value.order_by.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_get_portfolio_reporting_metrics_resolves_fund():
+    """
+    Test that a fund is resolved to its companies and that exactly one selector is required.
+    
+    This test addresses the requirement:
+    - Automated Testing and Quality Assurance
+    Location: Technical Requirements/Feature 13: Automated Testing and Quality Assurance
+    Description: Implement automated testing frameworks and quality assurance processes to ensure
+    the reliability and robustness of the backend platform.
+    """
+    company_id = UUID(int=7)
+    db = fake_portfolio_session((0, None, None), [], fund_companies=[company_id])
+
+    groups = await get_portfolio_reporting_metrics(
+        Response(), reporting_year=2023, company_ids=None, fund="Fund VI",
+        reporting_quarter=None, if_none_match=None, db=db,
+    )
+
+    assert [(group.company_id, group.metrics) for group in groups] == [(company_id, [])]
+    assert "companies.fund" in str(db.execute.call_args.args[0])
+
+    with pytest.raises(HTTPException) as exc:
+        await get_portfolio_reporting_metrics(
+            Response(), reporting_year=2023, company_ids=None, fund=None,
+            reporting_quarter=None, if_none_match=None, db=db,
+        )
+    assert exc.value.status_code == 400
+
 # Add more test cases as needed to cover different scenarios and edge cases
\ No newline at end of file
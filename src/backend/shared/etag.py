@@ -0,0 +1,83 @@
+"""
+Conditional GET support shared by the metrics read services.
+
+Metrics and reporting metrics change about once a quarter, while dashboards poll them
+continuously. Every read response carries a weak ETag derived from the version of the requested
+key range together with the request's own parameters. A client that sends the ETag back in
+``If-None-Match`` gets a 304 before the rows are read or serialized.
+
+The version of a range is its row count, its latest modification time and the sum of all its
+modification times in microseconds. Modification times are transaction timestamps, so a
+correction committed after a read can carry a time older than the range's latest one. It still
+moves its own row's time forward and so changes the sum. Inserting a row changes the count and
+deleting one lowers it. All three aggregates read only the modification time, which the covering
+indexes of the metrics tables include, so computing the version is an index-only scan.
+
+Requirements addressed:
+- API Services (Technical Requirements/Feature 2: API Development and Deployment):
+  Serve repeated dashboard polls of unchanged data without re-running the query.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import Response
+from sqlalchemy import BigInteger, cast, func
+
+ETAG_HEADER = "ETag"
+
+
+def range_version(modified_at: Any) -> List[Any]:
+    """
+    Aggregates that together identify the state of a key range.
+
+    Args:
+        modified_at: Column expression for a row's modification time, e.g. COALESCE(last_update_date, created_date).
+
+    Returns:
+        List: Row count, latest modification time and the sum of modification times in microseconds.
+    """
+    return [
+        func.count(),
+        func.max(modified_at),
+        func.sum(cast(func.extract("epoch", modified_at) * 1000000, BigInteger)),
+    ]
+
+
+def make_etag(version: Sequence[Any], *variant: Any) -> str:
+    """
+    Build a weak ETag for a key range version and the parameters that shape the response.
+
+    Args:
+        version (Sequence[Any]): The range's ``range_version`` aggregates.
+        *variant (Any): Request parameters the body depends on, e.g. page size, cursor or fields.
+
+    Returns:
+        str: The quoted, weak entity tag.
+    """
+    parts = (part.isoformat() if isinstance(part, datetime) else part for part in (*version, *variant))
+    return 'W/"' + hashlib.sha256(":".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header value matches the ETag, using weak comparison.
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    return _opaque(etag) in {_opaque(candidate) for candidate in candidates}
+
+
+def not_modified(etag: str) -> Response:
+    """
+    An empty 304 response repeating the ETag.
+    """
+    return Response(status_code=304, headers={ETAG_HEADER: etag})
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
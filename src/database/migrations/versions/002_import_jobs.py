@@ -0,0 +1,56 @@
+"""
+Add import jobs
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 09:00:00.000000
+
+Adds the import_jobs table, which tracks background bulk imports of metrics files so their
+progress can be polled and interrupted jobs resumed after a restart.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """
+    Creates the import_jobs table.
+    
+    This function addresses the requirement:
+    - Data Input Methods (Technical Requirements/Feature 4: Data Input Methods)
+      Persists the state of bulk metrics imports so they survive service restarts.
+    """
+    op.create_table('import_jobs',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True, default=uuid.uuid4),
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('staged_path', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False, server_default='pending'),
+        sa.Column('rows_processed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rows_inserted', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rows_rejected', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('errors', sa.JSON(), nullable=True),
+        sa.Column('error_message', sa.String(), nullable=True),
+        sa.Column('created_date', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('created_by', sa.String(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True)
+    )
+
+    # Workers look up unfinished jobs on startup
+    op.create_index('ix_import_jobs_status', 'import_jobs', ['status'])
+
+def downgrade():
+    """
+    Drops the import_jobs table.
+    """
+    op.drop_index('ix_import_jobs_status', table_name='import_jobs')
+    op.drop_table('import_jobs')
@@ -0,0 +1,46 @@
+"""
+Add idempotency keys
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 12:00:00.000000
+
+Adds the idempotency_keys table, which records the response to each metrics submission made
+with an Idempotency-Key header so that client retries are answered without inserting again.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """
+    Creates the idempotency_keys table.
+    
+    This function addresses the requirement:
+    - Data Input Methods (Technical Requirements/Feature 4: Data Input Methods)
+      Lets retried metrics submissions be recognized across all service replicas.
+    """
+    op.create_table('idempotency_keys',
+        sa.Column('key', sa.String(), primary_key=True),
+        sa.Column('request_hash', sa.String(64), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=False),
+        sa.Column('response_body', sa.JSON(), nullable=False),
+        sa.Column('created_date', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('expires_at', sa.DateTime(), nullable=False)
+    )
+
+    # Expired keys are purged by expiry time
+    op.create_index('ix_idempotency_keys_expires_at', 'idempotency_keys', ['expires_at'])
+
+def downgrade():
+    """
+    Drops the idempotency_keys table.
+    """
+    op.drop_index('ix_idempotency_keys_expires_at', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,79 @@
+"""
+Make (company_id, fiscal_reporting_date) the natural key of metrics_input
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 14:00:00.000000
+
+Replaces the non-unique company/date index with a unique constraint, so corrections can be
+written with INSERT ... ON CONFLICT DO UPDATE. Existing duplicate submissions for a period are
+moved to metrics_input_duplicates first, keeping the most recently written row in metrics_input.
+Each archived row records the id of the row that was kept, so the duplicates can be reviewed
+and, where needed, re-applied as corrections.
+
+The constraint's index also carries created_date and last_update_date, so the read ETags
+(row count and latest modification of a company/date range) come from an index-only scan.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """
+    Archives duplicate metrics_input rows and adds the unique constraint.
+    
+    This function addresses the requirement:
+    - Data Storage (Technical Requirements/Feature 1: Database Setup and Configuration)
+      Guarantees a single metrics entry per company and reporting period.
+    """
+    op.execute("""
+        CREATE TABLE metrics_input_duplicates (
+            LIKE metrics_input INCLUDING DEFAULTS,
+            kept_id uuid NOT NULL,
+            archived_at timestamp NOT NULL DEFAULT now()
+        )
+    """)
+    op.execute("""
+        WITH removed AS (
+            DELETE FROM metrics_input m
+            USING (
+                SELECT id,
+                       row_number() OVER latest AS position,
+                       first_value(id) OVER latest AS kept_id
+                FROM metrics_input
+                WINDOW latest AS (
+                    PARTITION BY company_id, fiscal_reporting_date
+                    ORDER BY COALESCE(last_update_date, created_date) DESC, created_date DESC, id DESC
+                )
+            ) ranked
+            WHERE m.id = ranked.id AND ranked.position > 1
+            RETURNING m.*, ranked.kept_id
+        )
+        INSERT INTO metrics_input_duplicates
+        SELECT removed.*, now() FROM removed
+    """)
+
+    # The constraint's index serves the same company/date lookups as the index it replaces
+    op.drop_index('ix_metrics_input_company_id_fiscal_reporting_date', table_name='metrics_input')
+    op.execute("""
+        ALTER TABLE metrics_input
+        ADD CONSTRAINT uq_metrics_input_company_id_fiscal_reporting_date
+        UNIQUE (company_id, fiscal_reporting_date) INCLUDE (created_date, last_update_date)
+    """)
+
+def downgrade():
+    """
+    Restores the non-unique index and moves the archived duplicates back into metrics_input.
+    """
+    op.drop_constraint('uq_metrics_input_company_id_fiscal_reporting_date', 'metrics_input', type_='unique')
+    op.create_index('ix_metrics_input_company_id_fiscal_reporting_date', 'metrics_input', ['company_id', 'fiscal_reporting_date'])
+    # The remaining columns are metrics_input's, in the same order
+    op.drop_column('metrics_input_duplicates', 'kept_id')
+    op.drop_column('metrics_input_duplicates', 'archived_at')
+    op.execute("INSERT INTO metrics_input SELECT * FROM metrics_input_duplicates")
+    op.drop_table('metrics_input_duplicates')
@@ -0,0 +1,49 @@
+"""
+Add a covering index for reporting metrics read ETags
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 16:00:00.000000
+
+The reporting read endpoints tag each response with the row count and modification times of the
+requested company/period range. Including created_date and last_update_date in a
+company/period index lets PostgreSQL compute them with an index-only scan. The metrics_input
+reads are covered by the natural-key constraint from 004.
+
+reporting_metrics is owned by the reporting service, so the index is only created where the
+table exists.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """
+    Creates the covering company/period index on reporting_metrics.
+    
+    This function addresses the requirement:
+    - Data Storage (Technical Requirements/Feature 1: Database Setup and Configuration)
+      Keeps conditional reads of unchanged reporting metrics cheap for the database.
+    """
+    op.execute("""
+        DO $$
+        BEGIN
+            IF to_regclass('reporting_metrics') IS NOT NULL THEN
+                CREATE INDEX IF NOT EXISTS ix_reporting_metrics_company_id_reporting_year_reporting_quarter
+                ON reporting_metrics (company_id, reporting_year, reporting_quarter)
+                INCLUDE (created_date, last_update_date);
+            END IF;
+        END
+        $$
+    """)
+
+def downgrade():
+    """
+    Drops the covering index.
+    """
+    op.execute("DROP INDEX IF EXISTS ix_reporting_metrics_company_id_reporting_year_reporting_quarter")
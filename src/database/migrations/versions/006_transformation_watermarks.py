@@ -0,0 +1,50 @@
+"""
+Add transformation watermarks
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 18:00:00.000000
+
+The data transformation timer drains the metrics_input rows written since its last run. It
+records how far it got in transformation_watermarks, as the last row's
+COALESCE(last_update_date, created_date) and id. An expression index on that pair lets each
+run count and read the rows past the watermark with a range scan.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """
+    Creates the transformation_watermarks table and the metrics_input backlog index.
+    
+    This function addresses the requirement:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+      Lets scheduled transformations pick up exactly the metrics written since their last run.
+    """
+    op.create_table('transformation_watermarks',
+        sa.Column('name', sa.String(), primary_key=True),
+        sa.Column('modified_at', sa.DateTime(), nullable=False),
+        sa.Column('last_id', UUID(as_uuid=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.now())
+    )
+
+    op.create_index(
+        'ix_metrics_input_modified_at_id',
+        'metrics_input',
+        [sa.text('COALESCE(last_update_date, created_date)'), 'id'],
+    )
+
+def downgrade():
+    """
+    Drops the backlog index and the transformation_watermarks table.
+    """
+    op.drop_index('ix_metrics_input_modified_at_id', table_name='metrics_input')
+    op.drop_table('transformation_watermarks')
@@ -0,0 +1,37 @@
+"""
+Record the FX snapshot of converted financials
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 20:00:00.000000
+
+The data transformation saves each company's financials converted into the reporting
+currencies to quarterly_reporting_financials. Each row records the version of the FX snapshot
+its conversion used, so that when the rates are revised the rows converted with older rates can
+be found and recomputed.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """
+    Adds the fx_snapshot_version column to quarterly_reporting_financials.
+    
+    This function addresses the requirement:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+      Keeps converted financials consistent with the latest FX rates.
+    """
+    op.add_column('quarterly_reporting_financials', sa.Column('fx_snapshot_version', sa.String(), nullable=True))
+
+def downgrade():
+    """
+    Drops the fx_snapshot_version column.
+    """
+    op.drop_column('quarterly_reporting_financials', 'fx_snapshot_version')
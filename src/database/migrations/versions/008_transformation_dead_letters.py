@@ -0,0 +1,44 @@
+"""
+Add transformation dead letters
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-20 09:00:00.000000
+
+A metrics_input row the data transformation cannot process, e.g. because of a malformed value,
+would otherwise fail every timer run and hold the backlog watermark in place. Such rows are
+recorded in transformation_dead_letters with the error, and the watermark moves past them.
+Correcting the row gives it a new backlog position, so it is transformed again.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    """
+    Creates the transformation_dead_letters table.
+    
+    This function addresses the requirement:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+      Keeps one malformed submission from stalling the transformation of all later ones.
+    """
+    op.create_table('transformation_dead_letters',
+        sa.Column('name', sa.String(), primary_key=True),
+        sa.Column('metrics_input_id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('modified_at', sa.DateTime(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=False),
+        sa.Column('failed_at', sa.DateTime(), nullable=False, server_default=sa.func.now())
+    )
+
+def downgrade():
+    """
+    Drops the transformation_dead_letters table.
+    """
+    op.drop_table('transformation_dead_letters')
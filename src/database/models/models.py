@@ -194,6 +194,7 @@ class QuarterlyReportingFinancials(Base):
     fiscal_reporting_quarter = Column(Integer, nullable=False)
     reporting_year = Column(Integer, nullable=False)
     reporting_quarter = Column(Integer, nullable=False)
+    fx_snapshot_version = Column(String)
     created_date = Column(DateTime(timezone=True), server_default=func.now())
     created_by = Column(String, nullable=False)
     last_update_date = Column(DateTime(timezone=True), onupdate=func.now())
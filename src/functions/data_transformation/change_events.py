@@ -0,0 +1,312 @@
+"""
+Event-driven recompute of derived metrics from metrics_input change notifications.
+
+The metrics input service publishes ``[company_id, since]`` pairs on a PostgreSQL NOTIFY
+channel when its transactions commit. ``since`` is the earliest fiscal reporting date that
+changed. This worker listens on that channel and, instead of waiting for the next timer run,
+recomputes the affected companies within seconds.
+
+Submissions arrive in bursts at quarter close, often several per company within moments. The
+``ChangeCoalescer`` therefore holds each company until its events have been quiet for a short
+window, bounded by a maximum delay. A burst becomes one recompute per company, starting from
+the earliest changed period, and the due companies are fetched together in one query. The
+derived metrics are saved to quarterly_reporting_metrics.
+
+Azure Functions cannot hold a LISTEN connection open, so this runs as a small long-lived
+process next to the function app:
+
+    python -m src.functions.data_transformation.change_events
+
+``--output-queue results.db`` additionally publishes the recomputed records to a SQLite queue.
+
+Requirements Addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+      Make derived metrics available seconds after new metrics are submitted.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+import asyncpg  # version 0.28.0
+import psycopg2  # version 2.9.1
+
+from .fx_client import FXClient
+from .main import TARGET_CURRENCIES, publish_results, recompute_changes
+from .metrics_store import ChangeEvent, MetricsStore
+from .queues import MessagePublisher, SQLiteQueue
+
+logger = logging.getLogger(__name__)
+
+CHANGE_EVENTS_CHANNEL = os.environ.get("CHANGE_EVENTS_CHANNEL", "metrics_input_changes")
+
+
+def parse_payload(payload: str) -> List[ChangeEvent]:
+    """
+    Decode a notification payload of ``[company_id, since]`` pairs.
+    """
+    return [ChangeEvent(company_id, date.fromisoformat(since)) for company_id, since in json.loads(payload)]
+
+
+class ChangeCoalescer:
+    """
+    Groups change events into per-company recomputes.
+
+    A company becomes due once no event has arrived for it for ``quiet_seconds``, or
+    ``max_delay_seconds`` after its first pending event, whichever comes first. Companies whose
+    recompute failed are put back with ``requeue`` and only become due again after a backoff that
+    doubles with each consecutive failure, up to ``max_retry_seconds``.
+
+    Args:
+        quiet_seconds (float): Time without new events after which a company is recomputed.
+        max_delay_seconds (float): Upper bound on how long a company's first event waits.
+        retry_seconds (float): Backoff after a company's first failed recompute.
+        max_retry_seconds (float): Upper bound on the backoff.
+        clock (Callable): Monotonic clock, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        quiet_seconds: float = 2.0,
+        max_delay_seconds: float = 10.0,
+        retry_seconds: float = 5.0,
+        max_retry_seconds: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.quiet_seconds = quiet_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.clock = clock
+        # company_id -> [earliest since, first event time, last event time, not before]
+        self._pending: Dict[str, list] = {}
+        # company_id -> consecutive failed recomputes
+        self._failures: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, events: List[ChangeEvent], not_before: float = 0.0) -> None:
+        now = self.clock()
+        for event in events:
+            entry = self._pending.get(event.company_id)
+            if entry is None:
+                self._pending[event.company_id] = [event.since, now, now, not_before]
+            else:
+                entry[0] = min(entry[0], event.since)
+                entry[2] = now
+                entry[3] = max(entry[3], not_before)
+
+    def requeue(self, events: List[ChangeEvent]) -> None:
+        """
+        Put back companies whose recompute failed, to be retried after their backoff.
+        """
+        for event in events:
+            failures = self._failures.get(event.company_id, 0) + 1
+            self._failures[event.company_id] = failures
+            delay = min(self.retry_seconds * 2 ** (failures - 1), self.max_retry_seconds)
+            self.add([event], not_before=self.clock() + delay)
+
+    def succeeded(self, events: List[ChangeEvent]) -> None:
+        """
+        Reset the backoff of companies that were recomputed.
+        """
+        for event in events:
+            self._failures.pop(event.company_id, None)
+
+    def _due_at(self, entry: list) -> float:
+        return max(min(entry[2] + self.quiet_seconds, entry[1] + self.max_delay_seconds), entry[3])
+
+    def next_due(self) -> Optional[float]:
+        """
+        Clock time at which the next company becomes due, or None when nothing is pending.
+        """
+        return min((self._due_at(entry) for entry in self._pending.values()), default=None)
+
+    def pop_due(self) -> List[ChangeEvent]:
+        """
+        Remove and return the companies that are due, each with its earliest changed period.
+        """
+        now = self.clock()
+        due = [company_id for company_id, entry in self._pending.items() if self._due_at(entry) <= now]
+        return [ChangeEvent(company_id, self._pending.pop(company_id)[0]) for company_id in due]
+
+
+async def recompute(batch: List[ChangeEvent], sink: Optional[MessagePublisher], fx_client: FXClient, store: MetricsStore) -> int:
+    """
+    Recompute and save derived metrics for a batch of changed companies.
+
+    The FX snapshot is awaited from the pooled client, so a slow FX API holds up neither the
+    event loop nor an executor thread. The store's queries and the transformation run in an
+    executor thread. When a sink is given, the changed periods are also published to it.
+
+    Returns:
+        int: Number of records recomputed.
+    """
+    snapshot = await fx_client.get_snapshot()
+    changed = await asyncio.get_running_loop().run_in_executor(
+        None, recompute_changes, store, batch, snapshot, TARGET_CURRENCIES
+    )
+    if sink is not None:
+        publish_results(sink, changed)
+    return len(changed)
+
+
+async def run_listener(
+    dsn: str,
+    sink: Optional[MessagePublisher] = None,
+    channel: str = CHANGE_EVENTS_CHANNEL,
+    coalescer: Optional[ChangeCoalescer] = None,
+    stop: Optional[asyncio.Event] = None,
+    heartbeat_seconds: float = 30.0,
+    reconnect_seconds: float = 1.0,
+    max_reconnect_seconds: float = 60.0,
+    catch_up_margin_seconds: float = 60.0,
+) -> None:
+    """
+    Listen for change notifications and recompute the changed companies until ``stop`` is set.
+
+    Notifications sent while the listener is disconnected are lost. The listener checks its
+    connection every ``heartbeat_seconds`` and records the database time of the last successful
+    check. When the connection drops, it reconnects with exponential backoff and then catches up:
+    every company with metrics_input rows written since the last check, less a safety margin, is
+    queued for a recompute. Failed recomputes are requeued with backoff in the coalescer, and the
+    store's connection is reopened when it was lost.
+
+    Args:
+        dsn (str): PostgreSQL connection string.
+        sink (Optional[MessagePublisher]): Queue recomputed records are also published to.
+        channel (str): NOTIFY channel the metrics input service publishes on.
+        coalescer (Optional[ChangeCoalescer]): Grouping policy; defaults to a 2 second quiet window.
+        stop (Optional[asyncio.Event]): Set to shut the listener down.
+        heartbeat_seconds (float): Interval between connection checks.
+        reconnect_seconds (float): Delay before the first reconnect attempt.
+        max_reconnect_seconds (float): Upper bound on the delay between reconnect attempts.
+        catch_up_margin_seconds (float): How far before the last check the catch-up scan starts.
+    """
+    coalescer = coalescer or ChangeCoalescer()
+    stop = stop or asyncio.Event()
+    arrived = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    def on_notification(connection, pid, notified_channel, payload) -> None:
+        try:
+            coalescer.add(parse_payload(payload))
+        except (ValueError, TypeError) as e:
+            logger.error(f"Ignoring malformed change notification: {str(e)}")
+            return
+        arrived.set()
+
+    def on_termination(connection) -> None:
+        arrived.set()
+
+    def open_store() -> MetricsStore:
+        nonlocal store
+        if store.connection.closed:
+            store = MetricsStore.connect(dsn)
+        return store
+
+    async def sleep_unless_stopped(seconds: float) -> None:
+        try:
+            await asyncio.wait_for(stop.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    # Recompute queries run through the synchronous store, one recompute at a time; the
+    # listener connection only receives notifications
+    store = MetricsStore.connect(dsn)
+    fx_client = FXClient.from_env()
+    listener = None
+    # Database time up to which notifications are known to have been received
+    checkpoint = None
+    heartbeat_due = 0.0
+    reconnect_delay = reconnect_seconds
+    try:
+        while not stop.is_set():
+            if listener is None or listener.is_closed():
+                if listener is not None:
+                    logger.warning(f"Lost the connection listening on '{channel}', reconnecting")
+                    listener = None
+                try:
+                    listener = await asyncpg.connect(dsn)
+                    await listener.add_listener(channel, on_notification)
+                    listener.add_termination_listener(on_termination)
+                    listened_from = await listener.fetchval("SELECT localtimestamp")
+                    if checkpoint is not None:
+                        missed = await loop.run_in_executor(
+                            None, open_store().changed_since, checkpoint - timedelta(seconds=catch_up_margin_seconds)
+                        )
+                        coalescer.add(missed)
+                        logger.info(f"Caught up on {len(missed)} companies changed while disconnected")
+                except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError, psycopg2.Error) as e:
+                    logger.error(f"Could not listen on '{channel}', retrying in {reconnect_delay:.0f}s: {str(e)}")
+                    if listener is not None and not listener.is_closed():
+                        await listener.close()
+                    listener = None
+                    await sleep_unless_stopped(reconnect_delay)
+                    reconnect_delay = min(reconnect_delay * 2, max_reconnect_seconds)
+                    continue
+                checkpoint = listened_from
+                heartbeat_due = loop.time() + heartbeat_seconds
+                reconnect_delay = reconnect_seconds
+                logger.info(f"Listening for metrics changes on '{channel}'")
+
+            next_due = coalescer.next_due()
+            timeout = 1.0 if next_due is None else max(0.0, next_due - coalescer.clock())
+            timeout = min(timeout, max(0.0, heartbeat_due - loop.time()))
+            arrived.clear()
+            try:
+                await asyncio.wait_for(arrived.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+            if loop.time() >= heartbeat_due and not listener.is_closed():
+                try:
+                    checkpoint = await listener.fetchval("SELECT localtimestamp")
+                except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                    logger.warning(f"Heartbeat on '{channel}' failed: {str(e)}")
+                    await listener.close()
+                heartbeat_due = loop.time() + heartbeat_seconds
+
+            batch = coalescer.pop_due()
+            if batch:
+                try:
+                    recomputed = await recompute(batch, sink, fx_client, open_store())
+                    coalescer.succeeded(batch)
+                    logger.info(f"Recomputed {len(batch)} companies, {recomputed} records saved")
+                except Exception as e:
+                    coalescer.requeue(batch)
+                    logger.error(f"Recompute of {len(batch)} companies failed, retrying with backoff: {str(e)}")
+    finally:
+        if listener is not None and not listener.is_closed():
+            await listener.remove_listener(channel, on_notification)
+            await listener.close()
+        await fx_client.close()
+        store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute derived metrics when metrics_input changes")
+    parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL"), help="PostgreSQL connection string")
+    parser.add_argument("--channel", default=CHANGE_EVENTS_CHANNEL, help="NOTIFY channel to listen on")
+    parser.add_argument("--output-queue", help="SQLite queue file recomputed records are also published to")
+    parser.add_argument("--quiet-seconds", type=float, default=2.0, help="Quiet window before a company is recomputed")
+    parser.add_argument("--max-delay-seconds", type=float, default=10.0, help="Longest a change waits for its recompute")
+    args = parser.parse_args()
+
+    sink = SQLiteQueue(args.output_queue) if args.output_queue else None
+    coalescer = ChangeCoalescer(args.quiet_seconds, args.max_delay_seconds)
+    try:
+        asyncio.run(run_listener(args.dsn, sink, args.channel, coalescer))
+    finally:
+        if sink is not None:
+            sink.close()
+
+
+if __name__ == "__main__":
+    main()
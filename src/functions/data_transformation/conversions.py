@@ -0,0 +1,287 @@
+"""
+Lazy currency materialization for transformed financial metrics.
+
+Converted copies of the numeric columns are only computed for the currencies a consumer
+actually asks for. The conversion factors into each of those currencies are cached once per
+process for the current FX snapshot version, so later batches reuse them and a new snapshot
+invalidates them.
+
+Rows reported in a currency the snapshot does not know are not convertible: their converted
+columns are NaN, and the rest of the batch is converted as usual.
+
+Converted columns are the only FX-dependent outputs of the pipeline: LTM sums, margins and
+per-FTE ratios are computed in the reporting currency. When FX rates are revised,
+``apply_fx_revision`` recomputes just those converted columns for the affected dates.
+
+Requirements Addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+      Convert reported financial metrics into the currencies required for reporting.
+"""
+
+import threading
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .fx_rates import FXSnapshot
+
+# Column stamped on every transformed row with the FX snapshot its conversions used
+FX_VERSION_COLUMN = 'fx_snapshot_version'
+
+
+def parse_currency_list(value: Optional[str]) -> List[str]:
+    """
+    Parse a comma separated list of currency codes, e.g. from an environment variable.
+
+    Args:
+        value (Optional[str]): Raw value such as "USD, CAD,eur".
+
+    Returns:
+        List[str]: Upper-cased, de-duplicated codes in their original order.
+    """
+    if not value:
+        return []
+    currencies = []
+    for code in value.split(','):
+        code = code.strip().upper()
+        if code and code not in currencies:
+            currencies.append(code)
+    return currencies
+
+
+class ConversionFactors:
+    """
+    Conversion factors into each requested currency, cached for the current FX snapshot.
+
+    A single instance, ``CONVERSION_FACTORS``, is shared by every batch the process transforms.
+    The factors into a currency are gathered from the snapshot matrix the first time a batch
+    asks for that currency and reused by later batches. Using a snapshot with another version
+    drops everything cached for the previous one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._factors: Dict[str, np.ndarray] = {}
+
+    @property
+    def version(self) -> Optional[str]:
+        """
+        Version of the snapshot the cached factors belong to.
+        """
+        return self._version
+
+    @property
+    def currencies(self) -> List[str]:
+        """
+        Currencies with cached factors, in the order they were first requested.
+        """
+        return list(self._factors)
+
+    def get(self, snapshot: FXSnapshot, currency: str) -> np.ndarray:
+        """
+        Return the factors converting each snapshot currency into ``currency``.
+
+        Args:
+            snapshot (FXSnapshot): FX snapshot to convert with.
+            currency (str): Target currency code.
+
+        Returns:
+            np.ndarray: Factors indexed like ``snapshot.currencies``.
+
+        Raises:
+            ValueError: If the currency is not part of the FX snapshot.
+        """
+        with self._lock:
+            if snapshot.version != self._version:
+                self._version = snapshot.version
+                self._factors = {}
+            factors = self._factors.get(currency)
+            if factors is None:
+                factors = np.ascontiguousarray(snapshot.matrix[:, snapshot.indices(currency)[0]])
+                self._factors[currency] = factors
+            return factors
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version = None
+            self._factors = {}
+
+
+# Shared by every transformation in the process
+CONVERSION_FACTORS = ConversionFactors()
+
+
+class CurrencyConversions:
+    """
+    Converted views of a metrics frame for the currencies a consumer requests.
+
+    Source currencies are only resolved against the snapshot once a conversion is requested.
+    Rows whose source currency is not part of the snapshot get NaN converted values.
+
+    Args:
+        df (pd.DataFrame): Metrics frame with a 'currency' column holding each row's source currency.
+        snapshot (FXSnapshot): FX snapshot used for conversions.
+        columns (Optional[Iterable[str]]): Columns to convert. Defaults to every numeric column.
+        factors (Optional[ConversionFactors]): Factor cache to use. Defaults to CONVERSION_FACTORS.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        snapshot: FXSnapshot,
+        columns: Optional[Iterable[str]] = None,
+        factors: Optional[ConversionFactors] = None,
+    ):
+        self.columns = list(columns) if columns is not None else list(df.select_dtypes(include=[np.number]).columns)
+        self.snapshot = snapshot
+        self._index = df.index
+        self._source_currencies = df['currency'].to_numpy(dtype=object)
+        self._convertible: Optional[np.ndarray] = None
+        self._source_indices: Optional[np.ndarray] = None
+        self._values = df[self.columns].to_numpy(dtype=np.float64)
+        self._factors = CONVERSION_FACTORS if factors is None else factors
+
+    @property
+    def convertible(self) -> np.ndarray:
+        """
+        Boolean mask of the rows whose source currency is part of the snapshot.
+        """
+        if self._convertible is None:
+            self._convertible = np.isin(self._source_currencies, self.snapshot.currencies)
+            self._source_indices = self.snapshot.indices(self._source_currencies[self._convertible])
+        return self._convertible
+
+    @property
+    def unknown_currencies(self) -> List[str]:
+        """
+        Source currencies that cannot be converted with the snapshot.
+        """
+        return sorted({str(code) for code in self._source_currencies[~self.convertible]})
+
+    def needs_conversion(self, currency: str) -> bool:
+        """
+        Whether any row is reported in a currency other than ``currency``.
+        """
+        return bool(np.any(self._source_currencies != currency))
+
+    def get(self, currency: str) -> pd.DataFrame:
+        """
+        Return the '<column>_<currency>' columns.
+
+        Args:
+            currency (str): Target currency code.
+
+        Returns:
+            pd.DataFrame: Converted columns aligned with the source frame.
+
+        Raises:
+            ValueError: If the target currency is not part of the FX snapshot.
+        """
+        convertible = self.convertible
+        factors = np.full(len(self._source_currencies), np.nan)
+        factors[convertible] = self._factors.get(self.snapshot, currency)[self._source_indices]
+        return pd.DataFrame(
+            self._values * factors[:, np.newaxis],
+            index=self._index,
+            columns=[f'{col}_{currency}' for col in self.columns],
+        )
+
+    def materialize(self, currencies: Iterable[str]) -> pd.DataFrame:
+        """
+        Build the converted columns for the requested currencies only.
+
+        Currencies every row is already reported in are skipped.
+
+        Args:
+            currencies (Iterable[str]): Target currencies requested by the consumer.
+
+        Returns:
+            pd.DataFrame: Converted columns for all requested currencies, possibly empty.
+        """
+        frames = [self.get(currency) for currency in currencies if self.needs_conversion(currency)]
+        if not frames:
+            return pd.DataFrame(index=self._index)
+        return pd.concat(frames, axis=1)
+
+
+def fx_dependencies(columns: Iterable[str], currencies: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+    """
+    Identify the FX-dependent output columns of a transformed frame.
+
+    A column depends on FX when it is named '<source column>_<currency>' for a known
+    currency and the source column is present.
+
+    Args:
+        columns (Iterable[str]): Columns of the transformed frame.
+        currencies (Iterable[str]): Currency codes known to the FX snapshot.
+
+    Returns:
+        Dict[str, Tuple[str, str]]: Converted column -> (source column, target currency).
+    """
+    columns = list(columns)
+    present = set(columns)
+    known_currencies = set(currencies)
+    dependencies = {}
+    for column in columns:
+        source, _, currency = column.rpartition('_')
+        if currency in known_currencies and source in present:
+            dependencies[column] = (source, currency)
+    return dependencies
+
+
+def apply_fx_revision(
+    df: pd.DataFrame,
+    snapshot: FXSnapshot,
+    affected_dates: Optional[Iterable[date]] = None,
+    date_column: str = 'fiscal_reporting_date',
+) -> pd.Index:
+    """
+    Recompute converted columns in place after an FX revision.
+
+    Only rows on the affected dates that were converted with a different snapshot are
+    touched, and only their FX-dependent columns are rewritten. FX-independent metrics
+    are left as they are. Rows reported in a currency the snapshot does not know are skipped.
+
+    Args:
+        df (pd.DataFrame): Previously transformed rows, including a 'currency' column.
+        snapshot (FXSnapshot): The revised FX snapshot.
+        affected_dates (Optional[Iterable[date]]): Dates the revision applies to. Defaults to
+            the snapshot's ``as_of`` date, or every date when that is unknown.
+        date_column (str): Column holding each row's reporting date. When the frame has no such
+            column, rows cannot be matched to the affected dates and every stale row is recomputed.
+
+    Returns:
+        pd.Index: Index labels of the rows that were recomputed.
+    """
+    if affected_dates is None and snapshot.as_of is not None:
+        affected_dates = [snapshot.as_of]
+
+    stale = pd.Series(True, index=df.index)
+    if FX_VERSION_COLUMN in df:
+        stale &= df[FX_VERSION_COLUMN] != snapshot.version
+    if affected_dates is not None and date_column in df:
+        revised = pd.to_datetime(pd.Series(list(affected_dates), dtype=object)).dt.normalize()
+        stale &= pd.to_datetime(df[date_column]).dt.normalize().isin(revised)
+
+    stale &= df['currency'].isin(snapshot.currencies)
+
+    rows = df.index[stale.to_numpy()]
+    dependencies = fx_dependencies(df.columns, snapshot.currencies)
+    if rows.empty or not dependencies:
+        return rows
+
+    source_indices = snapshot.indices(df.loc[rows, 'currency'])
+    by_currency: Dict[str, List[Tuple[str, str]]] = {}
+    for column, (source, currency) in dependencies.items():
+        by_currency.setdefault(currency, []).append((column, source))
+
+    for currency, pairs in by_currency.items():
+        factors = CONVERSION_FACTORS.get(snapshot, currency)[source_indices]
+        sources = df.loc[rows, [source for _, source in pairs]].to_numpy(dtype=np.float64)
+        df.loc[rows, [column for column, _ in pairs]] = sources * factors[:, np.newaxis]
+
+    df.loc[rows, FX_VERSION_COLUMN] = snapshot.version
+    return rows
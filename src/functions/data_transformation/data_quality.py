@@ -0,0 +1,122 @@
+"""
+Batch data-quality screening of incoming financial metrics.
+
+Every incoming row is checked against hard plausibility rules (e.g. negative employees or
+gross profit above total revenue) and scored against the company's own reporting history
+using grouped rolling statistics. The whole batch is screened with vectorized pandas
+operations, so screening keeps up with bulk uploads. Suspicious rows are flagged, not
+dropped, before transformation.
+
+Requirements Addressed:
+    - Data Consistency and Integrity (Technical Requirements/Feature 12: Data Consistency and Integrity)
+      Detect implausible financial submissions before they feed derived metrics.
+"""
+
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Metrics scored against each company's own history
+SCREENED_COLUMNS = ('total_revenue', 'gross_profit', 'employees', 'total_operating_expense', 'cash_burn')
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    # Missing columns screen as NaN, which never trips a rule
+    if name not in df:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[name], errors='coerce')
+
+
+PLAUSIBILITY_RULES: Dict[str, Callable[[pd.DataFrame], pd.Series]] = {
+    'negative_employees': lambda df: _column(df, 'employees') < 0,
+    'negative_revenue': lambda df: _column(df, 'total_revenue') < 0,
+    'negative_cash_balance': lambda df: _column(df, 'cash_balance') < 0,
+    'gross_profit_exceeds_revenue': lambda df: _column(df, 'gross_profit') > _column(df, 'total_revenue'),
+    'recurring_exceeds_total_revenue': lambda df: _column(df, 'recurring_revenue') > _column(df, 'total_revenue'),
+}
+
+
+def history_zscores(
+    incoming: pd.DataFrame,
+    history: Optional[pd.DataFrame] = None,
+    window: int = 8,
+    min_periods: int = 3,
+) -> pd.DataFrame:
+    """
+    Score incoming rows against the rolling mean and deviation of each company's prior periods.
+
+    Args:
+        incoming (pd.DataFrame): Rows to screen with 'company_id' and 'fiscal_reporting_date'.
+        history (Optional[pd.DataFrame]): Previously accepted rows for the same companies.
+        window (int): Number of prior periods in the rolling window.
+        min_periods (int): Prior periods required before a row is scored.
+
+    Returns:
+        pd.DataFrame: Z-scores per screened column, indexed like ``incoming``; NaN where a
+        company has too little history or no variation.
+    """
+    columns = [col for col in SCREENED_COLUMNS if col in incoming]
+    keys = ['company_id', 'fiscal_reporting_date']
+    if not columns or not all(key in incoming for key in keys):
+        return pd.DataFrame(index=incoming.index)
+
+    frames = []
+    if history is not None and not history.empty:
+        frames.append(history[keys + columns].assign(_row=-1))
+    frames.append(incoming[keys + columns].assign(_row=np.arange(len(incoming))))
+    combined = pd.concat(frames, ignore_index=True)
+    combined['fiscal_reporting_date'] = pd.to_datetime(combined['fiscal_reporting_date'])
+    combined = combined.sort_values(keys, kind='stable')
+
+    companies = combined['company_id']
+    values = combined[columns].apply(pd.to_numeric, errors='coerce')
+    # Exclude the row itself so an outlier cannot mask itself
+    prior = values.groupby(companies, sort=False).shift(1)
+    rolling = prior.groupby(companies, sort=False).rolling(window, min_periods=min_periods)
+    mean = rolling.mean().reset_index(level=0, drop=True)
+    std = rolling.std().reset_index(level=0, drop=True)
+    zscores = (values - mean) / std.where(std > 0)
+
+    incoming_rows = combined['_row'].to_numpy() >= 0
+    zscores = zscores[incoming_rows]
+    zscores.index = incoming.index[combined['_row'].to_numpy()[incoming_rows]]
+    return zscores.reindex(incoming.index)
+
+
+def screen_metrics(
+    incoming: pd.DataFrame,
+    history: Optional[pd.DataFrame] = None,
+    window: int = 8,
+    min_periods: int = 3,
+    z_threshold: float = 4.0,
+) -> pd.DataFrame:
+    """
+    Screen a batch of incoming metrics and flag suspicious rows.
+
+    Args:
+        incoming (pd.DataFrame): Rows to screen.
+        history (Optional[pd.DataFrame]): Previously accepted rows for the same companies. Rows of
+            the batch itself also count as history for later periods of the same company.
+        window (int): Number of prior periods in the rolling window.
+        min_periods (int): Prior periods required before a row is scored.
+        z_threshold (float): Absolute z-score above which a metric is an outlier.
+
+    Returns:
+        pd.DataFrame: Indexed like ``incoming`` with 'dq_flags' (comma separated rule names),
+        'dq_score' (largest absolute z-score) and 'dq_suspicious' columns.
+    """
+    checks = pd.DataFrame({name: rule(incoming) for name, rule in PLAUSIBILITY_RULES.items()}, index=incoming.index)
+
+    zscores = history_zscores(incoming, history, window, min_periods)
+    for column in zscores.columns:
+        checks[f'{column}_outlier'] = zscores[column].abs() > z_threshold
+
+    checks = checks.fillna(False).astype(bool)
+    flags = checks.dot(checks.columns + ',').str.rstrip(',')
+    score = zscores.abs().max(axis=1) if not zscores.columns.empty else pd.Series(np.nan, index=incoming.index)
+    return pd.DataFrame({
+        'dq_flags': flags,
+        'dq_score': score.fillna(0.0),
+        'dq_suspicious': checks.any(axis=1),
+    }, index=incoming.index)
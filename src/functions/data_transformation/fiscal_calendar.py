@@ -0,0 +1,132 @@
+"""
+Fiscal to calendar quarter alignment for portfolio rollups.
+
+Portfolio companies report on their own fiscal years, defined by ``Company.year_end_date``.
+The mapping from (fiscal year end month, fiscal quarter) to calendar quarter is fixed, so it
+is precomputed once as a small lookup table and applied to whole columns with NumPy gathers
+instead of per-row date arithmetic.
+
+Fiscal years are labelled by the calendar year in which they end, and a fiscal quarter is
+assigned to the calendar quarter containing its last month.
+
+Requirements Addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+      Align financial metrics from mixed fiscal years for portfolio-level reporting.
+"""
+
+from typing import Iterable, List, Mapping, Union
+
+import numpy as np
+import pandas as pd
+
+
+def build_fiscal_calendar() -> pd.DataFrame:
+    """
+    Build the fiscal calendar table for every possible fiscal year end month.
+
+    Returns:
+        pd.DataFrame: One row per (year_end_month, fiscal_quarter) with the calendar quarter
+        holding the fiscal quarter end, its end month and the offset from fiscal to calendar year.
+    """
+    year_end_months = np.repeat(np.arange(1, 13), 4)
+    fiscal_quarters = np.tile(np.arange(1, 5), 12)
+    end_months = (year_end_months + 3 * fiscal_quarters - 1) % 12 + 1
+    return pd.DataFrame({
+        'year_end_month': year_end_months,
+        'fiscal_quarter': fiscal_quarters,
+        'quarter_end_month': end_months,
+        'calendar_quarter': (end_months - 1) // 3 + 1,
+        # Quarters ending after the year-end month fall in the previous calendar year
+        'calendar_year_offset': np.where(end_months > year_end_months, -1, 0),
+    })
+
+
+FISCAL_CALENDAR = build_fiscal_calendar()
+
+# Dense (year_end_month, fiscal_quarter) lookups; row/column 0 are unused padding
+_CALENDAR_QUARTER = np.zeros((13, 5), dtype=np.int64)
+_CALENDAR_YEAR_OFFSET = np.zeros((13, 5), dtype=np.int64)
+_CALENDAR_QUARTER[FISCAL_CALENDAR['year_end_month'], FISCAL_CALENDAR['fiscal_quarter']] = FISCAL_CALENDAR['calendar_quarter']
+_CALENDAR_YEAR_OFFSET[FISCAL_CALENDAR['year_end_month'], FISCAL_CALENDAR['fiscal_quarter']] = FISCAL_CALENDAR['calendar_year_offset']
+
+
+def align_calendar_quarters(
+    df: pd.DataFrame,
+    year_end_dates: Union[Mapping, pd.Series],
+    company_column: str = 'company_id',
+    strict: bool = True,
+) -> pd.DataFrame:
+    """
+    Add 'fiscal_year', 'calendar_year' and 'calendar_quarter' columns to a metrics frame.
+
+    Args:
+        df (pd.DataFrame): Metrics with company ids, 'fiscal_reporting_date' and 'fiscal_reporting_quarter'.
+        year_end_dates (Union[Mapping, pd.Series]): Company id -> ``Company.year_end_date``.
+        company_column (str): Column holding the company id.
+        strict (bool): When False, rows that cannot be aligned (unknown year end, missing or
+            out-of-range fiscal period) get null alignment columns instead of raising.
+
+    Returns:
+        pd.DataFrame: The input frame with the calendar alignment columns added.
+
+    Raises:
+        ValueError: If ``strict`` and a company has no fiscal year end or a fiscal quarter is out of range.
+    """
+    if not strict:
+        return _align_known(df, year_end_dates, company_column)
+
+    year_end_months = pd.to_datetime(df[company_column].map(year_end_dates)).dt.month
+    if year_end_months.isna().any():
+        missing = sorted(df.loc[year_end_months.isna(), company_column].astype(str).unique())
+        raise ValueError(f"No fiscal year end date for companies: {', '.join(missing)}")
+
+    fiscal_quarters = df['fiscal_reporting_quarter'].to_numpy(dtype=np.int64)
+    if np.any((fiscal_quarters < 1) | (fiscal_quarters > 4)):
+        raise ValueError("fiscal_reporting_quarter must be between 1 and 4")
+
+    months = year_end_months.to_numpy(dtype=np.int64)
+    reporting_dates = pd.to_datetime(df['fiscal_reporting_date'])
+    # The fiscal year ends in the first year-end month on or after the reporting date
+    fiscal_years = reporting_dates.dt.year.to_numpy() + (reporting_dates.dt.month.to_numpy() > months)
+
+    df['fiscal_year'] = fiscal_years
+    df['calendar_year'] = fiscal_years + _CALENDAR_YEAR_OFFSET[months, fiscal_quarters]
+    df['calendar_quarter'] = _CALENDAR_QUARTER[months, fiscal_quarters]
+    return df
+
+
+def _align_known(df: pd.DataFrame, year_end_dates: Union[Mapping, pd.Series], company_column: str) -> pd.DataFrame:
+    aligned = pd.Series(False, index=df.index)
+    if {company_column, 'fiscal_reporting_date', 'fiscal_reporting_quarter'}.issubset(df.columns):
+        quarters = pd.to_numeric(df['fiscal_reporting_quarter'], errors='coerce')
+        aligned = (
+            df[company_column].map(year_end_dates).notna()
+            & pd.to_datetime(df['fiscal_reporting_date'], errors='coerce').notna()
+            & quarters.between(1, 4)
+        )
+
+    for column in ('fiscal_year', 'calendar_year', 'calendar_quarter'):
+        df[column] = pd.array([pd.NA] * len(df), dtype='Int64')
+    if aligned.any():
+        known = df.loc[aligned, [company_column, 'fiscal_reporting_date']].copy()
+        known['fiscal_reporting_quarter'] = quarters[aligned].astype(np.int64)
+        known = align_calendar_quarters(known, year_end_dates, company_column)
+        for column in ('fiscal_year', 'calendar_year', 'calendar_quarter'):
+            df.loc[aligned, column] = known[column].to_numpy()
+    return df
+
+
+def aggregate_by_calendar_quarter(df: pd.DataFrame, columns: Iterable[str], by: List[str] = None) -> pd.DataFrame:
+    """
+    Sum metrics across companies by calendar quarter after alignment.
+
+    Args:
+        df (pd.DataFrame): Frame returned by ``align_calendar_quarters``.
+        columns (Iterable[str]): Additive metrics to aggregate.
+        by (List[str], optional): Extra grouping keys, e.g. ['currency'] or ['fund'].
+
+    Returns:
+        pd.DataFrame: One row per calendar quarter (and extra keys) with summed metrics.
+    """
+    keys = list(by or []) + ['calendar_year', 'calendar_quarter']
+    return df.groupby(keys, sort=True)[list(columns)].sum().reset_index()
@@ -0,0 +1,276 @@
+"""
+Client for the foreign exchange rates API.
+
+A single ``aiohttp`` session with a bounded connection pool is kept for the lifetime of
+the client. Every request has strict connect/total timeouts and transient failures are
+retried with jittered exponential backoff. Concurrent requests for the same snapshot are
+coalesced onto one in-flight fetch, so a burst of transformations costs a single API call.
+
+Synchronous callers such as the timer and HTTP triggers use ``get_snapshot_blocking``, which
+applies the same timeouts, retry policy and payload checks through a pooled ``requests``
+session that is likewise kept for the lifetime of the client. ``requests`` only bounds each
+socket read, so the blocking path enforces the per-attempt deadline itself: a response still
+trickling in when the deadline passes is closed and the attempt counts as timed out.
+
+Requirements Addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+      Automate the retrieval of foreign exchange rates without stalling the transformation pipeline.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import date
+from typing import Dict, Optional
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from .fx_rates import FXSnapshot
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying; anything else in the 4xx range is a caller error
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class FXClientError(Exception):
+    """
+    Raised when FX rates cannot be retrieved after exhausting retries, or the response is malformed.
+    """
+
+
+def parse_snapshot(fx_data, as_of: Optional[date] = None) -> FXSnapshot:
+    """
+    Build a snapshot from a decoded FX rates response.
+
+    Args:
+        fx_data: Decoded JSON body, expected to hold a ``rates`` mapping.
+        as_of (Optional[date]): Date the rates apply to.
+
+    Returns:
+        FXSnapshot: Cross-rate table for the rates.
+
+    Raises:
+        FXClientError: If the payload has no usable ``rates`` mapping.
+    """
+    try:
+        return FXSnapshot.from_rates(fx_data['rates'], as_of=as_of)
+    except (KeyError, TypeError, ValueError) as e:
+        raise FXClientError(f"Malformed FX rates response: {e!r}") from e
+
+
+class FXClient:
+    """
+    Pooled asyncio client for the FX rates API.
+
+    Args:
+        url (str): FX rates endpoint.
+        api_key (Optional[str]): Bearer token for the API.
+        timeout (float): Total seconds allowed per attempt.
+        connect_timeout (float): Seconds allowed to establish a connection.
+        max_retries (int): Retries after the first attempt for transient failures.
+        backoff_base (float): Base delay in seconds for exponential backoff.
+        backoff_max (float): Upper bound for a single backoff delay.
+        pool_size (int): Maximum number of pooled connections.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        api_key: Optional[str] = None,
+        timeout: float = 5.0,
+        connect_timeout: float = 2.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.25,
+        backoff_max: float = 5.0,
+        pool_size: int = 10,
+    ):
+        self.url = url
+        self.api_key = api_key
+        self.timeout = aiohttp.ClientTimeout(total=timeout, connect=connect_timeout)
+        self.total_timeout = timeout
+        # requests applies these per connect and per socket read; the connect and the wait for the
+        # headers together fit in the attempt, whose deadline also bounds reading the body
+        connect_timeout = min(connect_timeout, timeout)
+        self.blocking_timeout = (connect_timeout, max(timeout - connect_timeout, connect_timeout))
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._blocking_session: Optional[requests.Session] = None
+        self._blocking_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'FXClient':
+        """
+        Build a client from the function's environment variables.
+        """
+        return cls(
+            url=os.environ.get("FX_RATES_API_URL", "https://api.exchangerates.example.com/latest"),
+            api_key=os.environ.get("FX_RATES_API_KEY"),
+            timeout=float(os.environ.get("FX_RATES_TIMEOUT_SECONDS", "5")),
+            max_retries=int(os.environ.get("FX_RATES_MAX_RETRIES", "3")),
+        )
+
+    async def __aenter__(self) -> 'FXClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so the session binds to the running event loop
+        if self._session is None or self._session.closed:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else None
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=self.timeout,
+                headers=headers,
+            )
+        return self._session
+
+    def _get_blocking_session(self) -> requests.Session:
+        with self._blocking_lock:
+            if self._blocking_session is None:
+                session = requests.Session()
+                # Retries are made by get_snapshot_blocking, with backoff, not by urllib3
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                if self.api_key:
+                    session.headers["Authorization"] = f"Bearer {self.api_key}"
+                self._blocking_session = session
+            return self._blocking_session
+
+    async def close(self) -> None:
+        """
+        Close the pooled sessions and their connections.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self.close_blocking()
+
+    def close_blocking(self) -> None:
+        """
+        Close the pooled session used by ``get_snapshot_blocking``.
+        """
+        with self._blocking_lock:
+            if self._blocking_session is not None:
+                self._blocking_session.close()
+            self._blocking_session = None
+
+    async def get_snapshot(self, as_of: Optional[date] = None) -> FXSnapshot:
+        """
+        Fetch FX rates and return them as a precomputed snapshot.
+
+        Concurrent calls for the same ``as_of`` share one request.
+
+        Args:
+            as_of (Optional[date]): Date of the rates to fetch; latest when omitted.
+
+        Returns:
+            FXSnapshot: Cross-rate table for the fetched rates.
+
+        Raises:
+            FXClientError: If the rates cannot be fetched.
+        """
+        key = as_of.isoformat() if as_of else 'latest'
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_with_retry(as_of))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled waiter does not cancel the fetch shared by the others
+        return await asyncio.shield(task)
+
+    async def _fetch_with_retry(self, as_of: Optional[date]) -> FXSnapshot:
+        attempt = 0
+        while True:
+            try:
+                return await self._fetch(as_of)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if isinstance(e, aiohttp.ClientResponseError) and e.status not in RETRYABLE_STATUSES:
+                    raise FXClientError(f"FX rates request rejected with status {e.status}") from e
+                if attempt >= self.max_retries:
+                    raise FXClientError(f"FX rates request failed after {attempt + 1} attempts: {e!r}") from e
+                delay = self._backoff(attempt)
+                logger.warning(f"FX rates request failed ({e!r}); retrying in {delay:.2f}s")
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def _fetch(self, as_of: Optional[date]) -> FXSnapshot:
+        params = {"date": as_of.isoformat()} if as_of else None
+        async with self._get_session().get(self.url, params=params) as response:
+            response.raise_for_status()
+            try:
+                fx_data = await response.json()
+            except ValueError as e:
+                raise FXClientError(f"Malformed FX rates response: {e!r}") from e
+        return parse_snapshot(fx_data, as_of)
+
+    def get_snapshot_blocking(self, as_of: Optional[date] = None) -> FXSnapshot:
+        """
+        Synchronous variant of ``get_snapshot`` for callers without an event loop.
+
+        Args:
+            as_of (Optional[date]): Date of the rates to fetch; latest when omitted.
+
+        Returns:
+            FXSnapshot: Cross-rate table for the fetched rates.
+
+        Raises:
+            FXClientError: If the rates cannot be fetched.
+        """
+        params = {"date": as_of.isoformat()} if as_of else None
+        attempt = 0
+        while True:
+            try:
+                body = self._fetch_blocking(params)
+                try:
+                    fx_data = json.loads(body)
+                except ValueError as e:
+                    raise FXClientError(f"Malformed FX rates response: {e!r}") from e
+                return parse_snapshot(fx_data, as_of)
+            except requests.RequestException as e:
+                status = e.response.status_code if e.response is not None else None
+                if status is not None and status not in RETRYABLE_STATUSES:
+                    raise FXClientError(f"FX rates request rejected with status {status}") from e
+                if attempt >= self.max_retries:
+                    raise FXClientError(f"FX rates request failed after {attempt + 1} attempts: {e!r}") from e
+                delay = self._backoff(attempt)
+                logger.warning(f"FX rates request failed ({e!r}); retrying in {delay:.2f}s")
+                attempt += 1
+                time.sleep(delay)
+
+    def _fetch_blocking(self, params: Optional[Dict[str, str]]) -> bytes:
+        deadline = time.monotonic() + self.total_timeout
+        session = self._get_blocking_session()
+        with session.get(self.url, params=params, timeout=self.blocking_timeout, stream=True) as response:
+            response.raise_for_status()
+            # A body trickling in never trips the per-read timeout; drop the connection at the deadline
+            watchdog = threading.Timer(max(deadline - time.monotonic(), 0.0), response.close)
+            watchdog.start()
+            try:
+                body = response.content
+            except Exception:
+                # Reading a response the watchdog closed fails in various ways
+                if time.monotonic() < deadline:
+                    raise
+            finally:
+                watchdog.cancel()
+        if time.monotonic() >= deadline:
+            raise requests.Timeout(f"FX rates response not received within {self.total_timeout}s")
+        return body
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter keeps retrying functions from hammering the API in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
@@ -0,0 +1,143 @@
+"""
+Foreign exchange snapshot handling for the data transformation function.
+
+Each set of rates fetched from the FX API is turned once into an ``FXSnapshot``: a dense
+N x N cross-rate matrix together with a currency -> index map and a version id derived
+from the rates themselves. Currency conversions are then plain NumPy gathers against the
+matrix, so a batch with mixed source currencies is converted with a single indexed lookup
+instead of per-row dictionary access.
+
+Requirements Addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+      Automate the retrieval of foreign exchange rates and their application to financial metrics.
+"""
+
+import hashlib
+from datetime import date
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+CurrencyCodes = Union[str, Sequence[str], pd.Series, np.ndarray]
+
+
+class FXSnapshot:
+    """
+    Immutable cross-rate table built from a single FX rates response.
+
+    ``matrix[i, j]`` is the factor converting an amount in ``currencies[i]`` into
+    ``currencies[j]``.
+
+    Attributes:
+        currencies (List[str]): Currency codes in matrix order.
+        index (Dict[str, int]): Mapping from currency code to matrix row/column.
+        matrix (np.ndarray): Dense cross-rate matrix of shape (N, N).
+        version (str): Content-derived identifier of the rates used to build the matrix.
+        as_of (Optional[date]): Date the rates apply to, when known.
+    """
+
+    __slots__ = ('currencies', 'index', 'matrix', 'version', 'as_of', '_codes')
+
+    def __init__(self, currencies: Sequence[str], matrix: np.ndarray, version: str, as_of: Optional[date] = None):
+        self.currencies = list(currencies)
+        self.index = {currency: position for position, currency in enumerate(self.currencies)}
+        self.matrix = matrix
+        self.matrix.setflags(write=False)
+        self.version = version
+        self.as_of = as_of
+        self._codes = pd.Index(self.currencies)
+
+    @classmethod
+    def from_rates(cls, rates: Dict[str, float], as_of: Optional[date] = None) -> 'FXSnapshot':
+        """
+        Build a snapshot from an FX API ``rates`` mapping.
+
+        Args:
+            rates (Dict[str, float]): Units of each currency per one unit of the API base currency.
+            as_of (Optional[date]): Date the rates apply to.
+
+        Returns:
+            FXSnapshot: The precomputed cross-rate table.
+
+        Raises:
+            ValueError: If the mapping is empty or contains non-positive rates.
+        """
+        if not rates:
+            raise ValueError("Cannot build an FX snapshot from an empty rates mapping")
+
+        currencies = sorted(rates)
+        values = np.array([float(rates[currency]) for currency in currencies], dtype=np.float64)
+        if not np.all(np.isfinite(values)) or np.any(values <= 0):
+            raise ValueError("FX rates must be finite and positive")
+
+        # Converting from i to j multiplies by rate[j] / rate[i]
+        matrix = np.outer(1.0 / values, values)
+        return cls(currencies, matrix, _rates_version(currencies, values), as_of)
+
+    def indices(self, codes: CurrencyCodes) -> np.ndarray:
+        """
+        Map currency codes to matrix positions in one vectorized lookup.
+
+        Args:
+            codes: A single currency code or an array-like of codes.
+
+        Returns:
+            np.ndarray: Integer positions into ``matrix``.
+
+        Raises:
+            ValueError: If any code is not part of the snapshot.
+        """
+        labels = np.atleast_1d(np.asarray(codes, dtype=object))
+        positions = self._codes.get_indexer(labels)
+        if np.any(positions < 0):
+            unknown = sorted({str(code) for code in labels[positions < 0]})
+            raise ValueError(f"Unknown currency code(s) for FX snapshot {self.version}: {', '.join(unknown)}")
+        return positions
+
+    def cross_rates(self, source: CurrencyCodes, target: CurrencyCodes) -> np.ndarray:
+        """
+        Gather conversion factors for (source, target) pairs.
+
+        Args:
+            source: Source currency code(s).
+            target: Target currency code(s), broadcast against ``source``.
+
+        Returns:
+            np.ndarray: Conversion factors, one per pair.
+        """
+        return self.matrix[self.indices(source), self.indices(target)]
+
+    def convert(self, amounts: Union[np.ndarray, pd.Series, float], source: CurrencyCodes, target: CurrencyCodes) -> np.ndarray:
+        """
+        Convert amounts from their source currencies into the target currency.
+
+        Args:
+            amounts: Amounts expressed in ``source``; a 2-D array converts several columns at once.
+            source: Source currency code(s), one per row of ``amounts``.
+            target: Target currency code(s).
+
+        Returns:
+            np.ndarray: Converted amounts with the shape of ``amounts``.
+        """
+        values = np.asarray(amounts, dtype=np.float64)
+        factors = self.cross_rates(source, target)
+        if values.ndim == 2:
+            factors = factors[:, np.newaxis]
+        return values * factors
+
+    def __contains__(self, currency: str) -> bool:
+        return currency in self.index
+
+    def __repr__(self) -> str:
+        return f"FXSnapshot(version={self.version!r}, currencies={len(self.currencies)}, as_of={self.as_of!r})"
+
+
+def _rates_version(currencies: Iterable[str], values: np.ndarray) -> str:
+    """
+    Derive a stable version id from the rates so identical responses share an id.
+    """
+    digest = hashlib.sha1()
+    for currency, value in zip(currencies, values):
+        digest.update(f"{currency}={value!r};".encode('utf-8'))
+    return digest.hexdigest()[:16]
@@ -1,10 +1,25 @@
 import azure.functions as func
-import requests
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict
+import json
+import math
+import time
+from datetime import date
+from typing import Dict, List, Optional
 import os
+import psycopg2
+
+from .conversions import FX_VERSION_COLUMN, CurrencyConversions, apply_fx_revision, parse_currency_list
+from .data_quality import screen_metrics
+from .fiscal_calendar import align_calendar_quarters
+from .fx_client import FXClient, FXClientError
+from .fx_rates import FXSnapshot
+from .metrics_store import DATABASE_URL, ChangeEvent, MetricsInputBacklog, MetricsStore, open_store
+from .parallel import run_partitioned
+from .queues import MessageConsumer, MessagePublisher, OutputBindingQueue
+from .runway_projection import project_runway
+from .scheduling import AdaptiveScheduler, drain_backlog
 
 # External library versions (for reference)
 # azure-functions==1.11.2
@@ -18,27 +33,83 @@ logger = logging.getLogger(__name__)
 
 # Global constants
 FUNCTION_NAME = "data_transformation"
-FX_RATES_API_URL = os.environ.get("FX_RATES_API_URL", "https://api.exchangerates.example.com/latest")
-FX_RATES_API_KEY = os.environ.get("FX_RATES_API_KEY")
+TARGET_CURRENCIES = parse_currency_list(os.environ.get("TARGET_CURRENCIES", "USD,CAD"))
+BACKLOG_SETTLE_SECONDS = float(os.environ.get("TRANSFORMATION_BACKLOG_SETTLE_SECONDS", 300))
+TIME_BUDGET_SECONDS = float(os.environ.get("TRANSFORMATION_TIME_BUDGET_SECONDS", 240))
+TRANSFORMATION_WORKERS = int(os.environ.get("TRANSFORMATION_WORKERS", 1))
+
+# Monte Carlo paths per company for the cash-out projection of each company's latest period (0 disables
+# it). Scenarios are simulated in chunks of at most RUNWAY_CHUNK_ELEMENTS company-scenario-months.
+RUNWAY_SCENARIOS = int(os.environ.get("TRANSFORMATION_RUNWAY_SCENARIOS", 1000))
+RUNWAY_HORIZON_MONTHS = 60
+RUNWAY_CHUNK_ELEMENTS = 2_000_000
+
+# Errors caused by a row's content rather than by an unavailable dependency; backlog rows that
+# still raise one when transformed on their own are dead-lettered instead of retried forever
+BAD_RECORD_ERRORS = (ValueError, KeyError, TypeError, ArithmeticError, psycopg2.DataError, psycopg2.IntegrityError)
+
+# Shared across warm invocations so the idle backoff survives between timer ticks
+SCHEDULER = AdaptiveScheduler.from_env()
 
-def get_fx_rates() -> Dict[str, float]:
+# FX rates API client with request timeouts and retry backoff (FX_RATES_* variables)
+FX_CLIENT = FXClient.from_env()
+
+# How often the timer checks the FX rates for a revision of the saved conversions, and how many
+# company periods each refresh query reconverts
+FX_REFRESH_SECONDS = float(os.environ.get("TRANSFORMATION_FX_REFRESH_SECONDS", 3600))
+FX_REFRESH_BATCH_SIZE = 500
+_fx_refresh_due_at = 0.0
+_fx_version_applied: Optional[str] = None
+
+# Without a metrics database the timer keeps the original five-minute cadence for its mock run
+FALLBACK_INTERVAL_SECONDS = 300.0
+_fallback_due_at = 0.0
+
+def get_fx_snapshot() -> FXSnapshot:
     """
-    Retrieve the latest foreign exchange rates using the requests library.
+    Fetch the latest FX rates and precompute their cross-rate table.
+    
+    The request goes through FX_CLIENT, so it is bounded by its timeouts and transient
+    failures are retried with backoff.
     
     Returns:
-        Dict[str, float]: A dictionary of currency codes and their exchange rates.
+        FXSnapshot: Cross-rate matrix, currency index and version id for the fetched rates.
     
     Raises:
-        requests.RequestException: If there's an error fetching the FX rates.
+        FXClientError: If the rates cannot be fetched.
     """
     try:
-        response = requests.get(FX_RATES_API_URL, headers={"Authorization": f"Bearer {FX_RATES_API_KEY}"})
-        response.raise_for_status()
-        fx_data = response.json()
-        return fx_data['rates']
-    except requests.RequestException as e:
+        snapshot = FX_CLIENT.get_snapshot_blocking()
+    except FXClientError as e:
         logger.error(f"Error fetching FX rates: {str(e)}")
         raise
+    logger.info(f"Loaded FX snapshot {snapshot.version} with {len(snapshot.currencies)} currencies")
+    return snapshot
+
+def convert_currencies(df: pd.DataFrame, snapshot: FXSnapshot, target_currencies: List[str]) -> pd.DataFrame:
+    """
+    Add converted copies of every numeric column for each requested target currency.
+    
+    Rows may carry different source currencies; the conversion factors for a target are
+    gathered from the snapshot matrix in a single indexed lookup. Only the requested
+    currencies are computed. Rows in a currency the snapshot does not know get NaN
+    converted values instead of failing the batch.
+    
+    Args:
+        df (pd.DataFrame): Input metrics with a 'currency' column.
+        snapshot (FXSnapshot): FX snapshot to convert with.
+        target_currencies (List[str]): Currencies to add converted columns for.
+    
+    Returns:
+        pd.DataFrame: The input DataFrame with '<column>_<currency>' columns added.
+    """
+    conversions = CurrencyConversions(df, snapshot)
+    converted = conversions.materialize(target_currencies)
+    if converted.columns.empty:
+        return df
+    if conversions.unknown_currencies:
+        logger.warning(f"Not converting rows in currencies missing from FX snapshot {snapshot.version}: {', '.join(conversions.unknown_currencies)}")
+    return pd.concat([df, converted], axis=1)
 
 def calculate_derivative_metrics(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -54,8 +125,12 @@ def calculate_derivative_metrics(df: pd.DataFrame) -> pd.DataFrame:
     df['recurring_percentage_revenue'] = df['recurring_revenue'] / df['total_revenue'] * 100
     df['revenue_per_fte'] = df['total_revenue'] / df['employees']
     df['gross_profit_per_fte'] = df['gross_profit'] / df['employees']
-    df['change_in_cash'] = df['cash_balance'] - df['cash_balance'].shift(1)
-    df['revenue_growth'] = (df['total_revenue'] - df['total_revenue'].shift(1)) / df['total_revenue'].shift(1) * 100
+    # Period-over-period metrics must not cross company boundaries in a batch
+    previous = df.groupby('company_id', sort=False) if 'company_id' in df else df
+    previous_cash_balance = previous['cash_balance'].shift(1)
+    previous_total_revenue = previous['total_revenue'].shift(1)
+    df['change_in_cash'] = df['cash_balance'] - previous_cash_balance
+    df['revenue_growth'] = (df['total_revenue'] - previous_total_revenue) / previous_total_revenue * 100
     df['monthly_cash_burn'] = -df['cash_burn'] / 3  # Assuming quarterly data
     df['runway_months'] = np.where(df['monthly_cash_burn'] > 0, df['cash_balance'] / df['monthly_cash_burn'], np.inf)
     
@@ -66,37 +141,268 @@ def calculate_derivative_metrics(df: pd.DataFrame) -> pd.DataFrame:
     
     return df
 
+def add_runway_projection(df: pd.DataFrame, n_scenarios: Optional[int] = None, seed: Optional[int] = None) -> pd.DataFrame:
+    """
+    Adds the simulated cash-out distribution of each company to its latest period in the batch.
+    
+    The projection starts from the period's fiscal reporting date and cash balance. Earlier periods
+    and companies without a cash balance get null projection columns.
+    
+    Args:
+        df (pd.DataFrame): Records with derivative metrics.
+        n_scenarios (int, optional): Paths per company. Defaults to RUNWAY_SCENARIOS.
+        seed (int, optional): Seed for reproducible simulations.
+    
+    Returns:
+        pd.DataFrame: The records with the 'cash_out_*' columns of ``summarize_cash_out``.
+    """
+    n_scenarios = RUNWAY_SCENARIOS if n_scenarios is None else n_scenarios
+    if not n_scenarios or not {'company_id', 'fiscal_reporting_date', 'cash_balance'} <= set(df.columns):
+        return df
+    periods = pd.to_datetime(df['fiscal_reporting_date'])
+    latest = df[(periods == periods.groupby(df['company_id']).transform('max')) & df['cash_balance'].notna()]
+    latest = latest.drop_duplicates('company_id', keep='last')
+    if latest.empty:
+        return df
+    chunk_size = max(1, RUNWAY_CHUNK_ELEMENTS // (len(latest) * RUNWAY_HORIZON_MONTHS))
+    projection = project_runway(
+        latest,
+        n_scenarios=n_scenarios,
+        horizon_months=RUNWAY_HORIZON_MONTHS,
+        chunk_size=min(chunk_size, n_scenarios),
+        seed=seed,
+    )
+    projection = projection.reindex(latest['company_id']).set_axis(latest.index)
+    return df.join(projection)
+
+def transform_records(
+    records: List[Dict],
+    snapshot: FXSnapshot = None,
+    target_currencies: Optional[List[str]] = None,
+    year_end_dates: Optional[Dict] = None,
+    history: Optional[pd.DataFrame] = None,
+    workers: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Transforms a batch of financial metrics records, converting currencies and calculating derivative metrics.
+    
+    Args:
+        records (List[Dict]): Input financial metrics records, possibly in different source currencies.
+        snapshot (FXSnapshot, optional): FX snapshot to convert with. The latest rates are fetched when omitted.
+        target_currencies (List[str], optional): Currencies the consumer needs converted columns for.
+            Nothing is converted when omitted.
+        year_end_dates (Dict, optional): Company id -> Company.year_end_date. Records are tagged with the
+            calendar year and quarter of their fiscal quarter for portfolio rollups; those of companies
+            missing from the mapping get null calendar columns.
+        history (pd.DataFrame, optional): Previously accepted metrics for the same companies, used to
+            screen incoming rows against each company's own history.
+        workers (int, optional): Worker processes for derivative metrics. Defaults to TRANSFORMATION_WORKERS;
+            large batches are handed to the workers through shared memory.
+    
+    Returns:
+        List[Dict]: Transformed records in input order.
+    """
+    if snapshot is None:
+        snapshot = get_fx_snapshot()
+    
+    # Load input financial metrics data using pandas
+    df = pd.DataFrame(records)
+    
+    # Flag implausible submissions before they feed the transformation
+    screening = screen_metrics(df, history)
+    suspicious = int(screening['dq_suspicious'].sum())
+    if suspicious:
+        logger.warning(f"Data quality screening flagged {suspicious} of {len(df)} records")
+    
+    # Perform currency conversion against the snapshot's cross-rate matrix
+    df = convert_currencies(df, snapshot, target_currencies or [])
+    
+    # Calculate derivative metrics, in parallel for large batches
+    workers = TRANSFORMATION_WORKERS if workers is None else workers
+    if workers > 1:
+        df = run_partitioned(df, calculate_derivative_metrics, workers=workers)
+    else:
+        df = calculate_derivative_metrics(df)
+    
+    # Project the cash-out date distribution from each company's latest period for the dashboard
+    df = add_runway_projection(df)
+    
+    # Map fiscal quarters onto calendar quarters so mixed fiscal years can be aggregated;
+    # rows of companies without a known year end keep null calendar columns
+    df = align_calendar_quarters(df, year_end_dates or {}, strict=False)
+    unaligned = int(df['calendar_quarter'].isna().sum())
+    if unaligned:
+        logger.warning(f"No calendar quarter for {unaligned} of {len(df)} records without a known fiscal year end or period")
+    
+    # Record which snapshot the converted columns came from so FX revisions can be applied selectively
+    df[FX_VERSION_COLUMN] = snapshot.version
+    df = df.join(screening)
+    
+    return df.to_dict(orient='records')
+
+def earliest_periods(records: List[Dict]) -> Dict[str, date]:
+    """
+    Earliest fiscal reporting date of each company in a batch; undated records are skipped.
+    """
+    earliest: Dict[str, date] = {}
+    for record in records:
+        reporting_date = pd.to_datetime(record.get('fiscal_reporting_date'), errors='coerce')
+        company_id = record.get('company_id')
+        if company_id is None or pd.isna(reporting_date):
+            continue
+        reporting_date = reporting_date.date()
+        earliest[company_id] = min(reporting_date, earliest.get(company_id, reporting_date))
+    return earliest
+
+def transform_with_store(
+    store: Optional[MetricsStore],
+    records: List[Dict],
+    snapshot: FXSnapshot = None,
+    target_currencies: Optional[List[str]] = None,
+) -> List[Dict]:
+    """
+    Transforms a batch with the company context loaded from the metrics database.
+    
+    Each company's fiscal year end is loaded for calendar alignment, and its latest accepted
+    periods before the batch for data quality screening.
+    
+    Args:
+        store (MetricsStore, optional): Open store; without one the batch is transformed without context.
+        records (List[Dict]): Input financial metrics records.
+        snapshot (FXSnapshot, optional): FX snapshot to convert with. The latest rates are fetched when omitted.
+        target_currencies (List[str], optional): Currencies the consumer needs converted columns for.
+    
+    Returns:
+        List[Dict]: Transformed records in input order.
+    """
+    year_end_dates = history = None
+    if store is not None:
+        year_end_dates = store.load_year_end_dates(record.get('company_id') for record in records)
+        history = store.load_history(earliest_periods(records))
+    return transform_records(records, snapshot, target_currencies, year_end_dates=year_end_dates, history=history)
+
+def recompute_fx_revision(transformed_records: List[Dict], snapshot: FXSnapshot, affected_dates: Optional[List] = None) -> List[Dict]:
+    """
+    Applies an FX revision to previously transformed records.
+    
+    Only the currency-converted columns of rows on the affected dates are recomputed;
+    calculate_derivative_metrics is not rerun because its outputs do not depend on FX.
+    
+    Args:
+        transformed_records (List[Dict]): Output of an earlier transform_records call.
+        snapshot (FXSnapshot): The revised FX snapshot.
+        affected_dates (List, optional): Reporting dates the revision applies to.
+    
+    Returns:
+        List[Dict]: The records with converted columns refreshed where needed.
+    """
+    df = pd.DataFrame(transformed_records)
+    recomputed = apply_fx_revision(df, snapshot, affected_dates)
+    logger.info(f"Applied FX snapshot {snapshot.version} to {len(recomputed)} of {len(df)} records")
+    return df.to_dict(orient='records')
+
+def refresh_fx_conversions(
+    store: MetricsStore,
+    snapshot: FXSnapshot,
+    target_currencies: Optional[List[str]] = None,
+    time_budget_seconds: float = TIME_BUDGET_SECONDS,
+) -> bool:
+    """
+    Reconverts the saved financials that were converted with another FX snapshot.
+    
+    Stale company periods are read in batches of FX_REFRESH_BATCH_SIZE, revised with
+    recompute_fx_revision and saved back stamped with the snapshot's version, until none are
+    left or the time budget is spent.
+    
+    Args:
+        store (MetricsStore): Metrics database holding the saved conversions.
+        snapshot (FXSnapshot): The current FX snapshot.
+        target_currencies (List[str], optional): Currencies to refresh. Defaults to TARGET_CURRENCIES.
+        time_budget_seconds (float): Maximum time to keep refreshing.
+    
+    Returns:
+        bool: True when no stale conversions are left.
+    """
+    currencies = target_currencies or TARGET_CURRENCIES
+    deadline = time.monotonic() + time_budget_seconds
+    refreshed = 0
+    try:
+        while time.monotonic() < deadline:
+            records = store.load_stale_conversions(snapshot.version, currencies, FX_REFRESH_BATCH_SIZE)
+            if not records:
+                return True
+            # The latest snapshot applies to every period the pipeline converts
+            revised = recompute_fx_revision(records, snapshot, [record["fiscal_reporting_date"] for record in records])
+            if not store.save_conversions(revised, snapshot, currencies):
+                logger.error(f"{len(records)} stale conversions could not be saved with FX snapshot {snapshot.version}")
+                return False
+            refreshed += len(records)
+        return False
+    finally:
+        logger.info(f"Refreshed {refreshed} company periods to FX snapshot {snapshot.version}")
+
+def check_fx_revision(store: MetricsStore, time_budget_seconds: float = TIME_BUDGET_SECONDS) -> None:
+    """
+    Refreshes the saved conversions when the FX snapshot version has changed.
+    
+    The rates are checked at most every FX_REFRESH_SECONDS. A refresh that does not finish within
+    its budget is continued by the next run.
+    
+    Args:
+        store (MetricsStore): Metrics database holding the saved conversions.
+        time_budget_seconds (float): Maximum time to spend refreshing.
+    """
+    global _fx_refresh_due_at, _fx_version_applied
+    now = time.monotonic()
+    if now < _fx_refresh_due_at:
+        return
+    _fx_refresh_due_at = now + FX_REFRESH_SECONDS
+    snapshot = get_fx_snapshot()
+    if snapshot.version == _fx_version_applied:
+        return
+    if refresh_fx_conversions(store, snapshot, time_budget_seconds=time_budget_seconds):
+        _fx_version_applied = snapshot.version
+    else:
+        _fx_refresh_due_at = now
+
+async def transform_records_async(records: List[Dict], fx_client: FXClient, target_currencies: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Asynchronous variant of transform_records that awaits the FX snapshot from a pooled client.
+    
+    The FX fetch can run concurrently with other pipeline I/O, and concurrent batches share
+    a single in-flight request for the same snapshot.
+    
+    Args:
+        records (List[Dict]): Input financial metrics records.
+        fx_client (FXClient): Pooled FX client used to fetch the snapshot.
+        target_currencies (List[str], optional): Currencies the consumer needs converted columns for.
+    
+    Returns:
+        List[Dict]: Transformed records in input order.
+    """
+    snapshot = await fx_client.get_snapshot()
+    return transform_records(records, snapshot, target_currencies)
+
 @func.Function
-def transform_data(input_data: Dict) -> Dict:
+def transform_data(input_data: Dict, target_currencies: Optional[List[str]] = None) -> Dict:
     """
     Performs data transformation tasks including currency conversion and calculation of derivative metrics.
     
     Args:
         input_data (Dict): Input financial metrics data.
+        target_currencies (List[str], optional): Currencies to convert into. Defaults to TARGET_CURRENCIES.
     
     Returns:
         Dict: Transformed financial metrics including currency conversions and derivative calculations.
     """
     try:
-        # Retrieve the latest foreign exchange rates
-        fx_rates = get_fx_rates()
-        
-        # Load input financial metrics data using pandas
-        df = pd.DataFrame([input_data])
-        
-        # Perform currency conversion
-        base_currency = df['currency'].iloc[0]
-        for currency in ['USD', 'CAD']:
-            if currency != base_currency:
-                conversion_rate = fx_rates[currency] / fx_rates[base_currency]
-                for col in df.select_dtypes(include=[np.number]).columns:
-                    df[f'{col}_{currency}'] = df[col] * conversion_rate
-        
-        # Calculate derivative metrics
-        df = calculate_derivative_metrics(df)
-        
-        # Convert DataFrame back to dictionary
-        transformed_data = df.to_dict(orient='records')[0]
+        currencies = TARGET_CURRENCIES if target_currencies is None else target_currencies
+        store = open_store()
+        try:
+            transformed_data = transform_with_store(store, [input_data], target_currencies=currencies)[0]
+        finally:
+            if store is not None:
+                store.close()
         
         # Log successful transformation
         logger.info(f"Data transformation completed successfully for company_id: {transformed_data.get('company_id')}")
@@ -106,11 +412,129 @@ def transform_data(input_data: Dict) -> Dict:
         logger.error(f"Error in data transformation: {str(e)}")
         raise
 
-# Timer trigger configuration
-@func.timer_trigger(schedule="0 */5 * * * *", arg_name="myTimer", run_on_startup=True)
+def to_message(record: Dict) -> str:
+    """
+    Serializes a transformed record as strict JSON.
+    
+    Non-finite values, such as the infinite runway of a company that is not burning cash or the
+    growth of a first period, missing nullable integers and missing cash-out dates become null so
+    that every consumer can parse the message.
+    
+    Args:
+        record (Dict): A record returned by transform_records.
+    
+    Returns:
+        str: The JSON message body.
+    """
+    finite = {
+        key: None if value is pd.NA or value is pd.NaT or (isinstance(value, float) and not math.isfinite(value)) else value
+        for key, value in record.items()
+    }
+    return json.dumps(finite, default=str, allow_nan=False)
+
+def publish_results(queue: MessagePublisher, transformed_records: List[Dict]) -> List[str]:
+    """
+    Publishes transformed records to a queue, one JSON message per record.
+    
+    Args:
+        queue (MessagePublisher): Destination queue, e.g. the Azure output binding or a local SQLiteQueue.
+        transformed_records (List[Dict]): Records returned by transform_records.
+    
+    Returns:
+        List[str]: Ids of the enqueued messages.
+    """
+    return queue.enqueue_batch(to_message(record) for record in transformed_records)
+
+def recompute_changes(
+    store: MetricsStore,
+    events: List[ChangeEvent],
+    snapshot: FXSnapshot,
+    target_currencies: Optional[List[str]] = None,
+) -> List[Dict]:
+    """
+    Transforms the stored metrics of changed companies from their earliest changed period and saves
+    the derived metrics to quarterly_reporting_metrics and the converted financials to
+    quarterly_reporting_financials.
+    
+    The period before each company's first change is read as the baseline of period-over-period
+    metrics such as revenue growth, but is neither saved nor part of the result.
+    
+    Args:
+        store (MetricsStore): Metrics database to read the companies' rows and context from and save results to.
+        events (List[ChangeEvent]): Changed companies, each with its earliest changed period.
+        snapshot (FXSnapshot): FX snapshot to convert with.
+        target_currencies (List[str], optional): Currencies the consumer needs converted columns for.
+    
+    Returns:
+        List[Dict]: Transformed records of the changed periods.
+    """
+    records = store.fetch_changed(events)
+    if not records:
+        return []
+    since = {event.company_id: event.since.isoformat() for event in events}
+    transformed = transform_with_store(store, records, snapshot, target_currencies)
+    changed = [record for record in transformed if record["fiscal_reporting_date"] >= since[record["company_id"]]]
+    store.save_results(changed)
+    if snapshot is not None:
+        store.save_conversions(changed, snapshot, target_currencies or [])
+    return changed
+
+def is_bad_record(error: Exception) -> bool:
+    """
+    Whether a transformation failure was caused by the records being transformed.
+    """
+    return isinstance(error, BAD_RECORD_ERRORS)
+
+def process_backlog(
+    store: MetricsStore,
+    sink: MessagePublisher,
+    scheduler: Optional[AdaptiveScheduler] = None,
+    time_budget_seconds: float = TIME_BUDGET_SECONDS,
+    source: Optional[MessageConsumer] = None,
+) -> int:
+    """
+    Transforms metrics_input rows written since the last run, in adaptively sized batches, until the
+    backlog is drained or the time budget is spent.
+    
+    Each batch is turned into one recompute per company from its earliest pending period. The FX
+    snapshot is fetched once, on the first non-empty batch, so idle runs make no FX request. When a
+    batch fails because of its data, its rows are retried one at a time and those that still fail
+    are dead-lettered, so the watermark moves past them; any other failure ends the run.
+    
+    Args:
+        store (MetricsStore): Metrics database holding the backlog.
+        sink (MessagePublisher): Queue the transformed records are published to.
+        scheduler (AdaptiveScheduler, optional): Scheduler to plan batches with. Defaults to SCHEDULER.
+        time_budget_seconds (float): Maximum time to keep draining.
+        source (MessageConsumer, optional): Backlog to drain. Defaults to the rows past the store's watermark.
+    
+    Returns:
+        int: Number of pending rows processed.
+    """
+    source = source or MetricsInputBacklog(store, settle_seconds=BACKLOG_SETTLE_SECONDS)
+    snapshots: List[FXSnapshot] = []
+    
+    def process_batch(messages) -> None:
+        if not snapshots:
+            snapshots.append(get_fx_snapshot())
+        earliest = earliest_periods([json.loads(message.body) for message in messages])
+        events = [ChangeEvent(company_id, since) for company_id, since in earliest.items()]
+        publish_results(sink, recompute_changes(store, events, snapshots[0], TARGET_CURRENCIES))
+    
+    return drain_backlog(source, process_batch, scheduler or SCHEDULER, time_budget_seconds, is_poison=is_bad_record)
+
+# Timer trigger configuration: a cheap wake-up, the scheduler decides how much work each run does
+@func.timer_trigger(schedule="0 */1 * * * *", arg_name="myTimer", run_on_startup=True)
 def main(myTimer: func.TimerRequest, outputQueue: func.Out[str]) -> None:
     """
-    Main function triggered every 5 minutes to perform data transformation tasks.
+    Main function triggered every minute to perform data transformation tasks.
+    
+    When DATABASE_URL is configured, metrics_input rows written since the last run are drained
+    adaptively: under load a single run keeps transforming for up to TIME_BUDGET_SECONDS, and when
+    nothing is pending runs return after a single depth check, or without one while the idle
+    backoff lasts. When the FX rates have been revised, the saved conversions are then refreshed
+    within the remaining budget. Without a database the mock transformation runs at most every
+    FALLBACK_INTERVAL_SECONDS.
     
     Args:
         myTimer (func.TimerRequest): Timer trigger information.
@@ -121,6 +545,28 @@ def main(myTimer: func.TimerRequest, outputQueue: func.Out[str]) -> None:
     
     logger.info('Python timer trigger function executed.')
     
+    if DATABASE_URL:
+        store = None
+        try:
+            store = open_store()
+            started = time.monotonic()
+            processed = process_backlog(store, OutputBindingQueue(outputQueue))
+            logger.info(f"Transformed {processed} pending records.")
+            check_fx_revision(store, max(0.0, TIME_BUDGET_SECONDS - (time.monotonic() - started)))
+        except Exception as e:
+            logger.error(f"Error processing transformation backlog: {str(e)}")
+        finally:
+            if store is not None:
+                store.close()
+        return
+    
+    global _fallback_due_at
+    now = time.monotonic()
+    if now < _fallback_due_at:
+        logger.info('Mock transformation skipped until its five-minute cadence is due.')
+        return
+    _fallback_due_at = now + FALLBACK_INTERVAL_SECONDS
+    
     try:
         # In a real scenario, we would fetch the input data from a queue or database
         # For this example, we'll use a mock input
@@ -144,7 +590,7 @@ def main(myTimer: func.TimerRequest, outputQueue: func.Out[str]) -> None:
         transformed_data = transform_data(mock_input)
         
         # Store the transformed data in the specified output queue
-        outputQueue.set(str(transformed_data))
+        publish_results(OutputBindingQueue(outputQueue), [transformed_data])
         
         logger.info("Data transformation and queue storage completed successfully.")
     except Exception as e:
@@ -168,8 +614,10 @@ def manual_trigger(req: func.HttpRequest, outputQueue: func.Out[str]) -> func.Ht
     
     try:
         req_body = req.get_json()
-        transformed_data = transform_data(req_body)
-        outputQueue.set(str(transformed_data))
+        # Reports may ask for currencies beyond the configured defaults, e.g. ?currencies=EUR,GBP
+        requested_currencies = parse_currency_list(req.params.get('currencies')) or None
+        transformed_data = transform_data(req_body, target_currencies=requested_currencies)
+        publish_results(OutputBindingQueue(outputQueue), [transformed_data])
         return func.HttpResponse("Data transformation completed successfully.", status_code=200)
     except ValueError:
         return func.HttpResponse("Invalid JSON input.", status_code=400)
@@ -0,0 +1,530 @@
+"""
+Database access for the data transformation function.
+
+The timer and HTTP triggers and the change-event listener read the company context a
+transformation needs from the metrics database: each company's fiscal year end and its
+most recent accepted periods, which incoming rows are screened against. Derived metrics are
+written back to ``quarterly_reporting_metrics`` and converted financials to
+``quarterly_reporting_financials``, stamped with the FX snapshot version they were converted with.
+
+The timer's backlog is the set of metrics_input rows written after a watermark persisted in
+``transformation_watermarks``. Rows are ordered by ``COALESCE(last_update_date, created_date)``
+and id, so corrections re-enter the backlog. ``MetricsInputBacklog`` exposes that backlog as a
+``MessageConsumer`` for the adaptive scheduler. Acknowledging a batch advances the watermark.
+Rows that cannot be transformed are recorded in ``transformation_dead_letters`` and the
+watermark moves past them.
+
+Each ``MetricsStore`` wraps a single psycopg2 connection and is used from one thread at a
+time; the triggers open one per invocation when ``DATABASE_URL`` is configured.
+
+Requirements Addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+      Transform submitted metrics in the context of each company's reporting calendar and history.
+"""
+
+import json
+import math
+import os
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+import pandas as pd
+import psycopg2  # version 2.9.1
+from psycopg2.extras import RealDictCursor, execute_values
+
+from .conversions import FX_VERSION_COLUMN
+from .data_quality import SCREENED_COLUMNS
+from .fx_rates import FXSnapshot
+from .queues import MessageConsumer, QueueMessage
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+
+YEAR_END_QUERY = """
+    SELECT id::text AS company_id, year_end_date
+    FROM companies
+    WHERE id = ANY(%s::uuid[])
+"""
+
+# Each company's latest periods before the earliest period of the batch being transformed
+HISTORY_QUERY = """
+    SELECT c.company_id::text AS company_id, h.fiscal_reporting_date, {columns}
+    FROM unnest(%s::uuid[], %s::date[]) AS c(company_id, before)
+    CROSS JOIN LATERAL (
+        SELECT m.*
+        FROM metrics_input m
+        WHERE m.company_id = c.company_id AND m.fiscal_reporting_date < c.before
+        ORDER BY m.fiscal_reporting_date DESC
+        LIMIT %s
+    ) h
+""".format(columns=", ".join(f"h.{column}::float8 AS {column}" for column in SCREENED_COLUMNS))
+
+# Each company's rows from its first changed period, plus the period before it, which
+# period-over-period metrics such as revenue growth are computed against
+RECOMPUTE_QUERY = """
+    SELECT m.*
+    FROM metrics_input m
+    JOIN unnest(%s::uuid[], %s::date[]) AS c(company_id, since) ON m.company_id = c.company_id
+    WHERE m.fiscal_reporting_date >= COALESCE(
+        (SELECT max(p.fiscal_reporting_date) FROM metrics_input p
+         WHERE p.company_id = c.company_id AND p.fiscal_reporting_date < c.since),
+        c.since)
+    ORDER BY m.company_id, m.fiscal_reporting_date
+"""
+
+# Companies with metrics_input rows written at or after a time, each with its earliest such period
+CHANGED_SINCE_QUERY = """
+    SELECT m.company_id::text AS company_id, min(m.fiscal_reporting_date) AS since
+    FROM metrics_input m
+    WHERE COALESCE(m.last_update_date, m.created_date) >= %s
+    GROUP BY m.company_id
+"""
+
+# Backlog position of a metrics_input row: when it was last written, then its id. Rows written
+# within the settle window are left for a later run, so that transactions still in flight when a
+# run reads the backlog do not commit rows behind the watermark.
+PENDING_FILTER = """
+    (COALESCE(m.last_update_date, m.created_date), m.id) > (%s, %s::uuid)
+    AND COALESCE(m.last_update_date, m.created_date) <= localtimestamp - %s * interval '1 second'
+"""
+
+PENDING_COUNT_QUERY = f"SELECT count(*) AS pending FROM metrics_input m WHERE {PENDING_FILTER}"
+
+PENDING_ROWS_QUERY = f"""
+    SELECT COALESCE(m.last_update_date, m.created_date) AS modified_at, m.id::text AS id,
+           m.company_id::text AS company_id, m.fiscal_reporting_date
+    FROM metrics_input m
+    WHERE {PENDING_FILTER}
+    ORDER BY COALESCE(m.last_update_date, m.created_date), m.id
+    LIMIT %s
+"""
+
+WATERMARK_QUERY = "SELECT modified_at, last_id::text AS last_id FROM transformation_watermarks WHERE name = %s"
+
+SAVE_WATERMARK_QUERY = """
+    INSERT INTO transformation_watermarks (name, modified_at, last_id, updated_at)
+    VALUES (%s, %s, %s::uuid, now())
+    ON CONFLICT (name) DO UPDATE
+    SET modified_at = EXCLUDED.modified_at, last_id = EXCLUDED.last_id, updated_at = EXCLUDED.updated_at
+    WHERE (transformation_watermarks.modified_at, transformation_watermarks.last_id)
+        < (EXCLUDED.modified_at, EXCLUDED.last_id)
+"""
+
+SAVE_DEAD_LETTER_QUERY = """
+    INSERT INTO transformation_dead_letters (name, metrics_input_id, modified_at, error, failed_at)
+    VALUES (%s, %s::uuid, %s, %s, now())
+    ON CONFLICT (name, metrics_input_id) DO UPDATE
+    SET modified_at = EXCLUDED.modified_at, error = EXCLUDED.error, failed_at = EXCLUDED.failed_at
+"""
+
+# Derived metrics persisted to quarterly_reporting_metrics by the transformation
+DERIVED_METRICS = (
+    'arr', 'recurring_percentage_revenue', 'revenue_per_fte', 'gross_profit_per_fte', 'change_in_cash',
+    'revenue_growth', 'monthly_cash_burn', 'runway_months', 'sales_marketing_percentage_revenue',
+    'total_operating_percentage_revenue', 'gross_profit_margin',
+)
+
+RESULT_KEYS = ('company_id', 'currency', 'fiscal_reporting_date')
+RESULT_PERIOD_COLUMNS = ('fiscal_reporting_quarter', 'reporting_year', 'reporting_quarter')
+
+SAVE_RESULTS_QUERY = """
+    INSERT INTO quarterly_reporting_metrics ({columns}, created_by)
+    VALUES %s
+    ON CONFLICT (company_id, currency, fiscal_reporting_date) DO UPDATE
+    SET {updates}, last_update_date = now(), last_updated_by = EXCLUDED.created_by
+""".format(
+    columns=", ".join(RESULT_KEYS + RESULT_PERIOD_COLUMNS + DERIVED_METRICS),
+    updates=", ".join(f"{column} = EXCLUDED.{column}" for column in RESULT_PERIOD_COLUMNS + DERIVED_METRICS),
+)
+
+SAVE_RESULTS_TEMPLATE = "(%s::uuid, %s, %s::date, " + ", ".join(["%s"] * (len(RESULT_PERIOD_COLUMNS) + len(DERIVED_METRICS) + 1)) + ")"
+
+# Financials saved converted into each target currency
+FINANCIAL_COLUMNS = (
+    'total_revenue', 'recurring_revenue', 'gross_profit', 'debt_outstanding', 'sales_marketing_expense',
+    'total_operating_expense', 'ebitda', 'net_income', 'cash_burn', 'cash_balance',
+)
+
+CONVERSION_COLUMNS = RESULT_KEYS + RESULT_PERIOD_COLUMNS + ('exchange_rate_used',) + FINANCIAL_COLUMNS + (FX_VERSION_COLUMN,)
+
+SAVE_CONVERSIONS_QUERY = """
+    INSERT INTO quarterly_reporting_financials ({columns}, created_by)
+    VALUES %s
+    ON CONFLICT (company_id, currency, fiscal_reporting_date) DO UPDATE
+    SET {updates}, last_update_date = now(), last_updated_by = EXCLUDED.created_by
+""".format(
+    columns=", ".join(CONVERSION_COLUMNS),
+    updates=", ".join(f"{column} = EXCLUDED.{column}" for column in CONVERSION_COLUMNS[len(RESULT_KEYS):]),
+)
+
+SAVE_CONVERSIONS_TEMPLATE = "(%s::uuid, %s, %s::date, " + ", ".join(["%s"] * (len(CONVERSION_COLUMNS) - len(RESULT_KEYS) + 1)) + ")"
+
+# Source rows of up to %s company periods whose saved conversions used another FX snapshot, with
+# one row per saved target currency
+STALE_CONVERSIONS_QUERY = """
+    SELECT m.*, f.currency AS converted_currency, f.fx_snapshot_version AS converted_version, {converted}
+    FROM (
+        SELECT DISTINCT company_id, fiscal_reporting_date
+        FROM quarterly_reporting_financials
+        WHERE fx_snapshot_version IS DISTINCT FROM %s AND currency = ANY(%s)
+        ORDER BY company_id, fiscal_reporting_date
+        LIMIT %s
+    ) s
+    JOIN metrics_input m ON m.company_id = s.company_id AND m.fiscal_reporting_date = s.fiscal_reporting_date
+    JOIN quarterly_reporting_financials f
+        ON f.company_id = s.company_id AND f.fiscal_reporting_date = s.fiscal_reporting_date AND f.currency = ANY(%s)
+    ORDER BY m.company_id, m.fiscal_reporting_date
+""".format(converted=", ".join(f"f.{column}::float8 AS converted_{column}" for column in FINANCIAL_COLUMNS))
+
+RESULTS_AUTHOR = 'data_transformation'
+
+# Position before every row, used until a watermark has been saved
+BACKLOG_START: Tuple[datetime, str] = (datetime.min, '00000000-0000-0000-0000-000000000000')
+
+
+class ChangeEvent(NamedTuple):
+    """
+    A company whose metrics changed on or after ``since``.
+    """
+    company_id: str
+    since: date
+
+
+def to_record(row: Dict) -> Dict:
+    """
+    Convert a metrics_input row into the JSON-compatible record the pipeline transforms.
+    """
+    record = {}
+    for key, value in row.items():
+        if isinstance(value, Decimal):
+            value = float(value)
+        elif isinstance(value, UUID):
+            value = str(value)
+        elif isinstance(value, date):
+            value = value.isoformat()
+        record[key] = value
+    return record
+
+
+def to_column_value(value):
+    """
+    A transformed value as a database value: missing and non-finite numbers are stored as NULL.
+    """
+    if value is None or value is pd.NA:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def company_uuids(company_ids: Iterable) -> List[str]:
+    """
+    The distinct company ids that are valid UUIDs, as strings; other ids cannot match a stored company.
+    """
+    valid = []
+    for company_id in company_ids:
+        try:
+            value = str(UUID(str(company_id)))
+        except ValueError:
+            continue
+        if value not in valid:
+            valid.append(value)
+    return valid
+
+
+class MetricsStore:
+    """
+    Reads transformation context from, and writes derived metrics to, the metrics database.
+
+    Args:
+        connection: An open psycopg2 connection.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    @classmethod
+    def connect(cls, dsn: str) -> 'MetricsStore':
+        """
+        Open a store on a new autocommit connection; writes group their statements in explicit transactions.
+        """
+        connection = psycopg2.connect(dsn)
+        connection.autocommit = True
+        return cls(connection)
+
+    def __enter__(self) -> 'MetricsStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _fetch(self, query: str, params=None) -> List[Dict]:
+        with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
+            cursor.execute(query, params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    def load_year_end_dates(self, company_ids: Iterable) -> Dict[str, date]:
+        """
+        Fiscal year end (``companies.year_end_date``) of each known company.
+
+        Args:
+            company_ids (Iterable): Company ids of a batch; ids that are not UUIDs are ignored.
+
+        Returns:
+            Dict[str, date]: Company id -> year end date for the companies found.
+        """
+        ids = company_uuids(company_ids)
+        if not ids:
+            return {}
+        return {row['company_id']: row['year_end_date'] for row in self._fetch(YEAR_END_QUERY, (ids,))}
+
+    def load_history(self, earliest: Dict[str, date], periods: int = 8) -> pd.DataFrame:
+        """
+        Recent accepted rows of each company, for screening incoming rows against.
+
+        Only periods before the company's earliest incoming period are read, so rows of the batch
+        itself, which are already stored when the batch comes from metrics_input, are not
+        counted twice.
+
+        Args:
+            earliest (Dict[str, date]): Company id -> earliest fiscal reporting date in the batch.
+            periods (int): Prior periods to read per company, matching the screening window.
+
+        Returns:
+            pd.DataFrame: 'company_id', 'fiscal_reporting_date' and the screened metrics; empty when nothing is found.
+        """
+        before: Dict[str, date] = {}
+        for company_id, reporting_date in earliest.items():
+            for valid in company_uuids([company_id]):
+                before[valid] = min(reporting_date, before.get(valid, reporting_date))
+        if not before:
+            return pd.DataFrame()
+        rows = self._fetch(HISTORY_QUERY, (list(before), list(before.values()), periods))
+        return pd.DataFrame(rows)
+
+    def fetch_changed(self, events: List[ChangeEvent]) -> List[Dict]:
+        """
+        Fetch the metrics_input rows needed to recompute a batch of changed companies in one query.
+        """
+        if not events:
+            return []
+        rows = self._fetch(RECOMPUTE_QUERY, ([event.company_id for event in events], [event.since for event in events]))
+        return [to_record(row) for row in rows]
+
+    def changed_since(self, modified_at: datetime) -> List[ChangeEvent]:
+        """
+        Companies with metrics_input rows written at or after ``modified_at``, for catching up on
+        changes whose notifications were missed.
+        """
+        return [ChangeEvent(row['company_id'], row['since']) for row in self._fetch(CHANGED_SINCE_QUERY, (modified_at,))]
+
+    def save_results(self, records: List[Dict]) -> int:
+        """
+        Upsert the derived metrics of transformed records into quarterly_reporting_metrics.
+
+        Rows are keyed by company, the record's currency and fiscal reporting date, so a recompute
+        replaces the metrics saved for the same period. Records missing a key or period column
+        cannot be stored and are skipped; when a key repeats, the last record wins. All rows are
+        written in a single statement, so either every row is saved or none is.
+
+        Args:
+            records (List[Dict]): Transformed records.
+
+        Returns:
+            int: Number of rows written.
+        """
+        rows = {}
+        for record in records:
+            values = [to_column_value(record.get(column)) for column in RESULT_KEYS + RESULT_PERIOD_COLUMNS]
+            if any(value is None for value in values) or not company_uuids([record['company_id']]):
+                continue
+            values += [to_column_value(record.get(column)) for column in DERIVED_METRICS]
+            rows[tuple(values[:len(RESULT_KEYS)])] = tuple(values) + (RESULTS_AUTHOR,)
+        if not rows:
+            return 0
+        with self.connection.cursor() as cursor:
+            execute_values(cursor, SAVE_RESULTS_QUERY, list(rows.values()), template=SAVE_RESULTS_TEMPLATE, page_size=len(rows))
+        return len(rows)
+
+    def save_conversions(self, records: List[Dict], snapshot: FXSnapshot, currencies: Iterable[str]) -> int:
+        """
+        Upsert the financials of transformed records, converted into each target currency, into
+        quarterly_reporting_financials.
+
+        A record's '<column>_<currency>' values are saved for each target currency, with the
+        record's own values for its reporting currency. Currencies a record has no converted
+        columns for are skipped, as are records missing a key or period column. Each row records
+        the rate used and ``snapshot.version``. All rows are written in a single statement.
+
+        Args:
+            records (List[Dict]): Transformed records.
+            snapshot (FXSnapshot): FX snapshot the records were converted with.
+            currencies (Iterable[str]): Target currencies to save.
+
+        Returns:
+            int: Number of rows written.
+        """
+        currencies = [currency for currency in currencies if currency in snapshot.index]
+        rows = {}
+        for record in records:
+            source = record.get('currency')
+            period = [to_column_value(record.get(column)) for column in ('fiscal_reporting_date',) + RESULT_PERIOD_COLUMNS]
+            if source not in snapshot.index or any(value is None for value in period) or not company_uuids([record['company_id']]):
+                continue
+            for currency in currencies:
+                if currency == source:
+                    values = [record.get(column) for column in FINANCIAL_COLUMNS]
+                elif any(f'{column}_{currency}' in record for column in FINANCIAL_COLUMNS):
+                    values = [record.get(f'{column}_{currency}') for column in FINANCIAL_COLUMNS]
+                else:
+                    continue
+                rate = float(snapshot.matrix[snapshot.index[source], snapshot.index[currency]])
+                key = (record['company_id'], currency, period[0])
+                rows[key] = key + tuple(period[1:]) + (rate,) + tuple(to_column_value(value) for value in values) + (
+                    snapshot.version, RESULTS_AUTHOR,
+                )
+        if not rows:
+            return 0
+        with self.connection.cursor() as cursor:
+            execute_values(cursor, SAVE_CONVERSIONS_QUERY, list(rows.values()), template=SAVE_CONVERSIONS_TEMPLATE, page_size=len(rows))
+        return len(rows)
+
+    def load_stale_conversions(self, version: str, currencies: List[str], limit: int) -> List[Dict]:
+        """
+        Metrics of up to ``limit`` company periods whose saved conversions used another FX snapshot.
+
+        Each record holds the metrics_input row, the saved '<column>_<currency>' values of each
+        target currency and, as ``fx_snapshot_version``, a version other than ``version``.
+
+        Args:
+            version (str): Version of the current FX snapshot.
+            currencies (List[str]): Target currencies whose saved conversions are checked.
+            limit (int): Maximum number of company periods to return.
+
+        Returns:
+            List[Dict]: One record per company period, in company and period order.
+        """
+        records: Dict[str, Dict] = {}
+        for row in self._fetch(STALE_CONVERSIONS_QUERY, (version, currencies, limit, currencies)):
+            currency = row.pop('converted_currency')
+            stale_version = row.pop('converted_version')
+            converted = {f'{column}_{currency}': row.pop(f'converted_{column}') for column in FINANCIAL_COLUMNS}
+            record = records.setdefault(str(row['id']), to_record(row))
+            record.update(converted)
+            if stale_version != version:
+                record[FX_VERSION_COLUMN] = stale_version
+        return list(records.values())
+
+    def load_watermark(self, name: str) -> Tuple[datetime, str]:
+        """
+        Backlog position up to which metrics_input rows have been transformed.
+        """
+        rows = self._fetch(WATERMARK_QUERY, (name,))
+        return (rows[0]['modified_at'], rows[0]['last_id']) if rows else BACKLOG_START
+
+    def save_watermark(self, name: str, position: Tuple[datetime, str]) -> None:
+        """
+        Advance the watermark to ``position``; it never moves backwards.
+        """
+        with self.connection.cursor() as cursor:
+            cursor.execute(SAVE_WATERMARK_QUERY, (name, *position))
+
+    def save_dead_letter(self, name: str, position: Tuple[datetime, str], error: str) -> None:
+        """
+        Record a metrics_input row the consumer ``name`` could not transform, at its backlog position.
+        """
+        modified_at, metrics_input_id = position
+        with self.connection.cursor() as cursor:
+            cursor.execute(SAVE_DEAD_LETTER_QUERY, (name, metrics_input_id, modified_at, error))
+
+    def count_pending(self, position: Tuple[datetime, str], settle_seconds: float) -> int:
+        """
+        Number of settled metrics_input rows after ``position``.
+        """
+        return self._fetch(PENDING_COUNT_QUERY, (*position, settle_seconds))[0]['pending']
+
+    def fetch_pending(self, position: Tuple[datetime, str], limit: int, settle_seconds: float) -> List[Dict]:
+        """
+        Up to ``limit`` settled metrics_input rows after ``position``, in backlog order.
+        """
+        return self._fetch(PENDING_ROWS_QUERY, (*position, settle_seconds, limit))
+
+
+class MetricsInputBacklog(MessageConsumer):
+    """
+    The metrics_input rows written after a persisted watermark, consumed like a queue.
+
+    Each message stands for one row. Its body holds the row's company id and fiscal reporting
+    date. Leases only last for the current run: ``release`` rewinds to the watermark and
+    ``visibility_timeout`` is not used. The watermark advances over the longest run of
+    acknowledged messages that follows it. Dead-lettered messages are recorded and then count
+    as acknowledged; a correction to such a row re-enters the backlog.
+
+    Args:
+        store (MetricsStore): Store the backlog and watermark are read from.
+        name (str): Watermark name, one per consumer of the backlog.
+        settle_seconds (float): Age a row must reach before it is handed out.
+    """
+
+    def __init__(self, store: MetricsStore, name: str = 'data_transformation', settle_seconds: float = 300.0):
+        self.store = store
+        self.name = name
+        self.settle_seconds = settle_seconds
+        self.watermark = store.load_watermark(name)
+        self._leased_to = self.watermark
+        # Leased message id -> backlog position, in backlog order
+        self._leased: Dict[str, Tuple[datetime, str]] = {}
+        self._acked: set = set()
+
+    def depth(self) -> int:
+        return self.store.count_pending(self.watermark, self.settle_seconds)
+
+    def dequeue_batch(self, max_messages: int = 32, visibility_timeout: float = 30.0) -> List[QueueMessage]:
+        rows = self.store.fetch_pending(self._leased_to, max_messages, self.settle_seconds)
+        messages = []
+        for row in rows:
+            position = (row['modified_at'], row['id'])
+            body = json.dumps({'company_id': row['company_id'], 'fiscal_reporting_date': row['fiscal_reporting_date'].isoformat()})
+            self._leased[row['id']] = position
+            messages.append(QueueMessage(row['id'], body, 1, row['modified_at'].timestamp()))
+        if rows:
+            self._leased_to = self._leased[rows[-1]['id']]
+        return messages
+
+    def ack(self, message_ids: Iterable[str]) -> None:
+        self._acked.update(message_ids)
+        advanced = None
+        for message_id in list(self._leased):
+            if message_id not in self._acked:
+                break
+            advanced = self._leased.pop(message_id)
+            self._acked.discard(message_id)
+        if advanced is not None:
+            self.store.save_watermark(self.name, advanced)
+            self.watermark = advanced
+
+    def dead_letter(self, message_ids: Iterable[str], reason: str) -> None:
+        message_ids = list(message_ids)
+        for message_id in message_ids:
+            self.store.save_dead_letter(self.name, self._leased[message_id], reason)
+        self.ack(message_ids)
+
+    def release(self, message_ids: Iterable[str]) -> None:
+        # Everything after the watermark is handed out again, in order
+        self._leased.clear()
+        self._acked.clear()
+        self._leased_to = self.watermark
+
+
+def open_store() -> Optional[MetricsStore]:
+    """
+    Connect to the metrics database when ``DATABASE_URL`` is configured, otherwise return None.
+    """
+    return MetricsStore.connect(DATABASE_URL) if DATABASE_URL else None
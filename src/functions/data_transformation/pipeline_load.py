@@ -0,0 +1,188 @@
+"""
+Offline end-to-end load test for the transformation pipeline.
+
+Drives ingestion -> transformation -> persistence at a configurable rate against local
+``SQLiteQueue`` instances instead of Azure Storage Queues, and reports per-stage throughput
+and end-to-end latency percentiles.
+
+Usage:
+    python -m src.functions.data_transformation.pipeline_load --records 100000 --rate 5000 --workers 4
+
+Requirements Addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+      Validate that the transformation pipeline keeps up with production ingestion rates.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from typing import Dict, List
+
+import numpy as np
+
+from .fx_rates import FXSnapshot
+from .main import TARGET_CURRENCIES, publish_results, transform_records
+from .queues import SQLiteQueue
+
+# Carried through the pipeline as a string so it is not treated as a numeric metric
+INGESTED_AT_FIELD = 'load_test_ingested_at'
+
+LOAD_TEST_RATES = {"USD": 1.0, "CAD": 1.35, "EUR": 0.92, "GBP": 0.79}
+
+
+def make_record(company_index: int, rng: np.random.Generator) -> Dict:
+    """
+    Build a synthetic metrics_input record.
+    """
+    revenue = float(rng.uniform(1e5, 1e7))
+    return {
+        "company_id": str(uuid.UUID(int=company_index)),
+        "currency": rng.choice(list(LOAD_TEST_RATES)),
+        "fiscal_reporting_date": "2023-03-31",
+        "fiscal_reporting_quarter": 1,
+        "reporting_year": 2023,
+        "reporting_quarter": 1,
+        "total_revenue": revenue,
+        "recurring_revenue": revenue * 0.8,
+        "gross_profit": revenue * 0.6,
+        "sales_marketing_expense": revenue * 0.3,
+        "total_operating_expense": revenue * 1.1,
+        "ebitda": -revenue * 0.1,
+        "net_income": -revenue * 0.12,
+        "cash_burn": -revenue * 0.15,
+        "cash_balance": revenue * 3,
+        "employees": int(rng.integers(5, 500)),
+    }
+
+
+def ingest(queue: SQLiteQueue, records: int, rate: float, batch_size: int, companies: int, seed: int) -> None:
+    """
+    Enqueue synthetic submissions at roughly ``rate`` records per second.
+    """
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+    for sent in range(0, records, batch_size):
+        batch = []
+        for i in range(sent, min(sent + batch_size, records)):
+            record = make_record(i % companies, rng)
+            record[INGESTED_AT_FIELD] = repr(time.time())
+            batch.append(json.dumps(record))
+        queue.enqueue_batch(batch)
+        # Pace the producer to the requested rate
+        delay = (sent + len(batch)) / rate - (time.perf_counter() - started)
+        if delay > 0:
+            time.sleep(delay)
+
+
+def transform_worker(source: SQLiteQueue, sink: SQLiteQueue, snapshot: FXSnapshot, batch_size: int, done: threading.Event) -> None:
+    """
+    Lease input batches, transform them and publish the results.
+    """
+    while True:
+        messages = source.dequeue_batch(batch_size, visibility_timeout=60)
+        if not messages:
+            if done.is_set() and source.depth() == 0:
+                return
+            time.sleep(0.01)
+            continue
+        try:
+            results = transform_records([json.loads(message.body) for message in messages], snapshot, TARGET_CURRENCIES)
+            publish_results(sink, results)
+            source.ack(message.id for message in messages)
+        except Exception:
+            source.release(message.id for message in messages)
+            raise
+
+
+def persist_worker(source: SQLiteQueue, db_path: str, batch_size: int, done: threading.Event, latencies: List[float]) -> None:
+    """
+    Persist transformed records into a local table, standing in for PostgreSQL.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("CREATE TABLE IF NOT EXISTS transformed_metrics (company_id TEXT, body TEXT)")
+    while True:
+        messages = source.dequeue_batch(batch_size, visibility_timeout=60)
+        if not messages:
+            if done.is_set() and source.depth() == 0:
+                break
+            time.sleep(0.01)
+            continue
+        records = [json.loads(message.body) for message in messages]
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO transformed_metrics (company_id, body) VALUES (?, ?)",
+            [(record["company_id"], message.body) for record, message in zip(records, messages)],
+        )
+        conn.execute("COMMIT")
+        source.ack(message.id for message in messages)
+        now = time.time()
+        latencies.extend(now - float(record[INGESTED_AT_FIELD]) for record in records)
+    conn.close()
+
+
+def run_load_test(records: int, rate: float, workers: int, batch_size: int, companies: int, workdir: str, seed: int = 0) -> Dict:
+    """
+    Run the pipeline end to end and return throughput and latency statistics.
+    """
+    queue_path = os.path.join(workdir, 'queues.db')
+    inputs = SQLiteQueue(queue_path, name='metrics-input')
+    outputs = SQLiteQueue(queue_path, name='transformation-results')
+    snapshot = FXSnapshot.from_rates(LOAD_TEST_RATES)
+
+    ingestion_done, transformation_done = threading.Event(), threading.Event()
+    latencies: List[float] = []
+    transformers = [
+        threading.Thread(target=transform_worker, args=(inputs, outputs, snapshot, batch_size, ingestion_done))
+        for _ in range(workers)
+    ]
+    persister = threading.Thread(
+        target=persist_worker,
+        args=(outputs, os.path.join(workdir, 'persisted.db'), batch_size, transformation_done, latencies),
+    )
+
+    started = time.perf_counter()
+    for thread in transformers + [persister]:
+        thread.start()
+    ingest(inputs, records, rate, batch_size, companies, seed)
+    ingestion_done.set()
+    for thread in transformers:
+        thread.join()
+    transformation_done.set()
+    persister.join()
+    elapsed = time.perf_counter() - started
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies else (float('nan'),) * 3
+    return {
+        "records": records,
+        "persisted": len(latencies),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(len(latencies) / elapsed, 1),
+        "latency_p50_seconds": round(float(p50), 4),
+        "latency_p95_seconds": round(float(p95), 4),
+        "latency_p99_seconds": round(float(p99), 4),
+        "dead_letters": len(inputs.dead_letters()) + len(outputs.dead_letters()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline load test for the data transformation pipeline")
+    parser.add_argument("--records", type=int, default=10000, help="Number of submissions to ingest")
+    parser.add_argument("--rate", type=float, default=2000, help="Target ingestion rate in records per second")
+    parser.add_argument("--workers", type=int, default=2, help="Number of transformation workers")
+    parser.add_argument("--batch-size", type=int, default=200, help="Messages per enqueue/dequeue batch")
+    parser.add_argument("--companies", type=int, default=200, help="Number of distinct synthetic companies")
+    parser.add_argument("--workdir", default=None, help="Directory for the queue and persistence files")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='transformation-load-test-')
+    result = run_load_test(args.records, args.rate, args.workers, args.batch_size, args.companies, workdir)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
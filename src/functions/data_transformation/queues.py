@@ -0,0 +1,251 @@
+"""
+Queue abstraction for the transformation pipeline.
+
+In Azure the function publishes results through its ``outputQueue`` binding. To drive the
+pipeline offline (e.g. load testing ingestion -> transformation -> persistence on a laptop)
+the same stages can run against ``SQLiteQueue``, a durable file-backed queue with batch
+enqueue/dequeue, visibility timeouts and dead-lettering of poison messages, mirroring the
+semantics of Azure Storage Queues.
+
+Requirements Addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+      Deliver transformation results reliably to downstream consumers.
+"""
+
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Iterable, List, NamedTuple, Optional
+
+
+class QueueMessage(NamedTuple):
+    """
+    A message handed out by ``dequeue_batch``.
+
+    Attributes:
+        id (str): Message identifier, used to acknowledge or release the message.
+        body (str): Message payload.
+        dequeue_count (int): Number of times the message has been dequeued, including this one.
+        enqueued_at (float): Unix timestamp of the original enqueue.
+    """
+    id: str
+    body: str
+    dequeue_count: int
+    enqueued_at: float
+
+
+class MessagePublisher(ABC):
+    """
+    Destination for messages, e.g. the Azure output binding.
+    """
+
+    @abstractmethod
+    def enqueue_batch(self, bodies: Iterable[str]) -> List[str]:
+        """
+        Add messages to the queue and return their ids.
+        """
+
+
+class MessageConsumer(ABC):
+    """
+    Source of messages that are leased, then acknowledged or released.
+    """
+
+    @abstractmethod
+    def dequeue_batch(self, max_messages: int = 32, visibility_timeout: float = 30.0) -> List[QueueMessage]:
+        """
+        Lease up to ``max_messages`` visible messages, hiding them for ``visibility_timeout`` seconds.
+        """
+
+    @abstractmethod
+    def ack(self, message_ids: Iterable[str]) -> None:
+        """
+        Delete successfully processed messages.
+        """
+
+    @abstractmethod
+    def release(self, message_ids: Iterable[str]) -> None:
+        """
+        Make leased messages visible again immediately, e.g. after a failed attempt.
+        """
+
+    @abstractmethod
+    def dead_letter(self, message_ids: Iterable[str], reason: str) -> None:
+        """
+        Set leased messages that cannot be processed aside, so they are not handed out again.
+        """
+
+    @abstractmethod
+    def depth(self) -> int:
+        """
+        Number of messages waiting to be processed, leased or not, excluding dead letters.
+        """
+
+
+class MessageQueue(MessagePublisher, MessageConsumer):
+    """
+    A queue that is both published to and consumed from, such as ``SQLiteQueue``.
+    """
+
+
+class OutputBindingQueue(MessagePublisher):
+    """
+    Publisher over an Azure Functions ``func.Out[str]`` queue binding.
+
+    The binding holds a single value per invocation, so messages from every
+    ``enqueue_batch`` call are accumulated and the binding is set to all of them.
+
+    Args:
+        binding: The ``outputQueue`` output binding of the running function.
+    """
+
+    def __init__(self, binding):
+        self.binding = binding
+        self._published: List[str] = []
+
+    def enqueue_batch(self, bodies: Iterable[str]) -> List[str]:
+        bodies = list(bodies)
+        self._published.extend(bodies)
+        # The binding accepts a list of messages in a single set() call
+        self.binding.set(self._published if len(self._published) != 1 else self._published[0])
+        return [str(uuid.uuid4()) for _ in bodies]
+
+
+class SQLiteQueue(MessageQueue):
+    """
+    Durable queue stored in a SQLite database file.
+
+    Several named queues can share one file. Messages leased by ``dequeue_batch`` become
+    visible again once their visibility timeout expires unless acknowledged. Messages that
+    have already been dequeued ``max_dequeue_count`` times are moved to the dead-letter
+    set instead of being handed out again, as are messages passed to ``dead_letter``.
+
+    Args:
+        path (str): Database file path; ':memory:' keeps the queue in memory.
+        name (str): Queue name within the file.
+        max_dequeue_count (int): Deliveries allowed before a message is dead-lettered.
+    """
+
+    def __init__(self, path: str, name: str = 'transformation-results', max_dequeue_count: int = 5):
+        self.path = path
+        self.name = name
+        self.max_dequeue_count = max_dequeue_count
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS queue_messages (
+                id TEXT PRIMARY KEY,
+                queue TEXT NOT NULL,
+                body TEXT NOT NULL,
+                enqueued_at REAL NOT NULL,
+                visible_at REAL NOT NULL,
+                dequeue_count INTEGER NOT NULL DEFAULT 0,
+                dead_lettered INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_queue_messages_visible ON queue_messages (queue, dead_lettered, visible_at)"
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def enqueue_batch(self, bodies: Iterable[str]) -> List[str]:
+        now = time.time()
+        rows = [(str(uuid.uuid4()), self.name, body, now, now) for body in bodies]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO queue_messages (id, queue, body, enqueued_at, visible_at) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [row[0] for row in rows]
+
+    def dequeue_batch(self, max_messages: int = 32, visibility_timeout: float = 30.0) -> List[QueueMessage]:
+        now = time.time()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front so concurrent consumers never lease the same message
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    """
+                    SELECT id, body, dequeue_count, enqueued_at FROM queue_messages
+                    WHERE queue = ? AND dead_lettered = 0 AND visible_at <= ?
+                    ORDER BY visible_at LIMIT ?
+                    """,
+                    (self.name, now, max_messages),
+                ).fetchall()
+
+                poison = [(row[0],) for row in rows if row[2] >= self.max_dequeue_count]
+                leased = [row for row in rows if row[2] < self.max_dequeue_count]
+                if poison:
+                    self._conn.executemany("UPDATE queue_messages SET dead_lettered = 1 WHERE id = ?", poison)
+                if leased:
+                    self._conn.executemany(
+                        "UPDATE queue_messages SET visible_at = ?, dequeue_count = dequeue_count + 1 WHERE id = ?",
+                        [(now + visibility_timeout, row[0]) for row in leased],
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [QueueMessage(row[0], row[1], row[2] + 1, row[3]) for row in leased]
+
+    def ack(self, message_ids: Iterable[str]) -> None:
+        with self._lock:
+            self._conn.executemany("DELETE FROM queue_messages WHERE id = ?", [(message_id,) for message_id in message_ids])
+
+    def release(self, message_ids: Iterable[str]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE queue_messages SET visible_at = ? WHERE id = ?",
+                [(now, message_id) for message_id in message_ids],
+            )
+
+    def dead_letter(self, message_ids: Iterable[str], reason: str) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE queue_messages SET dead_lettered = 1 WHERE id = ?", [(message_id,) for message_id in message_ids]
+            )
+
+    def depth(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM queue_messages WHERE queue = ? AND dead_lettered = 0", (self.name,)
+            ).fetchone()[0]
+
+    def visible_depth(self, now: Optional[float] = None) -> int:
+        """
+        Number of messages that could be dequeued right now.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM queue_messages WHERE queue = ? AND dead_lettered = 0 AND visible_at <= ?",
+                (self.name, time.time() if now is None else now),
+            ).fetchone()[0]
+
+    def dead_letters(self, limit: int = 100) -> List[QueueMessage]:
+        """
+        Inspect dead-lettered messages, oldest first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT id, body, dequeue_count, enqueued_at FROM queue_messages
+                WHERE queue = ? AND dead_lettered = 1 ORDER BY enqueued_at LIMIT ?
+                """,
+                (self.name, limit),
+            ).fetchall()
+        return [QueueMessage(*row) for row in rows]
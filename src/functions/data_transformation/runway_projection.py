@@ -0,0 +1,195 @@
+"""
+Monte Carlo runway projection for the whole portfolio.
+
+``calculate_derivative_metrics`` produces a point estimate of ``runway_months``. This module
+simulates thousands of burn and revenue paths per company and reports the distribution of
+cash-out dates. Every company and scenario is simulated together as NumPy arrays of shape
+(companies, scenarios, months); the only loop is over scenario chunks, which bounds memory
+for large portfolios.
+
+Model, per company and month t:
+    burn_t    = burn_0 * exp(sum of N(-sigma_b^2 / 2, sigma_b) shocks)
+    revenue_t = revenue_0 * exp(sum of N(g - sigma_r^2 / 2, sigma_r) shocks)
+    cash_t    = cash_0 - sum over months of (burn_t - (revenue_t - revenue_0))
+
+Cash burn is already net of current revenue, so only revenue growth beyond the starting
+level offsets it. A company runs out of cash in the first month its balance reaches zero.
+
+Requirements Addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+      Derive forward-looking liquidity metrics for portfolio monitoring.
+"""
+
+from datetime import date
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[Sequence[float], np.ndarray, pd.Series]
+DateLike = Union[date, Sequence[date], np.ndarray]
+
+
+def simulate_cash_out_months(
+    cash_balance: ArrayLike,
+    monthly_cash_burn: ArrayLike,
+    monthly_revenue: Optional[ArrayLike] = None,
+    revenue_growth: Union[float, ArrayLike] = 0.0,
+    n_scenarios: int = 5000,
+    horizon_months: int = 60,
+    burn_volatility: float = 0.10,
+    revenue_volatility: float = 0.05,
+    chunk_size: int = 500,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Simulate the month each company runs out of cash under random burn and revenue paths.
+
+    Args:
+        cash_balance (ArrayLike): Current cash balance per company.
+        monthly_cash_burn (ArrayLike): Current monthly net burn per company (positive when burning cash).
+        monthly_revenue (Optional[ArrayLike]): Current monthly revenue per company.
+        revenue_growth (Union[float, ArrayLike]): Expected monthly log growth of revenue, per company or shared.
+        n_scenarios (int): Number of simulated paths per company.
+        horizon_months (int): Number of months to project.
+        burn_volatility (float): Monthly volatility of the burn rate.
+        revenue_volatility (float): Monthly volatility of revenue.
+        chunk_size (int): Scenarios simulated per chunk, trading memory for speed.
+        seed (Optional[int]): Seed for reproducible simulations.
+
+    Returns:
+        np.ndarray: Array of shape (companies, scenarios) with the 1-based cash-out month,
+        or ``np.inf`` where cash lasts beyond the horizon.
+    """
+    cash = np.asarray(cash_balance, dtype=np.float64)[:, np.newaxis, np.newaxis]
+    burn = np.nan_to_num(np.asarray(monthly_cash_burn, dtype=np.float64))[:, np.newaxis, np.newaxis]
+    n_companies = cash.shape[0]
+
+    revenue = None
+    if monthly_revenue is not None:
+        revenue = np.nan_to_num(np.asarray(monthly_revenue, dtype=np.float64))[:, np.newaxis, np.newaxis]
+        growth = np.nan_to_num(np.broadcast_to(np.asarray(revenue_growth, dtype=np.float64), (n_companies,)))
+        revenue_drift = (growth - 0.5 * revenue_volatility ** 2)[:, np.newaxis, np.newaxis]
+
+    rng = np.random.default_rng(seed)
+    cash_out = np.empty((n_companies, n_scenarios), dtype=np.float64)
+    burn_drift = -0.5 * burn_volatility ** 2
+
+    for start in range(0, n_scenarios, chunk_size):
+        size = (n_companies, min(chunk_size, n_scenarios - start), horizon_months)
+
+        net_burn = burn * np.exp(np.cumsum(rng.normal(burn_drift, burn_volatility, size), axis=2))
+        if revenue is not None:
+            revenue_path = revenue * np.exp(np.cumsum(rng.normal(0.0, revenue_volatility, size) + revenue_drift, axis=2))
+            net_burn -= revenue_path - revenue
+
+        depleted = (cash - np.cumsum(net_burn, axis=2)) <= 0
+        first_month = depleted.argmax(axis=2) + 1
+        cash_out[:, start:start + size[1]] = np.where(depleted.any(axis=2), first_month, np.inf)
+
+    return cash_out
+
+
+def summarize_cash_out(
+    cash_out_months: np.ndarray,
+    as_of: DateLike,
+    company_ids: Optional[Sequence] = None,
+    percentiles: Sequence[int] = (10, 50, 90),
+    within_months: Sequence[int] = (12, 24),
+) -> pd.DataFrame:
+    """
+    Summarize simulated cash-out months into per-company distribution statistics.
+
+    Args:
+        cash_out_months (np.ndarray): Output of ``simulate_cash_out_months``.
+        as_of (DateLike): Date the projection starts from, shared or per company.
+        company_ids (Optional[Sequence]): Identifiers for the rows, in simulation order.
+        percentiles (Sequence[int]): Cash-out month percentiles to report.
+        within_months (Sequence[int]): Horizons for which to report the cash-out probability.
+
+    Returns:
+        pd.DataFrame: Per company, 'cash_out_month_p<N>' and 'cash_out_date_p<N>' (NaN/NaT when
+        cash lasts beyond the horizon) and 'cash_out_probability_<M>m' columns.
+    """
+    # 'lower' keeps percentiles on simulated values, so censored paths stay at infinity instead of NaN
+    quantiles = np.percentile(cash_out_months, percentiles, axis=1, method='lower')
+    start_month = np.asarray(as_of, dtype='datetime64[M]')
+
+    summary = pd.DataFrame(index=pd.Index(company_ids, name='company_id') if company_ids is not None else None)
+    for percentile, months in zip(percentiles, quantiles):
+        finite = np.isfinite(months)
+        months = np.where(finite, months, np.nan)
+        summary[f'cash_out_month_p{percentile}'] = months
+        month_starts = start_month + np.where(finite, months, 0).astype(np.int64)
+        # Report the last day of the month in which cash runs out
+        month_ends = (month_starts + 1).astype('datetime64[D]') - np.timedelta64(1, 'D')
+        summary[f'cash_out_date_p{percentile}'] = pd.to_datetime(np.where(finite, month_ends, np.datetime64('NaT')))
+    for horizon in within_months:
+        summary[f'cash_out_probability_{horizon}m'] = (cash_out_months <= horizon).mean(axis=1)
+    return summary
+
+
+def cash_out_histogram(cash_out_months: np.ndarray, horizon_months: int) -> np.ndarray:
+    """
+    Count simulated cash-out events per company and month for dashboard distributions.
+
+    Args:
+        cash_out_months (np.ndarray): Output of ``simulate_cash_out_months``.
+        horizon_months (int): Horizon used for the simulation.
+
+    Returns:
+        np.ndarray: Array of shape (companies, horizon_months + 1); column m - 1 counts paths running
+        out of cash in month m and the last column counts paths surviving the horizon.
+    """
+    n_companies = cash_out_months.shape[0]
+    bins = np.where(np.isfinite(cash_out_months), cash_out_months - 1, horizon_months).astype(np.int64)
+    offsets = np.arange(n_companies)[:, np.newaxis] * (horizon_months + 1)
+    counts = np.bincount((bins + offsets).ravel(), minlength=n_companies * (horizon_months + 1))
+    return counts.reshape(n_companies, horizon_months + 1)
+
+
+def project_runway(
+    df: pd.DataFrame,
+    as_of: Optional[date] = None,
+    n_scenarios: int = 5000,
+    horizon_months: int = 60,
+    seed: Optional[int] = None,
+    **simulation_options,
+) -> pd.DataFrame:
+    """
+    Run the runway simulation for the latest transformed metrics of each company.
+
+    Args:
+        df (pd.DataFrame): Output of the transformation pipeline with 'company_id', 'cash_balance',
+            'monthly_cash_burn', 'total_revenue' and optionally 'revenue_growth' (quarterly, in percent).
+        as_of (Optional[date]): Date the projection starts from. Defaults to each company's latest
+            'fiscal_reporting_date'.
+        n_scenarios (int): Number of simulated paths per company.
+        horizon_months (int): Number of months to project.
+        seed (Optional[int]): Seed for reproducible simulations.
+        **simulation_options: Extra keyword arguments for ``simulate_cash_out_months``.
+
+    Returns:
+        pd.DataFrame: Cash-out distribution summary indexed by company_id.
+    """
+    if 'fiscal_reporting_date' in df:
+        df = df.sort_values('fiscal_reporting_date').drop_duplicates('company_id', keep='last')
+    if 'revenue_growth' in df:
+        # Quarterly percentage growth -> monthly log growth
+        quarterly = np.clip(df['revenue_growth'].fillna(0).to_numpy(dtype=np.float64) / 100, -0.99, None)
+        growth = np.log1p(quarterly) / 3
+    else:
+        growth = 0.0
+    months = simulate_cash_out_months(
+        df['cash_balance'],
+        df['monthly_cash_burn'],
+        monthly_revenue=df['total_revenue'].to_numpy(dtype=np.float64) / 3,
+        revenue_growth=growth,
+        n_scenarios=n_scenarios,
+        horizon_months=horizon_months,
+        seed=seed,
+        **simulation_options,
+    )
+    if as_of is None:
+        as_of = pd.to_datetime(df['fiscal_reporting_date']).to_numpy()
+    return summarize_cash_out(months, as_of, company_ids=df['company_id'].to_numpy())
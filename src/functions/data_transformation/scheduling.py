@@ -0,0 +1,192 @@
+"""
+Backlog-driven scheduling for the transformation runner.
+
+Instead of processing a fixed amount of work on a fixed cadence, each run looks at the
+pending backlog and picks a batch size and the delay before the next batch. Under load the
+runner keeps draining back to back for the whole time budget of an invocation; when nothing
+is pending it backs off exponentially, and timer invocations that fall inside the backoff
+return without even querying the backlog.
+
+Requirements Addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+      Keep derived metrics current at quarter close without wasting executions when idle.
+"""
+
+import logging
+import math
+import os
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+from .queues import MessageConsumer, QueueMessage
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulePlan(NamedTuple):
+    """
+    What the runner should do next.
+
+    Attributes:
+        batch_size (int): Number of items to take in the next batch (0 when idle).
+        next_delay_seconds (float): Time to wait before looking at the backlog again.
+    """
+    batch_size: int
+    next_delay_seconds: float
+
+
+class AdaptiveScheduler:
+    """
+    Chooses batch sizes and delays from the observed backlog.
+
+    Batches grow with the backlog so it can be drained within ``target_drain_batches``
+    batches, bounded by ``min_batch_size`` and ``max_batch_size``. Consecutive idle
+    observations double the delay from ``idle_delay_seconds`` up to ``max_delay_seconds``.
+
+    Args:
+        min_batch_size (int): Smallest batch worth processing.
+        max_batch_size (int): Largest batch processed at once.
+        target_drain_batches (int): Number of batches a backlog should be drained in.
+        busy_delay_seconds (float): Pause between batches while work remains.
+        idle_delay_seconds (float): Delay after the first idle observation.
+        max_delay_seconds (float): Upper bound for the idle backoff.
+    """
+
+    def __init__(
+        self,
+        min_batch_size: int = 50,
+        max_batch_size: int = 2000,
+        target_drain_batches: int = 10,
+        busy_delay_seconds: float = 0.0,
+        idle_delay_seconds: float = 5.0,
+        max_delay_seconds: float = 120.0,
+    ):
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.target_drain_batches = target_drain_batches
+        self.busy_delay_seconds = busy_delay_seconds
+        self.idle_delay_seconds = idle_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.next_check_at = float('-inf')
+        self._idle_streak = 0
+
+    @classmethod
+    def from_env(cls) -> 'AdaptiveScheduler':
+        """
+        Build a scheduler from the TRANSFORMATION_* environment variables.
+        """
+        return cls(
+            min_batch_size=int(os.environ.get("TRANSFORMATION_MIN_BATCH_SIZE", 50)),
+            max_batch_size=int(os.environ.get("TRANSFORMATION_MAX_BATCH_SIZE", 2000)),
+            idle_delay_seconds=float(os.environ.get("TRANSFORMATION_IDLE_DELAY_SECONDS", 5.0)),
+            max_delay_seconds=float(os.environ.get("TRANSFORMATION_MAX_IDLE_DELAY_SECONDS", 120.0)),
+        )
+
+    def plan(self, backlog: int) -> SchedulePlan:
+        """
+        Plan the next step for the given backlog size.
+
+        Args:
+            backlog (int): Number of pending items.
+
+        Returns:
+            SchedulePlan: Batch size and delay before the next step.
+        """
+        if backlog <= 0:
+            self._idle_streak += 1
+            delay = min(self.max_delay_seconds, self.idle_delay_seconds * 2 ** (self._idle_streak - 1))
+            return SchedulePlan(0, delay)
+
+        self._idle_streak = 0
+        batch_size = math.ceil(backlog / self.target_drain_batches)
+        batch_size = max(self.min_batch_size, min(self.max_batch_size, batch_size))
+        return SchedulePlan(min(batch_size, backlog), self.busy_delay_seconds)
+
+
+def drain_backlog(
+    source: MessageConsumer,
+    process_batch: Callable[[List[QueueMessage]], None],
+    scheduler: Optional[AdaptiveScheduler] = None,
+    time_budget_seconds: float = 240.0,
+    visibility_timeout: float = 300.0,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+    is_poison: Optional[Callable[[Exception], bool]] = None,
+) -> int:
+    """
+    Process the source's backlog until it is empty or the time budget runs out.
+
+    Acknowledges each batch after ``process_batch`` succeeds and releases it on failure.
+    When a batch fails with an error ``is_poison`` accepts, its messages are retried one at a
+    time instead, and those that still fail are dead-lettered so they do not block the rest of
+    the backlog. When the scheduler is still backing off from an earlier idle check, returns immediately.
+
+    Args:
+        source (MessageConsumer): Queue holding pending work.
+        process_batch (Callable): Handles a leased batch of messages.
+        scheduler (Optional[AdaptiveScheduler]): Scheduler to consult; a default one is created when omitted.
+        time_budget_seconds (float): Maximum time to keep draining in this invocation.
+        visibility_timeout (float): Lease duration for dequeued messages.
+        clock (Callable): Monotonic clock, injectable for tests.
+        sleep (Callable): Sleep function, injectable for tests.
+        is_poison (Optional[Callable]): Whether an error was caused by the messages themselves rather
+            than by an unavailable dependency. Without it, every failure releases the batch and is raised.
+
+    Returns:
+        int: Number of messages processed.
+    """
+    scheduler = scheduler or AdaptiveScheduler()
+    now = clock()
+    if now < scheduler.next_check_at:
+        return 0
+    deadline = now + time_budget_seconds
+    processed = 0
+
+    while True:
+        plan = scheduler.plan(source.depth())
+        if plan.batch_size == 0:
+            # Nothing pending: skip timer invocations until the backoff has elapsed
+            scheduler.next_check_at = clock() + plan.next_delay_seconds
+            logger.info(f"No pending backlog after processing {processed} messages")
+            return processed
+
+        messages = source.dequeue_batch(plan.batch_size, visibility_timeout)
+        if messages:
+            try:
+                process_batch(messages)
+            except Exception as error:
+                if is_poison is None or not is_poison(error):
+                    source.release(message.id for message in messages)
+                    raise
+                _process_each(source, messages, process_batch, is_poison)
+            else:
+                source.ack(message.id for message in messages)
+            processed += len(messages)
+
+        if clock() + plan.next_delay_seconds >= deadline:
+            logger.info(f"Time budget exhausted after processing {processed} messages")
+            return processed
+        if plan.next_delay_seconds:
+            sleep(plan.next_delay_seconds)
+        elif not messages:
+            # Everything pending is leased by other workers; yield briefly instead of spinning
+            sleep(min(1.0, scheduler.idle_delay_seconds))
+
+
+def _process_each(
+    source: MessageConsumer,
+    messages: List[QueueMessage],
+    process_batch: Callable[[List[QueueMessage]], None],
+    is_poison: Callable[[Exception], bool],
+) -> None:
+    for index, message in enumerate(messages):
+        try:
+            process_batch([message])
+        except Exception as error:
+            if not is_poison(error):
+                source.release(pending.id for pending in messages[index:])
+                raise
+            logger.error(f"Dead-lettering message {message.id}: {error!r}")
+            source.dead_letter([message.id], repr(error))
+        else:
+            source.ack([message.id])
@@ -0,0 +1,190 @@
+import asyncio
+import json
+from datetime import date, datetime
+from uuid import uuid4
+
+import pytest
+
+from .. import change_events
+from ..change_events import ChangeCoalescer, ChangeEvent, parse_payload, recompute, run_listener
+from ..main import recompute_changes
+from ..queues import SQLiteQueue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parse_payload():
+    """
+    Notification payloads are decoded into change events.
+    Requirement: Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    company_id = str(uuid4())
+    assert parse_payload(json.dumps([[company_id, "2023-03-31"]])) == [ChangeEvent(company_id, date(2023, 3, 31))]
+
+
+def test_burst_is_coalesced_per_company():
+    clock = FakeClock()
+    coalescer = ChangeCoalescer(quiet_seconds=2, max_delay_seconds=10, clock=clock)
+    coalescer.add([ChangeEvent("a", date(2023, 6, 30)), ChangeEvent("b", date(2023, 3, 31))])
+    clock.now = 1.0
+    coalescer.add([ChangeEvent("a", date(2023, 3, 31))])
+
+    clock.now = 2.5
+    # "b" has been quiet for 2 seconds, "a" received an event a second ago
+    assert coalescer.pop_due() == [ChangeEvent("b", date(2023, 3, 31))]
+    assert coalescer.next_due() == 3.0
+
+    clock.now = 3.0
+    assert coalescer.pop_due() == [ChangeEvent("a", date(2023, 3, 31))]
+    assert len(coalescer) == 0
+    assert coalescer.next_due() is None
+
+
+def test_steady_stream_is_bounded_by_max_delay():
+    clock = FakeClock()
+    coalescer = ChangeCoalescer(quiet_seconds=2, max_delay_seconds=5, clock=clock)
+    for second in range(6):
+        clock.now = float(second)
+        coalescer.add([ChangeEvent("a", date(2023, 3, 31))])
+        due = coalescer.pop_due()
+    assert due == [ChangeEvent("a", date(2023, 3, 31))]
+
+
+def test_failed_recompute_is_retried_with_backoff():
+    """
+    Failed companies are requeued and retried after a backoff that doubles with each failure.
+    Requirement: Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    clock = FakeClock()
+    coalescer = ChangeCoalescer(quiet_seconds=2, max_delay_seconds=10, retry_seconds=5, max_retry_seconds=15, clock=clock)
+    event = ChangeEvent("a", date(2023, 3, 31))
+
+    delays = []
+    for _ in range(4):
+        coalescer.requeue([event])
+        delays.append(coalescer.next_due() - clock.now)
+        clock.now = coalescer.next_due()
+        assert coalescer.pop_due() == [event]
+    assert delays == [5, 10, 15, 15]
+
+    # A new event for the company does not cut its backoff short
+    coalescer.requeue([event])
+    coalescer.add([ChangeEvent("a", date(2022, 12, 31))])
+    assert coalescer.next_due() == clock.now + 15
+
+    coalescer.succeeded([event])
+    coalescer.pop_due()
+    clock.now += 15
+    coalescer.pop_due()
+    coalescer.requeue([event])
+    assert coalescer.next_due() == clock.now + 5
+
+
+def metrics_record(company_id, reporting_date, revenue):
+    return {
+        "id": str(uuid4()), "company_id": company_id, "currency": "USD",
+        "fiscal_reporting_date": reporting_date.isoformat(), "fiscal_reporting_quarter": 1,
+        "reporting_year": reporting_date.year, "reporting_quarter": 1, "total_revenue": revenue,
+        "recurring_revenue": revenue * 0.8, "gross_profit": revenue * 0.6, "sales_marketing_expense": revenue * 0.3,
+        "total_operating_expense": revenue * 1.1, "ebitda": -revenue * 0.1, "net_income": -revenue * 0.12,
+        "cash_burn": -revenue * 0.15, "cash_balance": revenue * 3, "employees": 50,
+    }
+
+
+@pytest.mark.asyncio
+async def test_recompute_publishes_changed_periods_only(tmp_path, mocker):
+    company_id = str(uuid4())
+    store = mocker.Mock(fetch_changed=mocker.Mock(return_value=[
+        metrics_record(company_id, date(2022, 12, 31), 1000.0),
+        metrics_record(company_id, date(2023, 3, 31), 1100.0),
+    ]))
+    fx_client = mocker.Mock(get_snapshot=mocker.AsyncMock(return_value=None))
+    transform = mocker.patch(f"{recompute_changes.__module__}.transform_with_store", side_effect=lambda store, records, snapshot, currencies: records)
+    sink = SQLiteQueue(str(tmp_path / "results.db"))
+
+    batch = [ChangeEvent(company_id, date(2023, 3, 31))]
+    published = await recompute(batch, sink, fx_client, store)
+
+    # The previous period is read as the growth baseline but not republished
+    assert len(transform.call_args.args[1]) == 2
+    assert published == 1
+    message = sink.dequeue_batch(10)[0]
+    assert json.loads(message.body)["fiscal_reporting_date"] == "2023-03-31"
+    store.fetch_changed.assert_called_once_with(batch)
+    saved = store.save_results.call_args.args[0]
+    assert [record["fiscal_reporting_date"] for record in saved] == ["2023-03-31"]
+    sink.close()
+
+
+class FakeListener:
+    """
+    Stand-in for an asyncpg listening connection that can be dropped.
+    """
+
+    def __init__(self, now):
+        self.now = now
+        self.closed = False
+        self.on_termination = None
+
+    async def add_listener(self, channel, callback):
+        self.callback = callback
+
+    async def remove_listener(self, channel, callback):
+        pass
+
+    def add_termination_listener(self, callback):
+        self.on_termination = callback
+
+    async def fetchval(self, query):
+        return self.now
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    def drop(self):
+        self.closed = True
+        self.on_termination(self)
+
+
+@pytest.mark.asyncio
+async def test_listener_reconnects_and_catches_up(mocker):
+    """
+    After the listening connection drops, the listener reconnects and queues the companies changed meanwhile.
+    Requirement: Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    checkpoint = datetime(2023, 4, 1, 12, 0)
+    listeners = [FakeListener(checkpoint), FakeListener(datetime(2023, 4, 1, 12, 5))]
+    connect = mocker.patch.object(change_events.asyncpg, "connect", side_effect=listeners)
+    missed = ChangeEvent(str(uuid4()), date(2023, 3, 31))
+    store = mocker.Mock(changed_since=mocker.Mock(return_value=[missed]), connection=mocker.Mock(closed=0))
+    mocker.patch.object(change_events.MetricsStore, "connect", return_value=store)
+    mocker.patch.object(change_events.FXClient, "from_env", return_value=mocker.Mock(close=mocker.AsyncMock()))
+    stop = asyncio.Event()
+    recomputed = []
+
+    async def fake_recompute(batch, sink, fx_client, store):
+        recomputed.extend(batch)
+        stop.set()
+        return 0
+
+    mocker.patch.object(change_events, "recompute", side_effect=fake_recompute)
+    coalescer = ChangeCoalescer(quiet_seconds=0, max_delay_seconds=0)
+
+    task = asyncio.create_task(run_listener("postgresql://", coalescer=coalescer, stop=stop, reconnect_seconds=0))
+    await asyncio.sleep(0.05)
+    listeners[0].drop()
+    await asyncio.wait_for(task, 5)
+
+    assert connect.call_count == 2
+    store.changed_since.assert_called_once_with(datetime(2023, 4, 1, 11, 59))
+    assert recomputed == [missed]
+    store.close.assert_called_once()
@@ -0,0 +1,133 @@
+import pytest
+import pandas as pd
+from datetime import date
+from src.functions.data_transformation.conversions import (
+    FX_VERSION_COLUMN, ConversionFactors, CurrencyConversions, apply_fx_revision, fx_dependencies, parse_currency_list
+)
+from src.functions.data_transformation.fx_rates import FXSnapshot
+
+@pytest.fixture
+def metrics_frame():
+    return pd.DataFrame([
+        {"company_id": "a", "currency": "USD", "total_revenue": 100.0, "ebitda": -10.0},
+        {"company_id": "b", "currency": "CAD", "total_revenue": 125.0, "ebitda": 25.0},
+    ])
+
+@pytest.fixture
+def snapshot():
+    return FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.25, "EUR": 0.85, "GBP": 0.75})
+
+def test_parse_currency_list():
+    assert parse_currency_list(" usd,CAD, ,eur,USD") == ["USD", "CAD", "EUR"]
+    assert parse_currency_list(None) == []
+
+def test_only_requested_currencies_are_computed(metrics_frame, snapshot):
+    """
+    Conversion factors are only gathered for the currencies a consumer asks for.
+    
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    factors = ConversionFactors()
+    conversions = CurrencyConversions(metrics_frame, snapshot, factors=factors)
+    assert factors.currencies == []
+
+    eur = conversions.get("EUR")
+    assert list(eur.columns) == ["total_revenue_EUR", "ebitda_EUR"]
+    assert list(eur["total_revenue_EUR"]) == pytest.approx([85.0, 85.0])
+    assert factors.currencies == ["EUR"]
+
+def test_factors_are_shared_across_batches(metrics_frame, snapshot):
+    """
+    A later batch reuses the factors cached for the same snapshot version.
+    """
+    factors = ConversionFactors()
+    first = factors.get(snapshot, "GBP")
+    CurrencyConversions(metrics_frame.iloc[:1], snapshot, factors=factors).get("GBP")
+    assert factors.get(FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.25, "EUR": 0.85, "GBP": 0.75}), "GBP") is first
+
+def test_materialize_skips_currencies_already_reported():
+    df = pd.DataFrame([{"currency": "USD", "total_revenue": 100.0}])
+    conversions = CurrencyConversions(df, FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.25}), factors=ConversionFactors())
+    result = conversions.materialize(["USD", "CAD"])
+    assert list(result.columns) == ["total_revenue_CAD"]
+
+def test_unknown_source_currency_is_not_convertible(snapshot):
+    """
+    A row in a currency missing from the snapshot gets NaN conversions instead of failing the batch.
+    """
+    df = pd.DataFrame([
+        {"currency": "USD", "total_revenue": 100.0},
+        {"currency": "usd", "total_revenue": 100.0},
+        {"currency": "XXX", "total_revenue": 100.0},
+    ])
+    # Nothing is resolved until a conversion is requested
+    assert CurrencyConversions(df, snapshot, factors=ConversionFactors()).materialize([]).columns.empty
+
+    conversions = CurrencyConversions(df, snapshot, factors=ConversionFactors())
+    converted = conversions.get("EUR")["total_revenue_EUR"]
+
+    assert converted[0] == pytest.approx(85.0)
+    assert converted[1:].isna().all()
+    assert list(conversions.convertible) == [True, False, False]
+    assert conversions.unknown_currencies == ["XXX", "usd"]
+
+def test_new_snapshot_version_invalidates_factors(metrics_frame, snapshot):
+    """
+    A revised FX snapshot drops the factors cached for the previous version.
+    """
+    factors = ConversionFactors()
+    CurrencyConversions(metrics_frame, snapshot, factors=factors).get("GBP")
+
+    revised = FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.25, "EUR": 0.85, "GBP": 0.80})
+    conversions = CurrencyConversions(metrics_frame, revised, factors=factors)
+    assert factors.version == snapshot.version
+    assert list(conversions.get("GBP")["total_revenue_GBP"]) == pytest.approx([80.0, 80.0])
+    assert factors.version == revised.version
+    assert factors.currencies == ["GBP"]
+
+def test_fx_dependencies():
+    columns = ["total_revenue", "revenue_per_fte", "total_revenue_CAD", "revenue_per_fte_CAD", "arr", "arr_XYZ"]
+    assert fx_dependencies(columns, ["USD", "CAD"]) == {
+        "total_revenue_CAD": ("total_revenue", "CAD"),
+        "revenue_per_fte_CAD": ("revenue_per_fte", "CAD"),
+    }
+
+def test_apply_fx_revision_only_touches_converted_columns_on_affected_dates():
+    """
+    An FX revision rewrites converted columns for the revised date and nothing else.
+    
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    original = FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.25})
+    df = pd.DataFrame([
+        {"currency": "USD", "fiscal_reporting_date": "2023-03-31", "total_revenue": 100.0,
+         "total_revenue_CAD": 125.0, "arr": 400.0, FX_VERSION_COLUMN: original.version},
+        {"currency": "USD", "fiscal_reporting_date": "2023-06-30", "total_revenue": 200.0,
+         "total_revenue_CAD": 250.0, "arr": 800.0, FX_VERSION_COLUMN: original.version},
+    ])
+
+    revised = FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.30}, as_of=date(2023, 6, 30))
+    recomputed = apply_fx_revision(df, revised)
+
+    assert list(recomputed) == [1]
+    assert list(df["total_revenue_CAD"]) == pytest.approx([125.0, 260.0])
+    assert list(df["arr"]) == pytest.approx([400.0, 800.0])
+    assert list(df[FX_VERSION_COLUMN]) == [original.version, revised.version]
+
+    # Re-applying the same snapshot is a no-op
+    assert apply_fx_revision(df, revised).empty
+
+def test_apply_fx_revision_without_date_column_recomputes_stale_rows():
+    original = FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.25})
+    revised = FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.30}, as_of=date(2023, 6, 30))
+    df = pd.DataFrame([
+        {"currency": "USD", "total_revenue": 100.0, "total_revenue_CAD": 125.0, FX_VERSION_COLUMN: original.version},
+        {"currency": "USD", "total_revenue": 200.0, "total_revenue_CAD": 260.0, FX_VERSION_COLUMN: revised.version},
+    ])
+
+    recomputed = apply_fx_revision(df, revised)
+
+    assert list(recomputed) == [0]
+    assert list(df["total_revenue_CAD"]) == pytest.approx([130.0, 260.0])
@@ -0,0 +1,52 @@
+import pytest
+import pandas as pd
+from src.functions.data_transformation.data_quality import screen_metrics
+
+@pytest.fixture
+def history():
+    revenue = [100.0, 104.0, 98.0, 102.0, 101.0, 99.0]
+    dates = pd.date_range("2021-03-31", periods=len(revenue), freq="QE")
+    return pd.DataFrame({
+        "company_id": "a",
+        "fiscal_reporting_date": dates,
+        "total_revenue": revenue,
+        "gross_profit": [r * 0.6 for r in revenue],
+        "employees": 20,
+    })
+
+def test_plausibility_rules():
+    """
+    Hard plausibility rules flag rows regardless of history.
+    
+    Requirements addressed:
+    - Data Consistency and Integrity (Technical Requirements/Feature 12: Data Consistency and Integrity)
+    """
+    incoming = pd.DataFrame([
+        {"company_id": "a", "total_revenue": 100.0, "gross_profit": 60.0, "employees": 10},
+        {"company_id": "b", "total_revenue": 100.0, "gross_profit": 120.0, "employees": -1},
+    ])
+    result = screen_metrics(incoming)
+    assert list(result["dq_suspicious"]) == [False, True]
+    assert result.loc[1, "dq_flags"] == "negative_employees,gross_profit_exceeds_revenue"
+    assert result.loc[0, "dq_flags"] == ""
+
+def test_revenue_spike_against_company_history(history):
+    incoming = pd.DataFrame([
+        {"company_id": "a", "fiscal_reporting_date": "2022-09-30", "total_revenue": 1000.0, "gross_profit": 600.0, "employees": 20},
+        {"company_id": "b", "fiscal_reporting_date": "2022-09-30", "total_revenue": 1000.0, "gross_profit": 600.0, "employees": 20},
+    ], index=[10, 11])
+    result = screen_metrics(incoming, history)
+
+    assert result.loc[10, "dq_suspicious"]
+    assert "total_revenue_outlier" in result.loc[10, "dq_flags"].split(",")
+    assert result.loc[10, "dq_score"] > 4
+    # No history for company b, so it is not scored
+    assert not result.loc[11, "dq_suspicious"]
+    assert result.loc[11, "dq_score"] == 0
+
+def test_consistent_submission_passes(history):
+    incoming = pd.DataFrame([
+        {"company_id": "a", "fiscal_reporting_date": "2022-09-30", "total_revenue": 103.0, "gross_profit": 61.0, "employees": 20},
+    ])
+    result = screen_metrics(incoming, history)
+    assert not result.loc[0, "dq_suspicious"]
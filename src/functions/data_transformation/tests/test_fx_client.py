@@ -0,0 +1,196 @@
+import asyncio
+import pytest
+import requests
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from src.functions.data_transformation.fx_client import FXClient, FXClientError
+
+RATES = {"USD": 1.0, "CAD": 1.25, "EUR": 0.85}
+
+async def start_stub(handler):
+    """
+    Start a local stub of the FX rates API serving ``handler`` on /latest.
+    """
+    app = web.Application()
+    app.router.add_get("/latest", handler)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+@pytest.mark.asyncio
+async def test_get_snapshot():
+    """
+    Fetches rates from the stub server and builds a snapshot.
+    
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    async def handler(request):
+        assert request.headers["Authorization"] == "Bearer test-key"
+        return web.json_response({"rates": RATES})
+
+    server = await start_stub(handler)
+    try:
+        async with FXClient(str(server.make_url("/latest")), api_key="test-key") as client:
+            snapshot = await client.get_snapshot()
+        assert snapshot.cross_rates("USD", "CAD")[0] == pytest.approx(1.25)
+    finally:
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_retries_transient_failures():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return web.Response(status=503)
+        return web.json_response({"rates": RATES})
+
+    server = await start_stub(handler)
+    try:
+        async with FXClient(str(server.make_url("/latest")), backoff_base=0.01) as client:
+            snapshot = await client.get_snapshot()
+        assert len(calls) == 3
+        assert "EUR" in snapshot
+    finally:
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        return web.Response(status=401)
+
+    server = await start_stub(handler)
+    try:
+        async with FXClient(str(server.make_url("/latest")), backoff_base=0.01) as client:
+            with pytest.raises(FXClientError):
+                await client.get_snapshot()
+        assert len(calls) == 1
+    finally:
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_timeout_exhausts_retries():
+    async def handler(request):
+        await asyncio.sleep(1)
+        return web.json_response({"rates": RATES})
+
+    server = await start_stub(handler)
+    try:
+        async with FXClient(str(server.make_url("/latest")), timeout=0.05, max_retries=1, backoff_base=0.01) as client:
+            with pytest.raises(FXClientError):
+                await client.get_snapshot()
+    finally:
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_coalesced():
+    """
+    Concurrent callers asking for the same snapshot share a single API request.
+    """
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.05)
+        return web.json_response({"rates": RATES})
+
+    server = await start_stub(handler)
+    try:
+        async with FXClient(str(server.make_url("/latest"))) as client:
+            snapshots = await asyncio.gather(*(client.get_snapshot() for _ in range(10)))
+        assert len(calls) == 1
+        assert len({snapshot.version for snapshot in snapshots}) == 1
+    finally:
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_malformed_payload_raises_client_error():
+    async def handler(request):
+        return web.json_response({"error": "quota exceeded"})
+
+    server = await start_stub(handler)
+    try:
+        async with FXClient(str(server.make_url("/latest"))) as client:
+            with pytest.raises(FXClientError):
+                await client.get_snapshot()
+    finally:
+        await server.close()
+
+@pytest.mark.asyncio
+async def test_blocking_fetch_reuses_pooled_connection():
+    """
+    The synchronous fetch keeps one pooled session, so repeated fetches reuse the connection.
+    
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    peers = []
+
+    async def handler(request):
+        peers.append(request.transport.get_extra_info("peername"))
+        return web.json_response({"rates": RATES})
+
+    server = await start_stub(handler)
+    client = FXClient(str(server.make_url("/latest")), api_key="secret")
+    loop = asyncio.get_running_loop()
+    try:
+        first = await loop.run_in_executor(None, client.get_snapshot_blocking)
+        second = await loop.run_in_executor(None, client.get_snapshot_blocking)
+    finally:
+        client.close_blocking()
+        await server.close()
+
+    assert "CAD" in first and first.version == second.version
+    assert len(peers) == 2 and peers[0] == peers[1]
+
+@pytest.mark.asyncio
+async def test_blocking_fetch_enforces_attempt_deadline():
+    """
+    A response that trickles in fast enough to beat the per-read timeout still fails the attempt at its deadline.
+    """
+    async def handler(request):
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        await response.prepare(request)
+        for _ in range(20):
+            await response.write(b" ")
+            await asyncio.sleep(0.1)
+        await response.write(b'{"rates": {"USD": 1.0}}')
+        return response
+
+    server = await start_stub(handler)
+    client = FXClient(str(server.make_url("/latest")), timeout=0.5, connect_timeout=0.2, max_retries=1, backoff_base=0.001)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        with pytest.raises(FXClientError):
+            await loop.run_in_executor(None, client.get_snapshot_blocking)
+    finally:
+        client.close_blocking()
+        await server.close()
+
+    # Two attempts of 0.5s each, rather than the 2s the response takes
+    assert loop.time() - started < 1.5
+
+def test_blocking_fetch_retries_with_timeout(mocker):
+    response = mocker.MagicMock(content=b'{"rates": {"USD": 1.0, "CAD": 1.25}}')
+    response.__enter__.return_value = response
+    get = mocker.patch("requests.Session.get", side_effect=[requests.ConnectionError("reset"), response])
+    client = FXClient("http://fx.invalid/latest", timeout=3, connect_timeout=1, backoff_base=0.001)
+
+    snapshot = client.get_snapshot_blocking()
+
+    assert "CAD" in snapshot
+    assert get.call_count == 2
+    assert get.call_args.kwargs["timeout"] == (1, 2)
+
+def test_blocking_fetch_rejects_malformed_payload(mocker):
+    response = mocker.MagicMock(content=b'{"rates": "n/a"}')
+    response.__enter__.return_value = response
+    mocker.patch("requests.Session.get", return_value=response)
+    with pytest.raises(FXClientError):
+        FXClient("http://fx.invalid/latest").get_snapshot_blocking()
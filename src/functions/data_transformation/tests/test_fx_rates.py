@@ -0,0 +1,61 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.functions.data_transformation.fx_rates import FXSnapshot
+from src.functions.data_transformation.main import convert_currencies
+
+@pytest.fixture
+def snapshot():
+    return FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.25, "EUR": 0.85})
+
+def test_cross_rate_matrix(snapshot):
+    """
+    Verifies that the snapshot matrix holds every pairwise conversion factor.
+    
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    assert snapshot.matrix.shape == (3, 3)
+    assert np.allclose(np.diag(snapshot.matrix), 1.0)
+    assert snapshot.matrix[snapshot.index["USD"], snapshot.index["CAD"]] == pytest.approx(1.25)
+    assert snapshot.matrix[snapshot.index["CAD"], snapshot.index["EUR"]] == pytest.approx(0.85 / 1.25)
+
+def test_mixed_source_currencies(snapshot):
+    """
+    Converts a batch with mixed source currencies in one gather.
+    """
+    amounts = np.array([100.0, 125.0, 85.0])
+    converted = snapshot.convert(amounts, ["USD", "CAD", "EUR"], "USD")
+    assert converted == pytest.approx([100.0, 100.0, 100.0])
+
+def test_version_is_content_derived():
+    """
+    Identical rates share a version id; revised rates get a new one.
+    """
+    first = FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.25})
+    same = FXSnapshot.from_rates({"CAD": 1.25, "USD": 1.0})
+    revised = FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.30})
+    assert first.version == same.version
+    assert first.version != revised.version
+
+def test_unknown_currency(snapshot):
+    with pytest.raises(ValueError):
+        snapshot.indices(["USD", "XYZ"])
+
+def test_invalid_rates():
+    with pytest.raises(ValueError):
+        FXSnapshot.from_rates({})
+    with pytest.raises(ValueError):
+        FXSnapshot.from_rates({"USD": 1.0, "CAD": 0.0})
+
+def test_convert_currencies_frame(snapshot):
+    """
+    Checks that convert_currencies adds converted columns per target currency.
+    """
+    df = pd.DataFrame([
+        {"company_id": "a", "currency": "USD", "total_revenue": 100.0},
+        {"company_id": "b", "currency": "CAD", "total_revenue": 125.0},
+    ])
+    result = convert_currencies(df, snapshot, ["USD", "CAD"])
+    assert list(result["total_revenue_USD"]) == pytest.approx([100.0, 100.0])
+    assert list(result["total_revenue_CAD"]) == pytest.approx([125.0, 125.0])
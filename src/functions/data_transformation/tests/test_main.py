@@ -29,6 +29,15 @@ def mock_input_data():
         "customers": None
     }
 
+def fx_response(rates):
+    """
+    Mocked streamed response of the FX client's pooled session carrying the given rates.
+    """
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.content = json.dumps({"rates": rates}).encode()
+    return response
+
 @pytest.fixture
 def mock_fx_rates():
     return {
@@ -37,7 +46,7 @@ def mock_fx_rates():
         "EUR": 0.85
     }
 
-@patch('requests.get')
+@patch('requests.Session.get')
 def test_transform_data(mock_get, mock_input_data, mock_fx_rates):
     """
     Tests the transform_data function to ensure it correctly performs data transformation tasks.
@@ -51,9 +60,7 @@ def test_transform_data(mock_get, mock_input_data, mock_fx_rates):
     - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
     """
     # Mock the FX rates API response
-    mock_response = MagicMock()
-    mock_response.json.return_value = {"rates": mock_fx_rates}
-    mock_get.return_value = mock_response
+    mock_get.return_value = fx_response(mock_fx_rates)
 
     # Call the transform_data function
     result = transform_data(mock_input_data)
@@ -95,10 +102,8 @@ def test_currency_conversion(mock_input_data, mock_fx_rates, currency):
     Requirements addressed:
     - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
     """
-    with patch('requests.get') as mock_get:
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"rates": mock_fx_rates}
-        mock_get.return_value = mock_response
+    with patch('requests.Session.get') as mock_get:
+        mock_get.return_value = fx_response(mock_fx_rates)
 
         result = transform_data(mock_input_data)
 
@@ -114,10 +119,8 @@ def test_derivative_calculations(mock_input_data):
     Requirements addressed:
     - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
     """
-    with patch('requests.get') as mock_get:
-        mock_response = MagicMock()
-        mock_response.json.return_value = {"rates": {"USD": 1.0, "CAD": 1.0, "EUR": 1.0}}
-        mock_get.return_value = mock_response
+    with patch('requests.Session.get') as mock_get:
+        mock_get.return_value = fx_response({"USD": 1.0, "CAD": 1.0, "EUR": 1.0})
 
         result = transform_data(mock_input_data)
 
@@ -148,7 +151,7 @@ def test_error_handling():
     Requirements addressed:
     - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
     """
-    with patch('requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         # Simulate a failed API request
         mock_get.side_effect = Exception("API request failed")
 
@@ -0,0 +1,360 @@
+import importlib
+import math
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.functions.data_transformation.fx_rates import FXSnapshot
+from src.functions.data_transformation import metrics_store
+from src.functions.data_transformation.main import transform_with_store
+from src.functions.data_transformation.metrics_store import BACKLOG_START, MetricsInputBacklog, MetricsStore, company_uuids
+
+# The package re-exports the HTTP entry point as ``main``, which shadows the module
+transformation = importlib.import_module("src.functions.data_transformation.main")
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, params=None):
+        self.connection.executed.append((" ".join(query.split()), params))
+
+    def fetchall(self):
+        return self.connection.results.pop(0) if self.connection.results else []
+
+
+class FakeConnection:
+    """
+    Records executed statements and answers fetches with queued result sets.
+    """
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.executed = []
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def test_company_uuids_skips_ids_that_cannot_be_stored():
+    company_id = str(uuid4())
+    assert company_uuids([company_id, "reciLI8sBuJE9vEAv", company_id.upper(), None]) == [company_id]
+
+
+def test_transform_with_store_aligns_calendar_quarters():
+    """
+    Year ends of the batch's companies are loaded, so records are always tagged with their calendar quarter.
+
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    company_id = str(uuid4())
+    connection = FakeConnection([{"company_id": company_id, "year_end_date": date(2023, 6, 30)}])
+    record = {
+        "company_id": company_id, "currency": "USD", "fiscal_reporting_date": "2023-03-31", "fiscal_reporting_quarter": 3,
+        "total_revenue": 100.0, "recurring_revenue": 80.0, "gross_profit": 60.0, "sales_marketing_expense": 30.0,
+        "total_operating_expense": 110.0, "cash_burn": -15.0, "cash_balance": 300.0, "employees": 5,
+    }
+
+    result = transform_with_store(MetricsStore(connection), [record], FXSnapshot.from_rates({"USD": 1.0}))[0]
+
+    assert (result["calendar_year"], result["calendar_quarter"]) == (2023, 1)
+    assert connection.executed[0][1] == ([company_id],)
+
+
+def test_transform_with_store_screens_against_stored_history():
+    """
+    Incoming rows are screened against the company's stored periods before the batch.
+
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    company_id = str(uuid4())
+    history = [
+        {"company_id": company_id, "fiscal_reporting_date": date(2022, month, 28), "total_revenue": revenue,
+         "gross_profit": None, "employees": None, "total_operating_expense": None, "cash_burn": None}
+        for month, revenue in [(3, 100.0), (6, 104.0), (9, 98.0), (12, 102.0)]
+    ]
+    connection = FakeConnection([], history)
+    record = {
+        "company_id": company_id, "currency": "USD", "fiscal_reporting_date": "2023-03-31", "fiscal_reporting_quarter": 1,
+        "total_revenue": 10000.0, "recurring_revenue": 80.0, "gross_profit": 60.0, "sales_marketing_expense": 30.0,
+        "total_operating_expense": 110.0, "cash_burn": -15.0, "cash_balance": 300.0, "employees": 5,
+    }
+
+    result = transform_with_store(MetricsStore(connection), [record], FXSnapshot.from_rates({"USD": 1.0}))[0]
+
+    assert "total_revenue_outlier" in result["dq_flags"]
+    assert connection.executed[1][1] == ([company_id], [date(2023, 3, 31)], 8)
+
+
+def test_save_results_upserts_derived_metrics(mocker):
+    """
+    Derived metrics are upserted per company, currency and period, with non-finite values stored as NULL.
+
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    execute_values = mocker.patch.object(metrics_store, "execute_values")
+    company_id = str(uuid4())
+    record = {
+        "company_id": company_id, "currency": "USD", "fiscal_reporting_date": "2023-03-31",
+        "fiscal_reporting_quarter": 1, "reporting_year": 2023, "reporting_quarter": 1,
+        "arr": 400.0, "runway_months": math.inf, "revenue_growth": math.nan,
+    }
+    unstorable = dict(record, company_id="reciLI8sBuJE9vEAv")
+
+    saved = MetricsStore(FakeConnection()).save_results([dict(record, arr=100.0), record, unstorable])
+
+    assert saved == 1
+    query, rows = execute_values.call_args.args[1:]
+    assert "ON CONFLICT (company_id, currency, fiscal_reporting_date) DO UPDATE" in query
+    columns = metrics_store.RESULT_KEYS + metrics_store.RESULT_PERIOD_COLUMNS + metrics_store.DERIVED_METRICS + ("created_by",)
+    row = dict(zip(columns, rows[0]))
+    assert len(rows) == 1
+    assert (row["arr"], row["runway_months"], row["revenue_growth"]) == (400.0, None, None)
+    assert row["created_by"] == "data_transformation"
+
+
+def test_save_conversions_stamps_rate_and_snapshot_version(mocker):
+    execute_values = mocker.patch.object(metrics_store, "execute_values")
+    snapshot = FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.25, "EUR": 0.8})
+    record = {
+        "company_id": str(uuid4()), "currency": "USD", "fiscal_reporting_date": "2023-03-31",
+        "fiscal_reporting_quarter": 1, "reporting_year": 2023, "reporting_quarter": 1,
+        "total_revenue": 100.0, "total_revenue_CAD": 125.0, "cash_balance": 300.0, "cash_balance_CAD": 375.0,
+    }
+
+    # EUR has no converted columns on the record and is not saved
+    saved = MetricsStore(FakeConnection()).save_conversions([record], snapshot, ["USD", "CAD", "EUR", "JPY"])
+
+    assert saved == 2
+    rows = {row[1]: dict(zip(metrics_store.CONVERSION_COLUMNS, row)) for row in execute_values.call_args.args[2]}
+    assert (rows["USD"]["exchange_rate_used"], rows["USD"]["total_revenue"]) == (1.0, 100.0)
+    assert rows["CAD"]["exchange_rate_used"] == pytest.approx(1.25)
+    assert (rows["CAD"]["total_revenue"], rows["CAD"]["cash_balance"], rows["CAD"]["ebitda"]) == (125.0, 375.0, None)
+    assert rows["CAD"]["fx_snapshot_version"] == snapshot.version
+
+
+def test_load_stale_conversions_pivots_saved_currencies():
+    company_id = uuid4()
+    source = {"id": uuid4(), "company_id": company_id, "currency": "USD", "fiscal_reporting_date": date(2023, 3, 31),
+              "total_revenue": 100.0}
+    saved = [
+        {**source, **{f"converted_{column}": None for column in metrics_store.FINANCIAL_COLUMNS},
+         "converted_currency": currency, "converted_version": version, "converted_total_revenue": value}
+        for currency, version, value in [("USD", "old", 100.0), ("CAD", "old", 125.0)]
+    ]
+    connection = FakeConnection(saved)
+
+    records = MetricsStore(connection).load_stale_conversions("new", ["USD", "CAD"], 10)
+
+    assert len(records) == 1
+    assert (records[0]["company_id"], records[0]["fiscal_reporting_date"]) == (str(company_id), "2023-03-31")
+    assert (records[0]["total_revenue_USD"], records[0]["total_revenue_CAD"]) == (100.0, 125.0)
+    assert records[0]["fx_snapshot_version"] == "old"
+    assert connection.executed[0][1] == ("new", ["USD", "CAD"], 10, ["USD", "CAD"])
+
+
+def test_refresh_fx_conversions_reconverts_stale_periods(mocker):
+    """
+    A new FX snapshot version reconverts the saved financials that used older rates.
+
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    original = FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.25})
+    revised = FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.30}, as_of=date(2023, 6, 30))
+    stale = {"company_id": str(uuid4()), "currency": "USD", "fiscal_reporting_date": "2023-03-31",
+             "total_revenue": 100.0, "total_revenue_CAD": 125.0, "fx_snapshot_version": original.version}
+    store = mocker.Mock(load_stale_conversions=mocker.Mock(side_effect=[[stale], []]), save_conversions=mocker.Mock(return_value=1))
+
+    assert transformation.refresh_fx_conversions(store, revised, ["CAD"])
+
+    saved, snapshot, currencies = store.save_conversions.call_args.args
+    assert saved[0]["total_revenue_CAD"] == pytest.approx(130.0)
+    assert (snapshot, currencies) == (revised, ["CAD"])
+
+
+def test_fx_revision_is_checked_on_version_change(mocker):
+    snapshot = FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.30})
+    mocker.patch.object(transformation, "_fx_refresh_due_at", 0.0)
+    mocker.patch.object(transformation, "_fx_version_applied", None)
+    mocker.patch.object(transformation, "FX_REFRESH_SECONDS", 0.0)
+    mocker.patch.object(transformation, "get_fx_snapshot", return_value=snapshot)
+    refresh = mocker.patch.object(transformation, "refresh_fx_conversions", return_value=True)
+
+    transformation.check_fx_revision(None)
+    transformation.check_fx_revision(None)
+
+    refresh.assert_called_once()
+    assert transformation._fx_version_applied == snapshot.version
+
+
+def test_unfinished_fx_refresh_is_continued_by_next_run(mocker):
+    snapshot = FXSnapshot.from_rates({"USD": 1.0, "CAD": 1.30})
+    mocker.patch.object(transformation, "_fx_refresh_due_at", 0.0)
+    mocker.patch.object(transformation, "_fx_version_applied", None)
+    mocker.patch.object(transformation, "FX_REFRESH_SECONDS", 3600.0)
+    fetch = mocker.patch.object(transformation, "get_fx_snapshot", return_value=snapshot)
+    refresh = mocker.patch.object(transformation, "refresh_fx_conversions", side_effect=[False, True])
+
+    transformation.check_fx_revision(None)
+    assert transformation._fx_version_applied is None
+    # The unfinished refresh is not held back by the refresh interval
+    transformation.check_fx_revision(None)
+    assert transformation._fx_version_applied == snapshot.version
+    # Once applied, the rates are not checked again until the interval has passed
+    transformation.check_fx_revision(None)
+
+    assert refresh.call_count == 2
+    assert fetch.call_count == 2
+
+
+class FakeBacklogStore:
+    """
+    In-memory stand-in for the backlog queries of MetricsStore.
+    """
+
+    def __init__(self, rows):
+        self.rows = sorted(rows, key=lambda row: (row["modified_at"], row["id"]))
+        self.watermark = BACKLOG_START
+        self.saved = []
+        self.dead_letters = []
+
+    def load_watermark(self, name):
+        return self.watermark
+
+    def save_watermark(self, name, position):
+        self.saved.append(position)
+        self.watermark = max(self.watermark, position)
+
+    def save_dead_letter(self, name, position, error):
+        self.dead_letters.append((position[1], error))
+
+    def _after(self, position):
+        return [row for row in self.rows if (row["modified_at"], row["id"]) > position]
+
+    def count_pending(self, position, settle_seconds):
+        return len(self._after(position))
+
+    def fetch_pending(self, position, limit, settle_seconds):
+        return self._after(position)[:limit]
+
+
+@pytest.fixture
+def backlog_rows():
+    written = datetime(2023, 4, 1, 12, 0)
+    return [
+        {"modified_at": written + timedelta(seconds=index), "id": str(uuid4()), "company_id": str(uuid4()),
+         "fiscal_reporting_date": date(2023, 3, 31)}
+        for index in range(5)
+    ]
+
+
+def test_backlog_advances_watermark_on_ack(backlog_rows):
+    """
+    Rows past the watermark are the backlog; acknowledging a batch moves the watermark past it.
+
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    store = FakeBacklogStore(backlog_rows)
+    backlog = MetricsInputBacklog(store)
+    assert backlog.depth() == 5
+
+    first = backlog.dequeue_batch(2)
+    second = backlog.dequeue_batch(2)
+    assert [message.id for message in first + second] == [row["id"] for row in backlog_rows[:4]]
+
+    backlog.ack(message.id for message in second)
+    assert store.saved == []
+    backlog.ack(message.id for message in first)
+    assert store.saved == [(backlog_rows[3]["modified_at"], backlog_rows[3]["id"])]
+    assert backlog.depth() == 1
+
+
+def test_backlog_release_rewinds_to_watermark(backlog_rows):
+    store = FakeBacklogStore(backlog_rows)
+    backlog = MetricsInputBacklog(store)
+    backlog.ack(message.id for message in backlog.dequeue_batch(2))
+    failed = backlog.dequeue_batch(2)
+
+    backlog.release(message.id for message in failed)
+
+    assert [message.id for message in backlog.dequeue_batch(2)] == [message.id for message in failed]
+
+
+def test_process_backlog_recomputes_each_company_once(backlog_rows, mocker):
+    company_id = backlog_rows[0]["company_id"]
+    for row, reporting_date in zip(backlog_rows[:2], [date(2023, 6, 30), date(2023, 3, 31)]):
+        row.update(company_id=company_id, fiscal_reporting_date=reporting_date)
+    backlog = MetricsInputBacklog(FakeBacklogStore(backlog_rows))
+    mocker.patch.object(transformation, "get_fx_snapshot", return_value=None)
+    recompute = mocker.patch.object(transformation, "recompute_changes", return_value=[])
+    scheduler = transformation.AdaptiveScheduler(min_batch_size=10)
+
+    processed = transformation.process_backlog(None, mocker.Mock(), scheduler, source=backlog)
+
+    assert processed == 5
+    events = recompute.call_args.args[1]
+    assert len(events) == 4
+    assert (company_id, date(2023, 3, 31)) in events
+
+
+def test_bad_backlog_row_is_dead_lettered_and_skipped(backlog_rows, mocker):
+    store = FakeBacklogStore(backlog_rows)
+    backlog = MetricsInputBacklog(store)
+    bad_company = backlog_rows[1]["company_id"]
+    mocker.patch.object(transformation, "get_fx_snapshot", return_value=None)
+
+    def recompute(store, events, snapshot, currencies):
+        if any(event.company_id == bad_company for event in events):
+            raise ValueError("malformed row")
+        return []
+
+    mocker.patch.object(transformation, "recompute_changes", side_effect=recompute)
+    scheduler = transformation.AdaptiveScheduler(min_batch_size=10)
+
+    processed = transformation.process_backlog(None, mocker.Mock(), scheduler, source=backlog)
+
+    assert processed == 5
+    assert store.dead_letters == [(backlog_rows[1]["id"], "ValueError('malformed row')")]
+    assert store.watermark == (backlog_rows[-1]["modified_at"], backlog_rows[-1]["id"])
+
+
+def test_unavailable_fx_rates_leave_backlog_in_place(backlog_rows, mocker):
+    store = FakeBacklogStore(backlog_rows)
+    mocker.patch.object(transformation, "get_fx_snapshot", side_effect=transformation.FXClientError("down"))
+
+    with pytest.raises(transformation.FXClientError):
+        transformation.process_backlog(None, mocker.Mock(), transformation.AdaptiveScheduler(), source=MetricsInputBacklog(store))
+
+    assert store.dead_letters == []
+    assert store.watermark == BACKLOG_START
+
+
+def test_fallback_run_keeps_five_minute_cadence(mocker):
+    mocker.patch.object(transformation, "DATABASE_URL", None)
+    mocker.patch.object(transformation, "_fallback_due_at", 0.0)
+    transform = mocker.patch.object(transformation, "transform_data", return_value={})
+    timer = mocker.Mock(past_due=False)
+
+    transformation.main(timer, mocker.Mock())
+    transformation.main(timer, mocker.Mock())
+
+    assert transform.call_count == 1
@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.functions.data_transformation.main import calculate_derivative_metrics
+from src.functions.data_transformation.parallel import SharedFrame, partition_ranges, run_partitioned
+
+@pytest.fixture
+def portfolio():
+    rng = np.random.default_rng(7)
+    n = 400
+    revenue = rng.uniform(1e5, 1e7, n)
+    return pd.DataFrame({
+        # Companies interleaved, as they arrive from ingestion
+        "company_id": [f"company-{i % 13}" for i in range(n)],
+        "currency": "USD",
+        "fiscal_reporting_date": pd.Timestamp("2020-03-31") + pd.to_timedelta(np.arange(n) // 13 * 91, unit="D"),
+        "total_revenue": revenue,
+        "recurring_revenue": revenue * 0.8,
+        "gross_profit": revenue * 0.6,
+        "sales_marketing_expense": revenue * 0.3,
+        "total_operating_expense": revenue * 1.1,
+        "cash_burn": -revenue * 0.15,
+        "cash_balance": revenue * 3,
+        "employees": rng.integers(5, 500, n),
+    })
+
+def test_partition_ranges_respect_groups():
+    """
+    Row ranges are balanced but never split a company.
+    
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    codes = np.repeat([0, 1, 2, 3, 4], [10, 1, 30, 5, 4])
+    ranges = partition_ranges(codes, 3)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(codes)
+    for (_, stop), (start, _) in zip(ranges, ranges[1:]):
+        assert stop == start
+        assert codes[start - 1] != codes[start]
+    assert partition_ranges(np.zeros(8, dtype=int), 4) == [(0, 8)]
+    assert partition_ranges(np.array([], dtype=int), 4) == []
+
+def test_parallel_matches_single_process(portfolio):
+    expected = calculate_derivative_metrics(portfolio.copy())
+    result = run_partitioned(portfolio, calculate_derivative_metrics, workers=3, min_rows_per_worker=1)
+
+    assert list(result.index) == list(portfolio.index)
+    assert (result["company_id"] == portfolio["company_id"]).all()
+    for column in ["arr", "revenue_per_fte", "change_in_cash", "revenue_growth", "runway_months"]:
+        np.testing.assert_allclose(result[column], expected[column])
+
+def test_small_batches_run_in_process(portfolio):
+    result = run_partitioned(portfolio, calculate_derivative_metrics, workers=4)
+    np.testing.assert_allclose(result["change_in_cash"], calculate_derivative_metrics(portfolio.copy())["change_in_cash"])
+
+def test_shared_frame_round_trip():
+    owner = SharedFrame.create(["a", "b"], 3)
+    try:
+        worker = SharedFrame.attach(owner.spec)
+        worker.array[1, :] = [1.0, 2.0, 3.0]
+        worker.close()
+        assert owner.array[1].tolist() == [1.0, 2.0, 3.0]
+    finally:
+        owner.close()
+        owner.unlink()
@@ -0,0 +1,96 @@
+import json
+import math
+import time
+import pytest
+from unittest.mock import MagicMock
+from src.functions.data_transformation.main import publish_results
+from src.functions.data_transformation.queues import MessageConsumer, MessagePublisher, OutputBindingQueue, SQLiteQueue
+
+@pytest.fixture
+def queue(tmp_path):
+    q = SQLiteQueue(str(tmp_path / "queues.db"), name="test")
+    yield q
+    q.close()
+
+def test_batch_enqueue_and_dequeue(queue):
+    """
+    Messages are leased in batches and deleted on acknowledgement.
+    
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    ids = queue.enqueue_batch(["a", "b", "c"])
+    assert len(ids) == 3
+    assert queue.depth() == 3
+
+    first = queue.dequeue_batch(max_messages=2)
+    assert [m.body for m in first] == ["a", "b"]
+    assert all(m.dequeue_count == 1 for m in first)
+    # Leased messages are hidden from other consumers
+    assert [m.body for m in queue.dequeue_batch(max_messages=10)] == ["c"]
+
+    queue.ack(m.id for m in first)
+    assert queue.depth() == 1
+
+def test_visibility_timeout_redelivers(queue):
+    queue.enqueue_batch(["a"])
+    assert queue.dequeue_batch(visibility_timeout=0.05)
+    assert queue.dequeue_batch() == []
+    time.sleep(0.1)
+    redelivered = queue.dequeue_batch()
+    assert [m.dequeue_count for m in redelivered] == [2]
+
+def test_release_makes_message_visible(queue):
+    queue.enqueue_batch(["a"])
+    leased = queue.dequeue_batch(visibility_timeout=60)
+    queue.release(m.id for m in leased)
+    assert queue.visible_depth() == 1
+
+def test_poison_messages_are_dead_lettered(tmp_path):
+    queue = SQLiteQueue(str(tmp_path / "queues.db"), name="test", max_dequeue_count=2)
+    queue.enqueue_batch(["poison"])
+    for _ in range(2):
+        leased = queue.dequeue_batch()
+        queue.release(m.id for m in leased)
+
+    assert queue.dequeue_batch() == []
+    assert queue.depth() == 0
+    assert [m.body for m in queue.dead_letters()] == ["poison"]
+    queue.close()
+
+def test_queues_share_a_file_independently(tmp_path):
+    path = str(tmp_path / "queues.db")
+    inputs, outputs = SQLiteQueue(path, name="in"), SQLiteQueue(path, name="out")
+    inputs.enqueue_batch(["x"])
+    assert outputs.depth() == 0
+    assert inputs.depth() == 1
+
+def test_output_binding_queue():
+    binding = MagicMock()
+    OutputBindingQueue(binding).enqueue_batch(["a", "b"])
+    binding.set.assert_called_once_with(["a", "b"])
+
+def test_output_binding_queue_accumulates_batches():
+    binding = MagicMock()
+    queue = OutputBindingQueue(binding)
+    queue.enqueue_batch(["a"])
+    queue.enqueue_batch(["b", "c"])
+    binding.set.assert_called_with(["a", "b", "c"])
+
+def test_output_binding_queue_is_publish_only():
+    queue = OutputBindingQueue(MagicMock())
+    assert isinstance(queue, MessagePublisher)
+    assert not isinstance(queue, MessageConsumer)
+
+def test_publish_results_maps_non_finite_values_to_null(queue):
+    """
+    Published messages are strict JSON, with infinite runway and undefined growth as null.
+    
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    publish_results(queue, [{"company_id": "a", "runway_months": math.inf, "revenue_growth": math.nan, "arr": 400.0}])
+    body = queue.dequeue_batch(1)[0].body
+    assert json.loads(body, parse_constant=lambda constant: pytest.fail(constant)) == {
+        "company_id": "a", "runway_months": None, "revenue_growth": None, "arr": 400.0,
+    }
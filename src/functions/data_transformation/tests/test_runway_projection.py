@@ -0,0 +1,76 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import date
+from src.functions.data_transformation.main import add_runway_projection
+from src.functions.data_transformation.runway_projection import (
+    cash_out_histogram, project_runway, simulate_cash_out_months, summarize_cash_out
+)
+
+def test_deterministic_paths_match_point_estimate():
+    """
+    Without volatility every scenario runs out of cash when the point estimate says so.
+    
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    months = simulate_cash_out_months(
+        cash_balance=[120.0, 1000.0, 50.0],
+        monthly_cash_burn=[10.0, -5.0, 10.0],
+        n_scenarios=20,
+        horizon_months=24,
+        burn_volatility=0.0,
+        chunk_size=7,
+    )
+    assert months.shape == (3, 20)
+    assert np.all(months[0] == 12)
+    assert np.all(np.isinf(months[1]))
+    assert np.all(months[2] == 5)
+
+def test_summary_and_histogram():
+    months = np.array([[3.0, 3.0, 5.0, np.inf], [np.inf, np.inf, np.inf, np.inf]])
+    summary = summarize_cash_out(months, date(2023, 3, 31), company_ids=["a", "b"], percentiles=(50,), within_months=(4,))
+
+    assert summary.loc["a", "cash_out_month_p50"] == 3
+    assert summary.loc["a", "cash_out_date_p50"] == pd.Timestamp("2023-06-30")
+    assert summary.loc["a", "cash_out_probability_4m"] == pytest.approx(0.5)
+    assert np.isnan(summary.loc["b", "cash_out_month_p50"])
+    assert pd.isna(summary.loc["b", "cash_out_date_p50"])
+
+    histogram = cash_out_histogram(months, horizon_months=6)
+    assert histogram.shape == (2, 7)
+    assert list(histogram[0]) == [0, 0, 2, 0, 1, 0, 1]
+    assert list(histogram[1]) == [0, 0, 0, 0, 0, 0, 4]
+
+def test_project_runway_uses_latest_row_per_company():
+    df = pd.DataFrame([
+        {"company_id": "a", "fiscal_reporting_date": "2022-12-31", "cash_balance": 10.0, "monthly_cash_burn": 10.0, "total_revenue": 0.0},
+        {"company_id": "a", "fiscal_reporting_date": "2023-03-31", "cash_balance": 120.0, "monthly_cash_burn": 10.0, "total_revenue": 0.0},
+        {"company_id": "b", "fiscal_reporting_date": "2023-03-31", "cash_balance": 60.0, "monthly_cash_burn": 10.0, "total_revenue": 0.0},
+    ])
+    summary = project_runway(df, date(2023, 3, 31), n_scenarios=10, horizon_months=24, burn_volatility=0.0, seed=1)
+    assert summary.loc["a", "cash_out_month_p50"] == 12
+    assert summary.loc["b", "cash_out_month_p50"] == 6
+
+def test_project_runway_starts_from_each_latest_period():
+    df = pd.DataFrame([
+        {"company_id": "a", "fiscal_reporting_date": "2023-03-31", "cash_balance": 120.0, "monthly_cash_burn": 10.0, "total_revenue": 0.0},
+        {"company_id": "b", "fiscal_reporting_date": "2022-12-31", "cash_balance": 60.0, "monthly_cash_burn": 10.0, "total_revenue": 0.0},
+    ])
+    summary = project_runway(df, n_scenarios=10, horizon_months=24, burn_volatility=0.0, seed=1)
+    assert summary.loc["a", "cash_out_date_p50"] == pd.Timestamp("2024-03-31")
+    assert summary.loc["b", "cash_out_date_p50"] == pd.Timestamp("2023-06-30")
+
+def test_transformation_output_carries_projection_on_latest_period():
+    df = pd.DataFrame([
+        {"company_id": "a", "fiscal_reporting_date": "2023-03-31", "cash_balance": 120.0, "monthly_cash_burn": 10.0, "total_revenue": 0.0},
+        {"company_id": "b", "fiscal_reporting_date": "2023-03-31", "cash_balance": None, "monthly_cash_burn": 10.0, "total_revenue": 0.0},
+        {"company_id": "a", "fiscal_reporting_date": "2022-12-31", "cash_balance": 10.0, "monthly_cash_burn": 10.0, "total_revenue": 0.0},
+    ])
+    result = add_runway_projection(df, n_scenarios=50, seed=1)
+
+    assert list(result.index) == [0, 1, 2]
+    assert 0 < result.loc[0, "cash_out_month_p50"] <= 60
+    assert 0 <= result.loc[0, "cash_out_probability_12m"] <= 1
+    assert result.loc[[1, 2], "cash_out_month_p50"].isna().all()
+    assert add_runway_projection(df, n_scenarios=0).equals(df)
@@ -0,0 +1,121 @@
+import pytest
+from src.functions.data_transformation.queues import SQLiteQueue
+from src.functions.data_transformation.scheduling import AdaptiveScheduler, drain_backlog
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def queue(tmp_path):
+    q = SQLiteQueue(str(tmp_path / "queues.db"), name="metrics-input")
+    yield q
+    q.close()
+
+def test_batch_size_scales_with_backlog():
+    """
+    Batches grow with the backlog within the configured bounds.
+    
+    Requirements addressed:
+    - Data Transformation Processes (Technical Requirements/Feature 3: Data Transformation Processes)
+    """
+    scheduler = AdaptiveScheduler(min_batch_size=10, max_batch_size=100, target_drain_batches=5)
+    assert scheduler.plan(3).batch_size == 3
+    assert scheduler.plan(40).batch_size == 10
+    assert scheduler.plan(250).batch_size == 50
+    assert scheduler.plan(10_000).batch_size == 100
+    assert scheduler.plan(10_000).next_delay_seconds == 0.0
+
+def test_idle_backoff_doubles_and_resets():
+    scheduler = AdaptiveScheduler(idle_delay_seconds=5, max_delay_seconds=30)
+    delays = [scheduler.plan(0).next_delay_seconds for _ in range(5)]
+    assert delays == [5, 10, 20, 30, 30]
+    scheduler.plan(1)
+    assert scheduler.plan(0).next_delay_seconds == 5
+
+def test_drain_processes_whole_backlog(queue):
+    queue.enqueue_batch(str(i) for i in range(250))
+    batches = []
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(min_batch_size=10, max_batch_size=100, target_drain_batches=2)
+
+    processed = drain_backlog(queue, lambda messages: batches.append(len(messages)), scheduler, clock=clock, sleep=clock.sleep)
+
+    assert processed == 250
+    assert queue.depth() == 0
+    # Batches shrink as the backlog drains
+    assert batches == [100, 75, 38, 19, 10, 8]
+
+def test_drain_stops_at_time_budget(queue):
+    queue.enqueue_batch(str(i) for i in range(100))
+    clock = FakeClock()
+
+    def slow_batch(messages):
+        clock.now += 10
+
+    scheduler = AdaptiveScheduler(min_batch_size=10, max_batch_size=10)
+    processed = drain_backlog(queue, slow_batch, scheduler, time_budget_seconds=25, clock=clock, sleep=clock.sleep)
+
+    assert processed == 30
+    assert queue.depth() == 70
+
+def test_idle_runs_skip_backlog_checks_during_backoff(queue, mocker):
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(idle_delay_seconds=60)
+    depth = mocker.spy(queue, "depth")
+
+    assert drain_backlog(queue, lambda messages: None, scheduler, clock=clock, sleep=clock.sleep) == 0
+    assert depth.call_count == 1
+
+    clock.now = 30
+    assert drain_backlog(queue, lambda messages: None, scheduler, clock=clock, sleep=clock.sleep) == 0
+    assert depth.call_count == 1
+
+    clock.now = 61
+    queue.enqueue_batch(["x"])
+    assert drain_backlog(queue, lambda messages: None, scheduler, clock=clock, sleep=clock.sleep) == 1
+
+def test_failed_batch_is_released(queue):
+    queue.enqueue_batch(["a", "b"])
+
+    def failing(messages):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        drain_backlog(queue, failing, AdaptiveScheduler())
+    assert queue.visible_depth() == 2
+
+def test_poison_message_is_dead_lettered_without_blocking_batch(queue):
+    queue.enqueue_batch(["a", "bad", "c"])
+    processed = []
+
+    def process(messages):
+        if any(message.body == "bad" for message in messages):
+            raise ValueError("malformed")
+        processed.extend(message.body for message in messages)
+
+    clock = FakeClock()
+    count = drain_backlog(queue, process, AdaptiveScheduler(), clock=clock, sleep=clock.sleep,
+                          is_poison=lambda error: isinstance(error, ValueError))
+
+    assert count == 3
+    assert processed == ["a", "c"]
+    assert queue.depth() == 0
+    assert [message.body for message in queue.dead_letters()] == ["bad"]
+
+def test_unavailable_dependency_releases_batch_instead_of_dead_lettering(queue):
+    queue.enqueue_batch(["a", "b"])
+
+    def failing(messages):
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        drain_backlog(queue, failing, AdaptiveScheduler(), is_poison=lambda error: isinstance(error, ValueError))
+    assert queue.visible_depth() == 2
+    assert queue.dead_letters() == []